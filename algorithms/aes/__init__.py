@@ -3,7 +3,12 @@ AES Package
 Export AES core and modes
 """
 
-from .aes_core import AESCore
+from .aes_core import AESCore, AESKey, key_schedule
+from .aes_ttable import AESTTable, AESWordKey
+from .aes_numpy import AESNumpy, AESArrayKey, HAS_NUMPY
+from .aes_gcm import GHash, GCMEncryptor, GCMDecryptor
 from .aes_modes import AESModes
 
-__all__ = ['AESCore', 'AESModes']
\ No newline at end of file
+__all__ = ['AESCore', 'AESKey', 'key_schedule', 'AESTTable', 'AESWordKey',
+           'AESNumpy', 'AESArrayKey', 'HAS_NUMPY', 'GHash', 'GCMEncryptor',
+           'GCMDecryptor', 'AESModes']
\ No newline at end of file
@@ -1,26 +1,52 @@
 """
 AES Core Algorithm
-Implementation of AES-128 encryption/decryption
+Implementation of AES-128/192/256 encryption/decryption
 Following FIPS 197 standard
 """
 
+import struct
+from functools import lru_cache
+
 from .aes_tables import (
     SBOX, INV_SBOX, RCON,
     GMUL_2, GMUL_3, GMUL_9, GMUL_11, GMUL_13, GMUL_14
 )
 
+# Number of recently used key schedules kept in memory
+KEY_CACHE_SIZE = 32
+
+# Key length (bytes) -> number of rounds
+AES_ROUNDS = {16: 10, 24: 12, 32: 14}
+
+
+class AESKey:
+    """
+    Expanded AES key - key schedule computed once, reused for every block
+    round_keys[i] is the round key of round i, already laid out like the
+    State (round_keys[i][r][c]) so AddRoundKey needs no copy/transpose
+    """
+    
+    __slots__ = ('key', 'nr', 'round_keys')
+    
+    def __init__(self, key, nr, round_keys):
+        self.key = key
+        self.nr = nr
+        self.round_keys = round_keys
+    
+    def __repr__(self):
+        return f"AESKey(nr={self.nr})"
+
 
 class AESCore:
     """
-    AES-128 Core Implementation
+    AES Core Implementation
     Block size: 128 bits (16 bytes)
-    Key size: 128 bits (16 bytes)
+    Key size: 128, 192 or 256 bits (16, 24 or 32 bytes)
     """
     
     def __init__(self):
         self.Nb = 4  # Number of columns (32-bit words) in State - always 4 for AES
-        self.Nk = 4  # Number of 32-bit words in Key - 4 for AES-128
-        self.Nr = 10 # Number of rounds - 10 for AES-128
+        # Nk (key words) and Nr (rounds) depend on each key - see validate_key_length
     
     # ==================== KEY EXPANSION ====================
     
@@ -38,32 +64,47 @@ class AESCore:
     
     def key_expansion(self, key):
         """
-        Expand 128-bit key into 44 words (11 round keys)
-        key: 16 bytes
-        Returns: list of 44 words (each word = 4 bytes)
+        Expand key into 4*(Nr+1) words (Nr+1 round keys)
+        key: 16, 24 or 32 bytes (AES-128/192/256 -> 44/52/60 words)
+        Returns: list of words (each word = 4 bytes)
         """
-        if len(key) != 16:
-            raise ValueError(f"Key must be 16 bytes for AES-128, got {len(key)}")
+        nr = validate_key_length(key)
+        nk = len(key) // 4
         
-        # Initialize with original key (4 words)
+        # Initialize with original key (Nk words)
         w = []
-        for i in range(4):
+        for i in range(nk):
             w.append(list(key[4*i:4*i+4]))
         
-        # Expand to 44 words
-        for i in range(4, 44):
+        # Expand to 4*(Nr+1) words
+        for i in range(nk, 4 * (nr + 1)):
             temp = w[i-1][:]
             
-            if i % 4 == 0:
+            if i % nk == 0:
                 # RotWord + SubWord + Rcon
                 temp = self._rot_word(temp)
                 temp = self._sub_word(temp)
-                temp[0] ^= RCON[i // 4]
+                temp[0] ^= RCON[i // nk]
+            elif nk > 6 and i % nk == 4:
+                # AES-256 only: extra SubWord in the middle of each key block
+                temp = self._sub_word(temp)
             
-            w.append(self._xor_words(w[i-4], temp))
+            w.append(self._xor_words(w[i-nk], temp))
         
         return w
     
+    def expand_key(self, key):
+        """
+        Build (or fetch from the LRU cache) the AESKey context for a key
+        key: 16/24/32 bytes or an AESKey (returned unchanged)
+        Returns: AESKey
+        """
+        if isinstance(key, AESKey):
+            if type(key) is AESKey:
+                return key
+            key = key.key  # context built by another engine
+        return _expand_key_cached(bytes(key))
+    
     def _get_round_key(self, expanded_key, round_num):
         """
         Get round key for specific round
@@ -148,6 +189,17 @@ class AESCore:
                 state[r][c] ^= round_key[c][r]
         return state
     
+    def _add_state_key(self, state, state_key):
+        """XOR state with a round key already in State layout (from AESKey)"""
+        for r in range(4):
+            row = state[r]
+            key_row = state_key[r]
+            row[0] ^= key_row[0]
+            row[1] ^= key_row[1]
+            row[2] ^= key_row[2]
+            row[3] ^= key_row[3]
+        return state
+    
     # ==================== DECRYPTION OPERATIONS ====================
     
     def _inv_sub_bytes(self, state):
@@ -185,35 +237,34 @@ class AESCore:
         """
         Encrypt one 16-byte block
         plaintext_block: 16 bytes
-        key: 16 bytes
+        key: 16/24/32 bytes or AESKey (from expand_key)
         Returns: 16 bytes
         """
         if len(plaintext_block) != 16:
             raise ValueError("Block must be 16 bytes")
         
-        # Key expansion
-        expanded_key = self.key_expansion(key)
+        # Key schedule (cached)
+        aes_key = self.expand_key(key)
+        round_keys = aes_key.round_keys
+        nr = aes_key.nr
         
         # Initialize state
         state = self._bytes_to_state(plaintext_block)
         
         # Initial round key addition
-        round_key = self._get_round_key(expanded_key, 0)
-        state = self._add_round_key(state, round_key)
+        state = self._add_state_key(state, round_keys[0])
         
-        # Main rounds (1-9)
-        for round_num in range(1, self.Nr):
+        # Main rounds (1 .. Nr-1)
+        for round_num in range(1, nr):
             state = self._sub_bytes(state)
             state = self._shift_rows(state)
             state = self._mix_columns(state)
-            round_key = self._get_round_key(expanded_key, round_num)
-            state = self._add_round_key(state, round_key)
+            state = self._add_state_key(state, round_keys[round_num])
         
         # Final round (no MixColumns)
         state = self._sub_bytes(state)
         state = self._shift_rows(state)
-        round_key = self._get_round_key(expanded_key, self.Nr)
-        state = self._add_round_key(state, round_key)
+        state = self._add_state_key(state, round_keys[nr])
         
         return self._state_to_bytes(state)
     
@@ -221,38 +272,139 @@ class AESCore:
         """
         Decrypt one 16-byte block
         ciphertext_block: 16 bytes
-        key: 16 bytes
+        key: 16/24/32 bytes or AESKey (from expand_key)
         Returns: 16 bytes
         """
         if len(ciphertext_block) != 16:
             raise ValueError("Block must be 16 bytes")
         
-        # Key expansion
-        expanded_key = self.key_expansion(key)
+        # Key schedule (cached)
+        aes_key = self.expand_key(key)
+        round_keys = aes_key.round_keys
+        nr = aes_key.nr
         
         # Initialize state
         state = self._bytes_to_state(ciphertext_block)
         
         # Initial round key addition (with last round key)
-        round_key = self._get_round_key(expanded_key, self.Nr)
-        state = self._add_round_key(state, round_key)
+        state = self._add_state_key(state, round_keys[nr])
         
-        # Main rounds in reverse (9-1)
-        for round_num in range(self.Nr - 1, 0, -1):
+        # Main rounds in reverse (Nr-1 .. 1)
+        for round_num in range(nr - 1, 0, -1):
             state = self._inv_shift_rows(state)
             state = self._inv_sub_bytes(state)
-            round_key = self._get_round_key(expanded_key, round_num)
-            state = self._add_round_key(state, round_key)
+            state = self._add_state_key(state, round_keys[round_num])
             state = self._inv_mix_columns(state)
         
         # Final round (no InvMixColumns)
         state = self._inv_shift_rows(state)
         state = self._inv_sub_bytes(state)
-        round_key = self._get_round_key(expanded_key, 0)
-        state = self._add_round_key(state, round_key)
+        state = self._add_state_key(state, round_keys[0])
         
         return self._state_to_bytes(state)
 
+    
+    # ==================== MULTI-BLOCK ====================
+    
+    def encrypt_blocks(self, data, key):
+        """
+        Encrypt consecutive 16-byte blocks independently (ECB over a buffer)
+        data: bytes, length multiple of 16
+        key: 16/24/32 bytes or AESKey
+        Returns: bytes
+        """
+        if len(data) % 16 != 0:
+            raise ValueError("Data length must be multiple of 16 bytes")
+        
+        aes_key = self.expand_key(key)
+        encrypt_block = self.encrypt_block
+        result = bytearray()
+        for i in range(0, len(data), 16):
+            result += encrypt_block(data[i:i + 16], aes_key)
+        return bytes(result)
+    
+    def decrypt_blocks(self, data, key):
+        """
+        Decrypt consecutive 16-byte blocks independently
+        data: bytes, length multiple of 16
+        key: 16/24/32 bytes or AESKey
+        Returns: bytes
+        """
+        if len(data) % 16 != 0:
+            raise ValueError("Data length must be multiple of 16 bytes")
+        
+        aes_key = self.expand_key(key)
+        decrypt_block = self.decrypt_block
+        result = bytearray()
+        for i in range(0, len(data), 16):
+            result += decrypt_block(data[i:i + 16], aes_key)
+        return bytes(result)
+
+
+def validate_key_length(key):
+    """
+    Check AES key length
+    Returns: number of rounds (10, 12 or 14)
+    """
+    if len(key) not in AES_ROUNDS:
+        raise ValueError(f"AES key must be 16, 24 or 32 bytes, got {len(key)}")
+    return AES_ROUNDS[len(key)]
+
+
+def _sub_word_int(word):
+    """SubWord on a 32-bit int"""
+    return ((SBOX[word >> 24] << 24) | (SBOX[(word >> 16) & 0xFF] << 16) |
+            (SBOX[(word >> 8) & 0xFF] << 8) | SBOX[word & 0xFF])
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _key_schedule_cached(key):
+    """Word-based key expansion (same result as AESCore.key_expansion)"""
+    nr = validate_key_length(key)
+    nk = len(key) // 4
+    
+    w = list(struct.unpack(f'>{nk}I', key))
+    for i in range(nk, 4 * (nr + 1)):
+        temp = w[i - 1]
+        if i % nk == 0:
+            temp = _sub_word_int(((temp << 8) & 0xFFFFFFFF) | (temp >> 24)) ^ (RCON[i // nk] << 24)
+        elif nk > 6 and i % nk == 4:
+            temp = _sub_word_int(temp)
+        w.append(w[i - nk] ^ temp)
+    
+    return nr, tuple(w)
+
+
+def key_schedule(key):
+    """
+    Shared key schedule for every AES engine (computed once per key, LRU cached)
+    Works on 32-bit ints instead of byte lists
+    key: 16, 24 or 32 bytes
+    Returns: (Nr, tuple of 4*(Nr+1) 32-bit round-key words)
+    """
+    return _key_schedule_cached(bytes(key))
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _expand_key_cached(key):
+    """Expand a key once and keep the AESKey in a bounded LRU cache"""
+    nr, words = key_schedule(key)
+    
+    # Pre-transpose every round key into State layout
+    round_keys = []
+    for round_num in range(nr + 1):
+        columns = words[4 * round_num:4 * round_num + 4]
+        round_keys.append([[(columns[c] >> (24 - 8 * r)) & 0xFF for c in range(4)]
+                           for r in range(4)])
+    
+    return AESKey(key, nr, round_keys)
+
+
+def clear_key_cache():
+    """Drop all cached key schedules"""
+    _key_schedule_cached.cache_clear()
+    _expand_key_cached.cache_clear()
+
 
 def test_aes_core():
     """Test AES core with standard test vectors"""
@@ -0,0 +1,252 @@
+"""
+AES-GCM (Galois/Counter Mode) - NIST SP 800-38D
+Authenticated encryption in one pass: CTR encryption (32-bit counter)
+plus GHASH over the AAD and ciphertext
+GHASH multiplies by the hash key H with 8-bit tables: 16 tables of 256
+precomputed products (one per byte position), so X*H is 16 lookups and
+15 XORs instead of 128 shift/XOR steps
+"""
+
+import hmac
+from functools import lru_cache
+
+from ..bufxor import xor_bytes
+from .aes_core import KEY_CACHE_SIZE
+
+# GF(2^128) reduction polynomial x^128 + x^7 + x^2 + x + 1 (bit-reflected)
+_R = 0xE1 << 120
+
+_MASK_32 = 0xFFFFFFFF
+
+# Allowed tag lengths (bytes), SP 800-38D 5.2.1.2
+GCM_TAG_LENGTHS = (4, 8, 12, 13, 14, 15, 16)
+
+
+def gf_mult(x, y):
+    """
+    Reference GF(2^128) multiplication (SP 800-38D Algorithm 1), bit by bit
+    x, y: 128-bit ints (block bytes read big-endian)
+    """
+    z = 0
+    v = y
+    for i in range(127, -1, -1):
+        if (x >> i) & 1:
+            z ^= v
+        v = (v >> 1) ^ _R if v & 1 else v >> 1
+    return z
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _ghash_tables_cached(h):
+    """
+    Build the 8-bit multiplication tables for hash key h (kept in a bounded LRU cache)
+    tables[i][b] = (byte b at byte position i of X) * H
+    """
+    # basis[k] = H * x^k - bit k of X (counted from the left) selects basis[k]
+    basis = []
+    v = h
+    for _ in range(128):
+        basis.append(v)
+        v = (v >> 1) ^ _R if v & 1 else v >> 1
+
+    tables = []
+    for i in range(16):
+        table = [0] * 256
+        for bit in range(8):
+            product = basis[8 * i + bit]
+            step = 0x80 >> bit
+            for b in range(step, 256, 2 * step):
+                for j in range(b, b + step):
+                    table[j] ^= product
+        tables.append(table)
+    return tuple(tables)
+
+
+class GHash:
+    """
+    Incremental GHASH under hash key H
+    update() accepts any length; partial blocks are buffered and
+    zero-padded only by pad() / digest()
+    """
+
+    def __init__(self, h):
+        if isinstance(h, (bytes, bytearray, memoryview)):
+            h = int.from_bytes(h, 'big')
+        self._tables = _ghash_tables_cached(h)
+        self._y = 0
+        self._pending = b''
+
+    def _mult_h(self, x):
+        """x * H using the byte tables"""
+        t = self._tables
+        b = x.to_bytes(16, 'big')
+        return (t[0][b[0]] ^ t[1][b[1]] ^ t[2][b[2]] ^ t[3][b[3]] ^
+                t[4][b[4]] ^ t[5][b[5]] ^ t[6][b[6]] ^ t[7][b[7]] ^
+                t[8][b[8]] ^ t[9][b[9]] ^ t[10][b[10]] ^ t[11][b[11]] ^
+                t[12][b[12]] ^ t[13][b[13]] ^ t[14][b[14]] ^ t[15][b[15]])
+
+    def update(self, data):
+        """Absorb data (whole blocks are hashed, the remainder is buffered)"""
+        if self._pending:
+            data = self._pending + bytes(data)
+            self._pending = b''
+
+        n = len(data) - len(data) % 16
+        y = self._y
+        mult_h = self._mult_h
+        for i in range(0, n, 16):
+            y = mult_h(y ^ int.from_bytes(data[i:i + 16], 'big'))
+        self._y = y
+
+        if n < len(data):
+            self._pending = bytes(data[n:])
+
+    def pad(self):
+        """Zero-pad and absorb a pending partial block (end of AAD / ciphertext)"""
+        if self._pending:
+            self.update(bytes(16 - len(self._pending)))
+
+    def digest(self):
+        """Current GHASH value as 16 bytes (pending data zero-padded)"""
+        self.pad()
+        return self._y.to_bytes(16, 'big')
+
+
+class _GCMCipher:
+    """Shared state for GCMEncryptor / GCMDecryptor"""
+
+    def __init__(self, engine, key, iv, aad=b'', tag_length=16):
+        if not iv:
+            raise ValueError("GCM IV must not be empty")
+        if tag_length not in GCM_TAG_LENGTHS:
+            raise ValueError(f"Invalid GCM tag length: {tag_length}")
+
+        self.engine = engine
+        self.key = key
+        self.iv = bytes(iv)
+        self.tag_length = tag_length
+
+        h = engine.encrypt_block(bytes(16), key)
+        self._ghash = GHash(h)
+
+        # Pre-counter block J0
+        if len(iv) == 12:
+            j0 = int.from_bytes(self.iv + b'\x00\x00\x00\x01', 'big')
+        else:
+            iv_hash = GHash(h)
+            iv_hash.update(self.iv)
+            iv_hash.pad()
+            iv_hash.update((8 * len(iv)).to_bytes(16, 'big'))
+            j0 = int.from_bytes(iv_hash.digest(), 'big')
+
+        self._tag_mask = engine.encrypt_block(j0.to_bytes(16, 'big'), key)
+        self._counter_prefix = j0 & ~_MASK_32
+        self._counter = (j0 + 1) & _MASK_32  # inc32(J0)
+
+        self._aad_len = len(aad)
+        self._data_len = 0
+        self._ghash.update(aad)
+        self._ghash.pad()
+
+        self._buffer = bytearray()
+        self._finalized = False
+
+    def _check_open(self):
+        if self._finalized:
+            raise ValueError("Stream already finalized")
+
+    def _ctr(self, data):
+        """XOR data with the next GCM keystream bytes (32-bit counter increment)"""
+        n_blocks = (len(data) + 15) // 16
+        prefix = self._counter_prefix
+        counter = self._counter
+        counters = b''.join((prefix | ((counter + i) & _MASK_32)).to_bytes(16, 'big')
+                            for i in range(n_blocks))
+        self._counter = (counter + n_blocks) & _MASK_32
+        keystream = self.engine.encrypt_blocks(counters, self.key)[:len(data)]
+        return xor_bytes(data, keystream)
+
+    def _take(self, data):
+        """Return buffered + new data rounded down to whole blocks"""
+        self._buffer += data
+        n = len(self._buffer) - len(self._buffer) % 16
+        blocks = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        return blocks
+
+    def _compute_tag(self):
+        self._ghash.pad()
+        self._ghash.update((8 * self._aad_len).to_bytes(8, 'big') +
+                           (8 * self._data_len).to_bytes(8, 'big'))
+        s = int.from_bytes(self._ghash.digest(), 'big')
+        tag = (s ^ int.from_bytes(self._tag_mask, 'big')).to_bytes(16, 'big')
+        return tag[:self.tag_length]
+
+
+class GCMEncryptor(_GCMCipher):
+    """
+    Incremental GCM encryption
+    enc = GCMEncryptor(engine, key, iv, aad)
+    out = enc.update(chunk1) + enc.update(chunk2) + enc.finalize()
+    enc.tag holds the authentication tag after finalize()
+    """
+
+    def __init__(self, engine, key, iv, aad=b'', tag_length=16):
+        super().__init__(engine, key, iv, aad, tag_length)
+        self.tag = None
+
+    def _process(self, data):
+        if not data:
+            return b''
+        ciphertext = self._ctr(data)
+        self._ghash.update(ciphertext)
+        self._data_len += len(data)
+        return ciphertext
+
+    def update(self, data):
+        """Encrypt whole blocks, buffer the rest"""
+        self._check_open()
+        return self._process(self._take(data))
+
+    def finalize(self):
+        """Encrypt the pending tail and compute the tag"""
+        self._check_open()
+        self._finalized = True
+        out = self._process(bytes(self._buffer))
+        self._buffer.clear()
+        self.tag = self._compute_tag()
+        return out
+
+
+class GCMDecryptor(_GCMCipher):
+    """
+    Incremental GCM decryption
+    The tag is checked in finalize() (raises ValueError on mismatch) -
+    plaintext returned by update() must not be trusted before that
+    """
+
+    def __init__(self, engine, key, iv, tag, aad=b''):
+        super().__init__(engine, key, iv, aad, len(tag))
+        self.tag = bytes(tag)
+
+    def _process(self, data):
+        if not data:
+            return b''
+        self._ghash.update(data)
+        self._data_len += len(data)
+        return self._ctr(data)
+
+    def update(self, data):
+        """Decrypt whole blocks, buffer the rest"""
+        self._check_open()
+        return self._process(self._take(data))
+
+    def finalize(self):
+        """Decrypt the pending tail and verify the tag"""
+        self._check_open()
+        self._finalized = True
+        out = self._process(bytes(self._buffer))
+        self._buffer.clear()
+        if not hmac.compare_digest(self._compute_tag(), self.tag):
+            raise ValueError("GCM authentication failed")
+        return out
@@ -1,219 +1,129 @@
 """
 AES Modes of Operation
-- ECB (Electronic Codebook)
-- CBC (Cipher Block Chaining)
+- ECB, CBC, CFB (CFB128), OFB, CTR - shared implementation in block_modes.BlockModes
+- GCM (Galois/Counter Mode) - authenticated encryption (CTR + GHASH)
+CBC/CFB decryption and CTR split large inputs across a process pool
+Streaming (update/finalize) objects and file helpers for inputs larger than memory
 """
 
 import os
-from .aes_core import AESCore
+from ..block_modes import BlockModes
+from .aes_core import AESCore, AESKey, validate_key_length
+from .aes_ttable import AESTTable
+from .aes_numpy import AESNumpy, HAS_NUMPY
+from .aes_gcm import GCMEncryptor, GCMDecryptor
 
+# Block engines selectable by name
+ENGINES = {
+    'core': AESCore,      # byte-matrix reference implementation (FIPS 197 step by step)
+    'ttable': AESTTable,  # 32-bit word T-table implementation (fast)
+    'numpy': AESNumpy,    # batched NumPy implementation (fastest on many blocks)
+}
 
-class AESModes:
-    """AES with ECB and CBC modes"""
+
+class AESModes(BlockModes):
+    """AES with ECB, CBC, CFB, OFB, CTR and GCM modes"""
     
-    def __init__(self):
-        self.aes_core = AESCore()
-        self.block_size = 16  # AES block size = 128 bits = 16 bytes
+    name = 'AES'
+    block_size = 16  # AES block size = 128 bits = 16 bytes
+    ENGINES = ENGINES
     
-    def _pkcs7_pad(self, data):
-        """
-        PKCS#7 Padding
-        Pad data to multiple of block_size
-        """
-        pad_len = self.block_size - (len(data) % self.block_size)
-        padding = bytes([pad_len] * pad_len)
-        return data + padding
+    def __init__(self, engine='core'):
+        if engine == 'numpy' and not HAS_NUMPY:
+            engine = 'ttable'  # pure-Python fallback
+        super().__init__(engine)
     
-    def _pkcs7_unpad(self, data):
-        """Remove PKCS#7 padding"""
-        if not data:
-            return data
-        
-        pad_len = data[-1]
-        
-        # Validate padding
-        if pad_len > self.block_size or pad_len == 0:
-            raise ValueError("Invalid padding")
-        
-        # Check if all padding bytes are correct
-        if data[-pad_len:] != bytes([pad_len] * pad_len):
-            raise ValueError("Invalid padding")
-        
-        return data[:-pad_len]
+    @property
+    def aes_core(self):
+        """Block engine instance"""
+        return self.core
     
     def _validate_key(self, key):
         """Validate AES key length"""
-        if len(key) != 16:
-            raise ValueError(f"AES-128 key must be 16 bytes, got {len(key)}")
+        if isinstance(key, AESKey):
+            return key
+        validate_key_length(key)  # 16/24/32 bytes for AES-128/192/256
         return key
     
-    def _validate_iv(self, iv):
-        """Validate IV length"""
-        if iv is not None and len(iv) != 16:
-            raise ValueError(f"AES IV must be 16 bytes, got {len(iv)}")
-        return iv
+    # ==================== GCM MODE ====================
     
-    # ==================== ECB MODE ====================
-    
-    def encrypt_ecb(self, plaintext, key):
+    def gcm_encryptor(self, key, iv=None, aad=b'', tag_length=16):
         """
-        AES-ECB Encryption
-        plaintext: bytes
-        key: 16 bytes
-        Returns: bytes (ciphertext)
+        Incremental AES-GCM encryptor (read enc.tag after finalize())
+        iv: nonce, 12 bytes recommended (if None, generate random)
+        aad: additional authenticated data (not encrypted)
+        Returns: GCMEncryptor
         """
-        key = self._validate_key(key)
-        
-        # Padding
-        padded = self._pkcs7_pad(plaintext)
-        
-        ciphertext = bytearray()
-        
-        # Encrypt each block
-        for i in range(0, len(padded), self.block_size):
-            block = padded[i:i + self.block_size]
-            encrypted_block = self.aes_core.encrypt_block(block, key)
-            ciphertext.extend(encrypted_block)
-        
-        return bytes(ciphertext)
+        key = self.expand_key(key)
+        if iv is None:
+            iv = os.urandom(12)
+        return GCMEncryptor(self.core, key, iv, aad, tag_length)
     
-    def decrypt_ecb(self, ciphertext, key):
+    def gcm_decryptor(self, key, iv, tag, aad=b''):
         """
-        AES-ECB Decryption
-        ciphertext: bytes
-        key: 16 bytes
-        Returns: bytes (plaintext)
+        Incremental AES-GCM decryptor - finalize() raises ValueError
+        if the tag does not match
+        Returns: GCMDecryptor
         """
-        key = self._validate_key(key)
-        
-        if len(ciphertext) % self.block_size != 0:
-            raise ValueError("Ciphertext length must be multiple of block size")
-        
-        plaintext = bytearray()
-        
-        # Decrypt each block
-        for i in range(0, len(ciphertext), self.block_size):
-            block = ciphertext[i:i + self.block_size]
-            decrypted_block = self.aes_core.decrypt_block(block, key)
-            plaintext.extend(decrypted_block)
-        
-        # Remove padding
-        return self._pkcs7_unpad(bytes(plaintext))
-    
-    # ==================== CBC MODE ====================
+        key = self.expand_key(key)
+        if iv is None:
+            raise ValueError("IV (nonce) is required for GCM mode")
+        return GCMDecryptor(self.core, key, iv, tag, aad)
     
-    def encrypt_cbc(self, plaintext, key, iv=None):
+    def encrypt_gcm(self, plaintext, key, iv=None, aad=b'', tag_length=16):
         """
-        AES-CBC Encryption
-        plaintext: bytes
-        key: 16 bytes
-        iv: 16 bytes (if None, generate random)
-        Returns: (ciphertext, iv) tuple
+        AES-GCM Encryption
+        plaintext: bytes (no padding needed)
+        key: 16/24/32 bytes or AESKey
+        iv: nonce, 12 bytes recommended (if None, generate random)
+        aad: additional authenticated data
+        Returns: (ciphertext, tag, iv) tuple
         """
-        key = self._validate_key(key)
-        
-        # Generate IV if not provided
-        if iv is None:
-            iv = os.urandom(16)
-        else:
-            iv = self._validate_iv(iv)
-        
-        # Padding
-        padded = self._pkcs7_pad(plaintext)
-        
-        ciphertext = bytearray()
-        previous_block = iv
-        
-        # Encrypt each block
-        for i in range(0, len(padded), self.block_size):
-            block = padded[i:i + self.block_size]
-            
-            # XOR with previous block (or IV)
-            xored = bytes(a ^ b for a, b in zip(block, previous_block))
-            
-            # Encrypt
-            encrypted_block = self.aes_core.encrypt_block(xored, key)
-            ciphertext.extend(encrypted_block)
-            
-            # Update previous block
-            previous_block = encrypted_block
-        
-        return bytes(ciphertext), iv
+        enc = self.gcm_encryptor(key, iv, aad, tag_length)
+        ciphertext = enc.update(plaintext) + enc.finalize()
+        return ciphertext, enc.tag, enc.iv
     
-    def decrypt_cbc(self, ciphertext, key, iv):
+    def decrypt_gcm(self, ciphertext, key, iv, tag, aad=b''):
         """
-        AES-CBC Decryption
-        ciphertext: bytes
-        key: 16 bytes
-        iv: 16 bytes
+        AES-GCM Decryption
+        Raises ValueError if the tag does not authenticate ciphertext and aad
         Returns: bytes (plaintext)
         """
-        key = self._validate_key(key)
-        iv = self._validate_iv(iv)
-        
-        if len(ciphertext) % self.block_size != 0:
-            raise ValueError("Ciphertext length must be multiple of block size")
-        
-        plaintext = bytearray()
-        previous_block = iv
-        
-        # Decrypt each block
-        for i in range(0, len(ciphertext), self.block_size):
-            block = ciphertext[i:i + self.block_size]
-            
-            # Decrypt
-            decrypted_block = self.aes_core.decrypt_block(block, key)
-            
-            # XOR with previous block
-            xored = bytes(a ^ b for a, b in zip(decrypted_block, previous_block))
-            plaintext.extend(xored)
-            
-            # Update previous block
-            previous_block = block
-        
-        # Remove padding
-        return self._pkcs7_unpad(bytes(plaintext))
+        dec = self.gcm_decryptor(key, iv, tag, aad)
+        plaintext = dec.update(ciphertext) + dec.finalize()
+        return plaintext
     
     # ==================== GENERAL INTERFACE ====================
     
     def encrypt(self, plaintext, key, mode='ECB', iv=None):
         """
         General encryption interface
-        mode: 'ECB' or 'CBC'
+        mode: 'ECB', 'CBC', 'CFB', 'OFB', 'CTR' or 'GCM'
         Returns: (ciphertext, iv_used) - iv_used is None for ECB
+                 GCM ciphertext has the 16-byte tag appended
         """
-        mode = mode.upper()
+        if mode.upper() == 'GCM':
+            ciphertext, tag, iv_used = self.encrypt_gcm(plaintext, key, iv)
+            return ciphertext + tag, iv_used
         
-        if mode == 'ECB':
-            ciphertext = self.encrypt_ecb(plaintext, key)
-            return ciphertext, None
-        
-        elif mode == 'CBC':
-            ciphertext, iv_used = self.encrypt_cbc(plaintext, key, iv)
-            return ciphertext, iv_used
-        
-        else:
-            raise ValueError(f"Unsupported mode: {mode}")
+        return super().encrypt(plaintext, key, mode, iv)
     
     def decrypt(self, ciphertext, key, mode='ECB', iv=None):
         """
         General decryption interface
-        mode: 'ECB' or 'CBC'
-        iv: Required for CBC, ignored for ECB
+        mode: 'ECB', 'CBC', 'CFB', 'OFB', 'CTR' or 'GCM'
+        iv: Required for every mode except ECB
+        GCM ciphertext must end with the 16-byte tag
         Returns: plaintext
         """
-        mode = mode.upper()
-        
-        if mode == 'ECB':
-            return self.decrypt_ecb(ciphertext, key)
-        
-        elif mode == 'CBC':
+        if mode.upper() == 'GCM':
             if iv is None:
-                raise ValueError("IV is required for CBC mode")
-            return self.decrypt_cbc(ciphertext, key, iv)
+                raise ValueError("IV (nonce) is required for GCM mode")
+            if len(ciphertext) < 16:
+                raise ValueError("GCM ciphertext is shorter than the tag")
+            return self.decrypt_gcm(ciphertext[:-16], key, iv, ciphertext[-16:])
         
-        else:
-            raise ValueError(f"Unsupported mode: {mode}")
+        return super().decrypt(ciphertext, key, mode, iv)
 
 
 def test_aes_modes():
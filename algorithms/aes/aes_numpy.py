@@ -0,0 +1,212 @@
+"""
+AES NumPy Batched Engine
+Encrypts/decrypts N independent blocks per call: the buffer is loaded as
+an (N, 16) uint8 array and every AES round is a handful of vectorised
+table lookups (SBOX / GMUL fancy-indexing) over all N blocks at once
+NumPy is optional - check HAS_NUMPY before using this engine
+"""
+
+import struct
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy not installed - AESModes falls back to pure Python
+    np = None
+
+from .aes_core import AESKey, KEY_CACHE_SIZE, key_schedule
+from .aes_ttable import AESTTable
+from .aes_tables import (
+    SBOX, INV_SBOX,
+    GMUL_2, GMUL_9, GMUL_11, GMUL_13, GMUL_14
+)
+
+HAS_NUMPY = np is not None
+
+# Blocks processed per vectorised pass (bounds temporary array size)
+BATCH_BLOCKS = 1 << 16
+
+if HAS_NUMPY:
+    _SBOX = np.array(SBOX, dtype=np.uint8)
+    _INV_SBOX = np.array(INV_SBOX, dtype=np.uint8)
+    _GMUL_2 = np.array(GMUL_2, dtype=np.uint8)
+    _GMUL_9 = np.array(GMUL_9, dtype=np.uint8)
+    _GMUL_11 = np.array(GMUL_11, dtype=np.uint8)
+    _GMUL_13 = np.array(GMUL_13, dtype=np.uint8)
+    _GMUL_14 = np.array(GMUL_14, dtype=np.uint8)
+
+    # Block bytes are column-major: byte index = row + 4*col
+    # ShiftRows: new[r + 4c] = old[r + 4((c + r) % 4)]
+    _SHIFT_ROWS = np.array([r + 4 * ((c + r) % 4) for c in range(4) for r in range(4)])
+    _INV_SHIFT_ROWS = np.array([r + 4 * ((c - r) % 4) for c in range(4) for r in range(4)])
+
+
+class AESArrayKey(AESKey):
+    """
+    Expanded AES key for the NumPy engine
+    round_keys: (Nr+1, 16) uint8 array, each row in block byte order
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"AESArrayKey(nr={self.nr})"
+
+
+class AESNumpy:
+    """
+    AES NumPy Implementation (batched)
+    Block size: 128 bits (16 bytes)
+    Key size: 128, 192 or 256 bits (16, 24 or 32 bytes)
+    """
+
+    def __init__(self):
+        if not HAS_NUMPY:
+            raise ImportError("NumPy is required for the AES NumPy engine")
+        self.Nb = 4
+        self._single = AESTTable()
+
+    def expand_key(self, key):
+        """
+        Build (or fetch from the LRU cache) the AESArrayKey for a key
+        key: 16/24/32 bytes, AESArrayKey (returned unchanged) or AESKey
+        Returns: AESArrayKey
+        """
+        if isinstance(key, AESArrayKey):
+            return key
+        if isinstance(key, AESKey):
+            key = key.key
+        return _expand_array_key_cached(bytes(key))
+
+    # ==================== ROUND FUNCTIONS (N blocks) ====================
+
+    def _mix_columns(self, state):
+        """MixColumns on (N, 16) state: new_r = 2a_r ^ 3a_{r+1} ^ a_{r+2} ^ a_{r+3}"""
+        a = state.reshape(-1, 4, 4)  # [block, column, row]
+        b = _GMUL_2[a]
+        a1 = np.roll(a, -1, axis=2)
+        mixed = b ^ a1 ^ _GMUL_2[a1] ^ np.roll(a, -2, axis=2) ^ np.roll(a, -3, axis=2)
+        return mixed.reshape(-1, 16)
+
+    def _inv_mix_columns(self, state):
+        """InvMixColumns: new_r = 14a_r ^ 11a_{r+1} ^ 13a_{r+2} ^ 9a_{r+3}"""
+        a = state.reshape(-1, 4, 4)
+        mixed = (_GMUL_14[a] ^ _GMUL_11[np.roll(a, -1, axis=2)] ^
+                 _GMUL_13[np.roll(a, -2, axis=2)] ^ _GMUL_9[np.roll(a, -3, axis=2)])
+        return mixed.reshape(-1, 16)
+
+    def _encrypt_array(self, state, round_keys, nr):
+        """Encrypt an (N, 16) uint8 array"""
+        state = state ^ round_keys[0]
+        for round_num in range(1, nr):
+            state = _SBOX[state][:, _SHIFT_ROWS]
+            state = self._mix_columns(state)
+            state ^= round_keys[round_num]
+        state = _SBOX[state][:, _SHIFT_ROWS]
+        state ^= round_keys[nr]
+        return state
+
+    def _decrypt_array(self, state, round_keys, nr):
+        """Decrypt an (N, 16) uint8 array"""
+        state = state ^ round_keys[nr]
+        for round_num in range(nr - 1, 0, -1):
+            state = _INV_SBOX[state[:, _INV_SHIFT_ROWS]]
+            state ^= round_keys[round_num]
+            state = self._inv_mix_columns(state)
+        state = _INV_SBOX[state[:, _INV_SHIFT_ROWS]]
+        state ^= round_keys[0]
+        return state
+
+    def _process(self, data, key, transform):
+        """Run transform over data in BATCH_BLOCKS-sized (N, 16) slices"""
+        if len(data) % 16 != 0:
+            raise ValueError("Data length must be multiple of 16 bytes")
+
+        array_key = self.expand_key(key)
+        blocks = np.frombuffer(data, dtype=np.uint8).reshape(-1, 16)
+        result = np.empty_like(blocks)
+
+        for start in range(0, len(blocks), BATCH_BLOCKS):
+            end = start + BATCH_BLOCKS
+            result[start:end] = transform(blocks[start:end], array_key.round_keys, array_key.nr)
+
+        return result.tobytes()
+
+    # ==================== MAIN ENCRYPTION/DECRYPTION ====================
+
+    def encrypt_blocks(self, data, key):
+        """
+        Encrypt consecutive 16-byte blocks independently (ECB over a buffer)
+        data: bytes, length multiple of 16
+        key: 16/24/32 bytes or AESArrayKey
+        Returns: bytes
+        """
+        return self._process(data, key, self._encrypt_array)
+
+    def decrypt_blocks(self, data, key):
+        """
+        Decrypt consecutive 16-byte blocks independently
+        data: bytes, length multiple of 16
+        key: 16/24/32 bytes or AESArrayKey
+        Returns: bytes
+        """
+        return self._process(data, key, self._decrypt_array)
+
+    # Single blocks (CBC encryption chain, ...) go through the T-table
+    # engine - per-call NumPy overhead dominates for a batch of one
+
+    def encrypt_block(self, plaintext_block, key):
+        """Encrypt one 16-byte block"""
+        return self._single.encrypt_block(plaintext_block, key)
+
+    def decrypt_block(self, ciphertext_block, key):
+        """Decrypt one 16-byte block"""
+        return self._single.decrypt_block(ciphertext_block, key)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _expand_array_key_cached(key):
+    """Expand a key into an (Nr+1, 16) round-key array, kept in a bounded LRU cache"""
+    nr, words = key_schedule(key)
+    flat = struct.pack(f'>{len(words)}I', *words)
+    round_keys = np.frombuffer(flat, dtype=np.uint8).reshape(nr + 1, 16).copy()
+    return AESArrayKey(key, nr, round_keys)
+
+
+def clear_key_cache():
+    """Drop all cached round-key arrays"""
+    _expand_array_key_cached.cache_clear()
+
+
+def test_aes_numpy():
+    """Test NumPy engine against FIPS 197 and the T-table engine"""
+    import os
+
+    if not HAS_NUMPY:
+        print("NumPy not installed - skipping AES NumPy tests")
+        return
+
+    aes = AESNumpy()
+
+    key = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+    plaintext = bytes.fromhex('00112233445566778899aabbccddeeff')
+    expected_ciphertext = bytes.fromhex('69c4e0d86a7b0430d8cdb78070b4c55a')
+
+    print("Testing AES NumPy engine...")
+    ciphertext = aes.encrypt_blocks(plaintext, key)
+    print(f"Ciphertext: {ciphertext.hex()}")
+    print(f"Expected:   {expected_ciphertext.hex()}")
+    assert ciphertext == expected_ciphertext, "Encryption test failed!"
+    assert aes.decrypt_blocks(ciphertext, key) == plaintext, "Decryption test failed!"
+
+    reference = AESTTable()
+    key = os.urandom(16)
+    data = os.urandom(16 * 1000)
+    assert aes.encrypt_blocks(data, key) == reference.encrypt_blocks(data, key)
+    assert aes.decrypt_blocks(data, key) == reference.decrypt_blocks(data, key)
+
+    print("✓ All AES NumPy tests passed!")
+
+
+if __name__ == "__main__":
+    test_aes_numpy()
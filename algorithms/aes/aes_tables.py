@@ -1,6 +1,6 @@
 """
 AES Lookup Tables
-S-box, Inverse S-box, Rcon, GF multiplication tables
+S-box, Inverse S-box, Rcon, GF multiplication tables, T-tables
 """
 
 # S-box (Substitution box) - used in SubBytes
@@ -76,6 +76,27 @@ GMUL_13 = [gmul(i, 13) for i in range(256)]
 GMUL_14 = [gmul(i, 14) for i in range(256)]
 
 
+# T-tables (32-bit words) - SubBytes + ShiftRows + MixColumns in one lookup
+# TE0[x] = column (2*S[x], S[x], S[x], 3*S[x]) packed big-endian,
+# TE1..TE3 are TE0 rotated right by 8, 16, 24 bits
+def _ror32(word, n):
+    """Rotate 32-bit word right by n bits"""
+    return ((word >> n) | (word << (32 - n))) & 0xFFFFFFFF
+
+
+TE0 = [(GMUL_2[s] << 24) | (s << 16) | (s << 8) | GMUL_3[s] for s in SBOX]
+TE1 = [_ror32(w, 8) for w in TE0]
+TE2 = [_ror32(w, 16) for w in TE0]
+TE3 = [_ror32(w, 24) for w in TE0]
+
+# TD0[x] = column (14*Si[x], 9*Si[x], 13*Si[x], 11*Si[x]) for the inverse cipher
+TD0 = [(GMUL_14[s] << 24) | (GMUL_9[s] << 16) | (GMUL_13[s] << 8) | GMUL_11[s]
+       for s in INV_SBOX]
+TD1 = [_ror32(w, 8) for w in TD0]
+TD2 = [_ror32(w, 16) for w in TD0]
+TD3 = [_ror32(w, 24) for w in TD0]
+
+
 def test_tables():
     """Test the tables"""
     print("Testing AES Tables...")
@@ -91,6 +112,13 @@ def test_tables():
     assert gmul(0x57, 0x13) == 0xFE
     
     print("✓ GF multiplication test passed!")
+    
+    # Test T-tables against S-box/GMUL
+    for i in range(256):
+        assert TE0[i] >> 24 == GMUL_2[SBOX[i]], f"TE0 mismatch at {i}"
+        assert TD0[i] & 0xFF == GMUL_11[INV_SBOX[i]], f"TD0 mismatch at {i}"
+    
+    print("✓ T-table test passed!")
     print("✓ All table tests passed!")
 
 
@@ -0,0 +1,238 @@
+"""
+AES T-table Engine
+Word-oriented AES: state kept as four 32-bit ints, each round is
+16 table lookups (TE0..TE3 / TD0..TD3) instead of byte-matrix operations
+Same results as AESCore, several times faster in pure Python
+"""
+
+import struct
+from functools import lru_cache
+
+from .aes_core import AESKey, KEY_CACHE_SIZE, key_schedule
+from .aes_tables import (
+    SBOX, INV_SBOX,
+    TE0, TE1, TE2, TE3,
+    TD0, TD1, TD2, TD3
+)
+
+_BLOCK = struct.Struct('>4I')
+
+
+class AESWordKey(AESKey):
+    """
+    Expanded AES key for the T-table engine
+    round_keys: flat list of 4*(Nr+1) encryption words
+    dec_round_keys: flat list of 4*(Nr+1) words for the equivalent inverse
+                    cipher (reversed, InvMixColumns applied to rounds 1..Nr-1)
+    """
+
+    __slots__ = ('dec_round_keys',)
+
+    def __init__(self, key, nr, round_keys, dec_round_keys):
+        super().__init__(key, nr, round_keys)
+        self.dec_round_keys = dec_round_keys
+
+    def __repr__(self):
+        return f"AESWordKey(nr={self.nr})"
+
+
+class AESTTable:
+    """
+    AES T-table Implementation
+    Block size: 128 bits (16 bytes)
+    Key size: 128, 192 or 256 bits (16, 24 or 32 bytes)
+    """
+
+    def __init__(self):
+        self.Nb = 4
+
+    def expand_key(self, key):
+        """
+        Build (or fetch from the LRU cache) the AESWordKey for a key
+        key: 16/24/32 bytes, AESWordKey (returned unchanged) or AESKey
+        Returns: AESWordKey
+        """
+        if isinstance(key, AESWordKey):
+            return key
+        if isinstance(key, AESKey):
+            key = key.key
+        return _expand_word_key_cached(bytes(key))
+
+    def encrypt_block(self, plaintext_block, key):
+        """
+        Encrypt one 16-byte block
+        plaintext_block: 16 bytes
+        key: 16/24/32 bytes or AESWordKey
+        Returns: 16 bytes
+        """
+        if len(plaintext_block) != 16:
+            raise ValueError("Block must be 16 bytes")
+
+        word_key = self.expand_key(key)
+        rk = word_key.round_keys
+        nr = word_key.nr
+
+        s0, s1, s2, s3 = _BLOCK.unpack(plaintext_block)
+        s0 ^= rk[0]
+        s1 ^= rk[1]
+        s2 ^= rk[2]
+        s3 ^= rk[3]
+
+        # Main rounds: SubBytes + ShiftRows + MixColumns + AddRoundKey
+        k = 4
+        for _ in range(nr - 1):
+            t0 = TE0[s0 >> 24] ^ TE1[(s1 >> 16) & 0xFF] ^ TE2[(s2 >> 8) & 0xFF] ^ TE3[s3 & 0xFF] ^ rk[k]
+            t1 = TE0[s1 >> 24] ^ TE1[(s2 >> 16) & 0xFF] ^ TE2[(s3 >> 8) & 0xFF] ^ TE3[s0 & 0xFF] ^ rk[k + 1]
+            t2 = TE0[s2 >> 24] ^ TE1[(s3 >> 16) & 0xFF] ^ TE2[(s0 >> 8) & 0xFF] ^ TE3[s1 & 0xFF] ^ rk[k + 2]
+            t3 = TE0[s3 >> 24] ^ TE1[(s0 >> 16) & 0xFF] ^ TE2[(s1 >> 8) & 0xFF] ^ TE3[s2 & 0xFF] ^ rk[k + 3]
+            s0, s1, s2, s3 = t0, t1, t2, t3
+            k += 4
+
+        # Final round (no MixColumns)
+        return _BLOCK.pack(
+            ((SBOX[s0 >> 24] << 24) | (SBOX[(s1 >> 16) & 0xFF] << 16) |
+             (SBOX[(s2 >> 8) & 0xFF] << 8) | SBOX[s3 & 0xFF]) ^ rk[k],
+            ((SBOX[s1 >> 24] << 24) | (SBOX[(s2 >> 16) & 0xFF] << 16) |
+             (SBOX[(s3 >> 8) & 0xFF] << 8) | SBOX[s0 & 0xFF]) ^ rk[k + 1],
+            ((SBOX[s2 >> 24] << 24) | (SBOX[(s3 >> 16) & 0xFF] << 16) |
+             (SBOX[(s0 >> 8) & 0xFF] << 8) | SBOX[s1 & 0xFF]) ^ rk[k + 2],
+            ((SBOX[s3 >> 24] << 24) | (SBOX[(s0 >> 16) & 0xFF] << 16) |
+             (SBOX[(s1 >> 8) & 0xFF] << 8) | SBOX[s2 & 0xFF]) ^ rk[k + 3]
+        )
+
+    def decrypt_block(self, ciphertext_block, key):
+        """
+        Decrypt one 16-byte block (equivalent inverse cipher)
+        ciphertext_block: 16 bytes
+        key: 16/24/32 bytes or AESWordKey
+        Returns: 16 bytes
+        """
+        if len(ciphertext_block) != 16:
+            raise ValueError("Block must be 16 bytes")
+
+        word_key = self.expand_key(key)
+        dk = word_key.dec_round_keys
+        nr = word_key.nr
+
+        s0, s1, s2, s3 = _BLOCK.unpack(ciphertext_block)
+        s0 ^= dk[0]
+        s1 ^= dk[1]
+        s2 ^= dk[2]
+        s3 ^= dk[3]
+
+        # Main rounds: InvSubBytes + InvShiftRows + InvMixColumns + AddRoundKey
+        k = 4
+        for _ in range(nr - 1):
+            t0 = TD0[s0 >> 24] ^ TD1[(s3 >> 16) & 0xFF] ^ TD2[(s2 >> 8) & 0xFF] ^ TD3[s1 & 0xFF] ^ dk[k]
+            t1 = TD0[s1 >> 24] ^ TD1[(s0 >> 16) & 0xFF] ^ TD2[(s3 >> 8) & 0xFF] ^ TD3[s2 & 0xFF] ^ dk[k + 1]
+            t2 = TD0[s2 >> 24] ^ TD1[(s1 >> 16) & 0xFF] ^ TD2[(s0 >> 8) & 0xFF] ^ TD3[s3 & 0xFF] ^ dk[k + 2]
+            t3 = TD0[s3 >> 24] ^ TD1[(s2 >> 16) & 0xFF] ^ TD2[(s1 >> 8) & 0xFF] ^ TD3[s0 & 0xFF] ^ dk[k + 3]
+            s0, s1, s2, s3 = t0, t1, t2, t3
+            k += 4
+
+        # Final round (no InvMixColumns)
+        return _BLOCK.pack(
+            ((INV_SBOX[s0 >> 24] << 24) | (INV_SBOX[(s3 >> 16) & 0xFF] << 16) |
+             (INV_SBOX[(s2 >> 8) & 0xFF] << 8) | INV_SBOX[s1 & 0xFF]) ^ dk[k],
+            ((INV_SBOX[s1 >> 24] << 24) | (INV_SBOX[(s0 >> 16) & 0xFF] << 16) |
+             (INV_SBOX[(s3 >> 8) & 0xFF] << 8) | INV_SBOX[s2 & 0xFF]) ^ dk[k + 1],
+            ((INV_SBOX[s2 >> 24] << 24) | (INV_SBOX[(s1 >> 16) & 0xFF] << 16) |
+             (INV_SBOX[(s0 >> 8) & 0xFF] << 8) | INV_SBOX[s3 & 0xFF]) ^ dk[k + 2],
+            ((INV_SBOX[s3 >> 24] << 24) | (INV_SBOX[(s2 >> 16) & 0xFF] << 16) |
+             (INV_SBOX[(s1 >> 8) & 0xFF] << 8) | INV_SBOX[s0 & 0xFF]) ^ dk[k + 3]
+        )
+
+    # ==================== MULTI-BLOCK ====================
+
+    def encrypt_blocks(self, data, key):
+        """
+        Encrypt consecutive 16-byte blocks independently (ECB over a buffer)
+        data: bytes, length multiple of 16
+        key: 16/24/32 bytes or AESWordKey
+        Returns: bytes
+        """
+        if len(data) % 16 != 0:
+            raise ValueError("Data length must be multiple of 16 bytes")
+
+        aes_key = self.expand_key(key)
+        encrypt_block = self.encrypt_block
+        result = bytearray()
+        for i in range(0, len(data), 16):
+            result += encrypt_block(data[i:i + 16], aes_key)
+        return bytes(result)
+
+    def decrypt_blocks(self, data, key):
+        """
+        Decrypt consecutive 16-byte blocks independently
+        data: bytes, length multiple of 16
+        key: 16/24/32 bytes or AESWordKey
+        Returns: bytes
+        """
+        if len(data) % 16 != 0:
+            raise ValueError("Data length must be multiple of 16 bytes")
+
+        aes_key = self.expand_key(key)
+        decrypt_block = self.decrypt_block
+        result = bytearray()
+        for i in range(0, len(data), 16):
+            result += decrypt_block(data[i:i + 16], aes_key)
+        return bytes(result)
+
+
+def _inv_mix_column_word(word):
+    """InvMixColumns on one 32-bit column (TD tables already contain InvSubBytes)"""
+    return (TD0[SBOX[word >> 24]] ^ TD1[SBOX[(word >> 16) & 0xFF]] ^
+            TD2[SBOX[(word >> 8) & 0xFF]] ^ TD3[SBOX[word & 0xFF]])
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _expand_word_key_cached(key):
+    """Expand a key into encryption/decryption words, kept in a bounded LRU cache"""
+    nr, round_keys = key_schedule(key)
+
+    # Equivalent inverse cipher: reverse round order, InvMixColumns on inner rounds
+    dec_round_keys = []
+    for round_num in range(nr, -1, -1):
+        words = round_keys[4 * round_num:4 * round_num + 4]
+        if 0 < round_num < nr:
+            words = [_inv_mix_column_word(w) for w in words]
+        dec_round_keys.extend(words)
+
+    return AESWordKey(key, nr, list(round_keys), dec_round_keys)
+
+
+def clear_key_cache():
+    """Drop all cached word key schedules"""
+    _expand_word_key_cached.cache_clear()
+
+
+def test_aes_ttable():
+    """Test T-table engine against FIPS 197 and AESCore"""
+    import os
+    from .aes_core import AESCore
+
+    aes = AESTTable()
+
+    key = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+    plaintext = bytes.fromhex('00112233445566778899aabbccddeeff')
+    expected_ciphertext = bytes.fromhex('69c4e0d86a7b0430d8cdb78070b4c55a')
+
+    print("Testing AES T-table engine...")
+    ciphertext = aes.encrypt_block(plaintext, key)
+    print(f"Ciphertext: {ciphertext.hex()}")
+    print(f"Expected:   {expected_ciphertext.hex()}")
+    assert ciphertext == expected_ciphertext, "Encryption test failed!"
+    assert aes.decrypt_block(ciphertext, key) == plaintext, "Decryption test failed!"
+
+    core = AESCore()
+    for _ in range(100):
+        key = os.urandom(16)
+        block = os.urandom(16)
+        assert aes.encrypt_block(block, key) == core.encrypt_block(block, key)
+        assert aes.decrypt_block(block, key) == core.decrypt_block(block, key)
+
+    print("✓ All AES T-table tests passed!")
+
+
+if __name__ == "__main__":
+    test_aes_ttable()
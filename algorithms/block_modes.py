@@ -0,0 +1,601 @@
+"""
+Block cipher modes of operation (NIST SP 800-38A), shared by AES and DES
+- ECB (Electronic Codebook)     - PKCS#7 padded
+- CBC (Cipher Block Chaining)   - PKCS#7 padded
+- CFB (Cipher Feedback, full-block segments: CFB128 for AES, CFB64 for DES)
+- OFB (Output Feedback)
+- CTR (Counter)
+CFB/OFB/CTR are stream modes: no padding, the last block may be partial
+The layer is cipher-agnostic - it only needs the block size and an engine
+exposing expand_key / encrypt_block / encrypt_blocks / decrypt_blocks
+CBC/CFB decryption and CTR split large inputs across a process pool
+encrypt_batch / decrypt_batch handle many short records under one key with
+a handful of batched engine calls instead of one mode call per record
+"""
+
+import os
+from .bufxor import xor_bytes
+from .parallel import resolve_workers, chunk_size_for, run_chunk_tasks
+from .streaming import (CHUNK_SIZE, STREAM_MODES, PADDED_MODES, StreamEncryptor,
+                        StreamDecryptor, map_file, pkcs7_pad_tail, pkcs7_unpadded_length)
+
+MODES = STREAM_MODES
+
+
+def _ctr_counters(counter, n_blocks, block_size):
+    """
+    Counter blocks counter, counter + 1, ... as one buffer
+    Counter is the whole block incremented as a (8 * block_size)-bit integer
+    """
+    mask = (1 << (8 * block_size)) - 1
+    return b''.join(((counter + i) & mask).to_bytes(block_size, 'big')
+                    for i in range(n_blocks))
+
+
+def _ctr_xor(engine, block_size, data, key, counter):
+    """XOR data with the CTR keystream starting at counter block `counter`"""
+    n_blocks = (len(data) + block_size - 1) // block_size
+    counters = _ctr_counters(counter, n_blocks, block_size)
+    keystream = engine.encrypt_blocks(counters, key)[:len(data)]
+    return xor_bytes(data, keystream)
+
+
+def _split_records(buffer, lengths, sizes=None):
+    """
+    Cut a concatenated buffer back into records
+    lengths: bytes taken per record; sizes: bytes occupied per record (default lengths)
+    """
+    records = []
+    offset = 0
+    for length, size in zip(lengths, sizes or lengths):
+        records.append(buffer[offset:offset + length])
+        offset += size
+    return records
+
+
+def _ctr_worker(engine_class, block_size, key, counter, data):
+    """Process pool worker: encrypt/decrypt one counter range"""
+    return _ctr_xor(engine_class(), block_size, data, key, counter)
+
+
+def _cbc_decrypt_chunk(engine, block_size, chunk, key, previous_block):
+    """
+    CBC-decrypt whole blocks: P_i = D(C_i) XOR C_{i-1}
+    previous_block: ciphertext block before the chunk (or IV)
+    No chaining dependency - all D(C_i) are computed in one batched call
+    """
+    decrypted = engine.decrypt_blocks(chunk, key)
+    chained = bytes(previous_block) + chunk[:-block_size]
+    return xor_bytes(decrypted, chained)
+
+
+def _cbc_decrypt_worker(engine_class, block_size, key, previous_block, chunk):
+    """Process pool worker: CBC-decrypt one chunk of whole blocks"""
+    return _cbc_decrypt_chunk(engine_class(), block_size, chunk, key, previous_block)
+
+
+def _cfb_decrypt_chunk(engine, block_size, chunk, key, previous_block):
+    """
+    CFB-decrypt a chunk: P_i = C_i XOR E(C_{i-1})
+    The cipher inputs are all known ciphertext, so the whole chunk is one
+    batched encrypt_blocks call; a partial final block uses a truncated E(C_{n-1})
+    """
+    n_blocks = (len(chunk) + block_size - 1) // block_size
+    feedback = bytes(previous_block) + chunk[:(n_blocks - 1) * block_size]
+    keystream = engine.encrypt_blocks(feedback, key)[:len(chunk)]
+    return xor_bytes(chunk, keystream)
+
+
+def _cfb_decrypt_worker(engine_class, block_size, key, previous_block, chunk):
+    """Process pool worker: CFB-decrypt one chunk"""
+    return _cfb_decrypt_chunk(engine_class(), block_size, chunk, key, previous_block)
+
+
+class BlockModes:
+    """
+    Modes of operation over a block engine
+    Subclasses set name, block_size, ENGINES and _validate_key
+    """
+
+    name = 'Block cipher'
+    block_size = None
+    ENGINES = {}
+
+    def __init__(self, engine):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown {self.name} engine: {engine} "
+                             f"(choose from {', '.join(self.ENGINES)})")
+        self.engine = engine
+        self.core = self.ENGINES[engine]()
+
+    def _split_padded(self, plaintext):
+        """
+        PKCS#7 without padding the whole buffer
+        Returns: (view of the whole blocks of plaintext, synthesised final padded block)
+        """
+        view = memoryview(plaintext).cast('B')
+        n = len(view) - len(view) % self.block_size
+        return view[:n], pkcs7_pad_tail(view[n:], self.block_size)
+
+    def _split_last(self, ciphertext):
+        """
+        Views of a padded ciphertext: (all blocks but the last, last block)
+        The last block is the one that carries the padding
+        """
+        if len(ciphertext) % self.block_size != 0:
+            raise ValueError("Ciphertext length must be multiple of block size")
+        view = memoryview(ciphertext).cast('B')
+        return view[:-self.block_size], view[-self.block_size:]
+
+    def _join_unpadded(self, body, last):
+        """Decrypted body + last block with its padding stripped (validated)"""
+        last = last[:pkcs7_unpadded_length(last, self.block_size)]
+        return body + last if last else body
+
+    def _validate_key(self, key):
+        """Validate a raw key or pass through an expanded key context"""
+        raise NotImplementedError
+
+    def expand_key(self, key):
+        """
+        Validate key and return its expanded context (key schedule computed once)
+        The context can be passed as `key` to every mode function
+        """
+        return self.core.expand_key(self._validate_key(key))
+
+    def _validate_iv(self, iv):
+        """Validate IV length"""
+        if iv is not None and len(iv) != self.block_size:
+            raise ValueError(f"{self.name} IV must be {self.block_size} bytes, got {len(iv)}")
+        return iv
+
+    def _require_iv(self, iv, mode):
+        if iv is None:
+            raise ValueError(f"IV is required for {mode} mode")
+        return self._validate_iv(iv)
+
+    def _new_iv(self, iv):
+        """Random IV if none was given"""
+        return os.urandom(self.block_size) if iv is None else self._validate_iv(iv)
+
+    def _validate_mode(self, mode):
+        mode = mode.upper()
+        if mode not in MODES:
+            raise ValueError(f"Unsupported mode: {mode}")
+        return mode
+
+    def _run(self, processor, data):
+        """One-shot update() + finalize() of a stream object"""
+        return processor.update(data) + processor.finalize()
+
+    def _parallel_tasks(self, worker_args, data, workers):
+        """
+        Split data into whole-block chunks for run_chunk_tasks
+        worker_args(start, chunk) returns the worker arguments for one chunk
+        """
+        chunk_size = chunk_size_for(len(data), self.block_size, workers)
+        return [(start, worker_args(start, bytes(data[start:start + chunk_size])))
+                for start in range(0, len(data), chunk_size)]
+
+    # ==================== ECB MODE ====================
+
+    def encrypt_ecb(self, plaintext, key):
+        """
+        ECB Encryption
+        Returns: bytes (ciphertext)
+        """
+        key = self.expand_key(key)
+        body, last = self._split_padded(plaintext)
+
+        # Encrypt all blocks (independent in ECB - engine may batch them)
+        return self.core.encrypt_blocks(body, key) + self.core.encrypt_blocks(last, key)
+
+    def decrypt_ecb(self, ciphertext, key):
+        """
+        ECB Decryption
+        Returns: bytes (plaintext)
+        """
+        key = self.expand_key(key)
+        if not ciphertext:
+            return b''
+        body, last = self._split_last(ciphertext)
+
+        # Decrypt all blocks (independent in ECB - engine may batch them)
+        return self._join_unpadded(self.core.decrypt_blocks(body, key),
+                                   self.core.decrypt_blocks(last, key))
+
+    # ==================== CBC MODE ====================
+
+    def encrypt_cbc(self, plaintext, key, iv=None):
+        """
+        CBC Encryption
+        iv: block_size bytes (if None, generate random)
+        Returns: (ciphertext, iv) tuple
+        """
+        enc = self.encryptor(key, 'CBC', iv)
+        return self._run(enc, plaintext), enc.iv
+
+    def decrypt_cbc(self, ciphertext, key, iv, workers=None):
+        """
+        CBC Decryption
+        Each block only needs C_i and C_{i-1}, so blocks are decrypted in
+        batches, and large inputs are split across worker processes
+        workers: None = serial below PARALLEL_MIN_BYTES, all CPUs above
+                 1 = always serial
+        Returns: bytes (plaintext)
+        """
+        key = self.expand_key(key)
+        iv = self._require_iv(iv, 'CBC')
+        bs = self.block_size
+
+        if not ciphertext:
+            return b''
+        body, last = self._split_last(ciphertext)
+
+        # The padded last block is decrypted on its own; the body straight from the input view
+        last = _cbc_decrypt_chunk(self.core, bs, last, key, body[-bs:] if body else iv)
+        if not body:
+            return self._join_unpadded(b'', last)
+
+        workers = resolve_workers(workers, len(ciphertext))
+        if workers <= 1:
+            plaintext = _cbc_decrypt_chunk(self.core, bs, body, key, iv)
+        else:
+            # Chunks overlap by one block: each task gets the ciphertext
+            # block just before it (or the IV) for the XOR
+            tasks = self._parallel_tasks(
+                lambda start, chunk: (type(self.core), bs, key.key,
+                                      bytes(iv if start == 0 else body[start - bs:start]),
+                                      chunk),
+                body, workers)
+            plaintext = run_chunk_tasks(_cbc_decrypt_worker, tasks, len(body), workers)
+
+        return self._join_unpadded(plaintext, last)
+
+    # ==================== CFB MODE ====================
+
+    def encrypt_cfb(self, plaintext, key, iv=None):
+        """
+        CFB Encryption (no padding, any length)
+        iv: block_size bytes (if None, generate random)
+        Returns: (ciphertext, iv) tuple
+        """
+        enc = self.encryptor(key, 'CFB', iv)
+        return self._run(enc, plaintext), enc.iv
+
+    def decrypt_cfb(self, ciphertext, key, iv, workers=None):
+        """
+        CFB Decryption
+        The cipher inputs are the previous ciphertext blocks, so decryption
+        is batched and large inputs are split across worker processes
+        Returns: bytes (plaintext)
+        """
+        key = self.expand_key(key)
+        iv = self._require_iv(iv, 'CFB')
+        bs = self.block_size
+
+        if not ciphertext:
+            return b''
+
+        workers = resolve_workers(workers, len(ciphertext))
+        if workers <= 1:
+            return _cfb_decrypt_chunk(self.core, bs, ciphertext, key, iv)
+
+        tasks = self._parallel_tasks(
+            lambda start, chunk: (type(self.core), bs, key.key,
+                                  bytes(iv if start == 0 else ciphertext[start - bs:start]),
+                                  chunk),
+            ciphertext, workers)
+        return run_chunk_tasks(_cfb_decrypt_worker, tasks, len(ciphertext), workers)
+
+    # ==================== OFB MODE ====================
+
+    def crypt_ofb(self, data, key, iv):
+        """
+        OFB keystream XOR (encryption and decryption are the same operation)
+        The keystream O_i = E(O_{i-1}) is inherently serial
+        Returns: bytes
+        """
+        enc = self.encryptor(key, 'OFB', self._require_iv(iv, 'OFB'))
+        return self._run(enc, data)
+
+    def encrypt_ofb(self, plaintext, key, iv=None):
+        """
+        OFB Encryption (no padding, any length)
+        iv: block_size bytes (if None, generate random)
+        Returns: (ciphertext, iv) tuple
+        """
+        iv = self._new_iv(iv)
+        return self.crypt_ofb(plaintext, key, iv), iv
+
+    def decrypt_ofb(self, ciphertext, key, iv):
+        """
+        OFB Decryption
+        Returns: bytes (plaintext)
+        """
+        return self.crypt_ofb(ciphertext, key, iv)
+
+    # ==================== CTR MODE ====================
+
+    def crypt_ctr(self, data, key, iv, block_offset=0, workers=None):
+        """
+        CTR keystream XOR (encryption and decryption are the same operation)
+        data: bytes (any length, no padding)
+        iv: initial counter block
+        block_offset: index of the first block of data in the stream
+                      (random access - decrypt any part without the rest)
+        workers: None = serial below PARALLEL_MIN_BYTES, all CPUs above
+                 1 = always serial
+        Returns: bytes
+        """
+        key = self.expand_key(key)
+        iv = self._require_iv(iv, 'CTR')
+        bs = self.block_size
+
+        counter = int.from_bytes(iv, 'big') + block_offset
+
+        workers = resolve_workers(workers, len(data))
+        if workers <= 1 or len(data) <= bs:
+            return _ctr_xor(self.core, bs, data, key, counter)
+
+        # Split into independent counter ranges, one task each
+        tasks = self._parallel_tasks(
+            lambda start, chunk: (type(self.core), bs, key.key, counter + start // bs, chunk),
+            data, workers)
+        return run_chunk_tasks(_ctr_worker, tasks, len(data), workers)
+
+    def encrypt_ctr(self, plaintext, key, iv=None, workers=None):
+        """
+        CTR Encryption
+        iv: initial counter block (if None, generate random)
+        Returns: (ciphertext, iv) tuple
+        """
+        iv = self._new_iv(iv)
+        return self.crypt_ctr(plaintext, key, iv, workers=workers), iv
+
+    def decrypt_ctr(self, ciphertext, key, iv, workers=None):
+        """
+        CTR Decryption
+        Returns: bytes (plaintext)
+        """
+        return self.crypt_ctr(ciphertext, key, iv, workers=workers)
+
+    # ==================== BATCH ====================
+
+    def _batch_ivs(self, ivs, count):
+        """Per-record IVs: validate the given list or draw them all in one urandom call"""
+        bs = self.block_size
+        if ivs is None:
+            pool = os.urandom(bs * count)
+            return [pool[i:i + bs] for i in range(0, len(pool), bs)]
+        ivs = [self._validate_iv(iv) for iv in ivs]
+        if len(ivs) != count:
+            raise ValueError(f"Got {len(ivs)} IVs for {count} records")
+        if None in ivs:
+            raise ValueError("IV is required for every record")
+        return ivs
+
+    def _chain_batch(self, records, ivs, key, mode):
+        """
+        CBC/CFB/OFB over many whole-block records in lockstep
+        Step i processes block i of every record that is long enough with a
+        single engine call; records are ordered longest first so the records
+        still running at step i are always a prefix
+        Returns: list of outputs (same order as records)
+        """
+        bs = self.block_size
+        order = sorted(range(len(records)), key=lambda j: len(records[j]), reverse=True)
+        ordered = [records[j] for j in order]
+        previous = b''.join(ivs[j] for j in order)
+        outputs = [[] for _ in ordered]
+
+        active = len(ordered)
+        offset = 0
+        while True:
+            while active and len(ordered[active - 1]) <= offset:
+                active -= 1
+            if not active:
+                break
+
+            blocks = b''.join(record[offset:offset + bs] for record in ordered[:active])
+            previous = previous[:active * bs]
+            if mode == 'CBC':
+                previous = out = self.core.encrypt_blocks(xor_bytes(blocks, previous), key)
+            elif mode == 'CFB':
+                previous = out = xor_bytes(blocks, self.core.encrypt_blocks(previous, key))
+            else:  # OFB
+                previous = self.core.encrypt_blocks(previous, key)
+                out = xor_bytes(blocks, previous)
+
+            for j in range(active):
+                outputs[j].append(out[j * bs:(j + 1) * bs])
+            offset += bs
+
+        result = [None] * len(records)
+        for position, j in enumerate(order):
+            result[j] = b''.join(outputs[position])
+        return result
+
+    def _stream_batch(self, records, ivs, key, mode):
+        """
+        CTR/OFB keystream XOR for many records (encryption = decryption)
+        Records are zero-extended to whole blocks and the outputs truncated -
+        the extension never feeds back into a later block
+        """
+        bs = self.block_size
+        lengths = [len(r) for r in records]
+        sizes = [n + -n % bs for n in lengths]
+        if mode == 'OFB':
+            extended = [bytes(r) + bytes(size - n) for r, n, size in zip(records, lengths, sizes)]
+            return [out[:n] for out, n in
+                    zip(self._chain_batch(extended, ivs, key, 'OFB'), lengths)]
+
+        # CTR: all counter blocks of all records in one engine call
+        counters = b''.join(_ctr_counters(int.from_bytes(iv, 'big'), size // bs, bs)
+                            for iv, size in zip(ivs, sizes))
+        data = b''.join(bytes(r) + bytes(size - n) for r, n, size in zip(records, lengths, sizes))
+        xored = xor_bytes(data, self.core.encrypt_blocks(counters, key))
+        return _split_records(xored, lengths, sizes)
+
+    def encrypt_batch(self, messages, key, mode='CBC', ivs=None):
+        """
+        Encrypt many messages under one key
+        The key is validated and expanded once; records are padded and
+        encrypted together (one engine call for ECB/CTR, one per block
+        position for CBC/CFB/OFB), so a NumPy engine vectorises across records
+        messages: list or iterator of bytes
+        ivs: one IV per message (if None, generate random)
+        Returns: (ciphertexts, ivs) - ivs is None for ECB
+        """
+        mode = self._validate_mode(mode)
+        key = self.expand_key(key)
+        bs = self.block_size
+        messages = [memoryview(m).cast('B') for m in messages]
+
+        if mode in PADDED_MODES:
+            padded = []
+            for m in messages:
+                n = len(m) - len(m) % bs
+                padded.append(bytes(m[:n]) + pkcs7_pad_tail(m[n:], bs))
+            if mode == 'ECB':
+                ciphertext = self.core.encrypt_blocks(b''.join(padded), key)
+                return _split_records(ciphertext, [len(p) for p in padded]), None
+            ivs = self._batch_ivs(ivs, len(messages))
+            return self._chain_batch(padded, ivs, key, 'CBC'), ivs
+
+        ivs = self._batch_ivs(ivs, len(messages))
+        if mode == 'CFB':
+            lengths = [len(m) for m in messages]
+            extended = [bytes(m) + bytes(-n % bs) for m, n in zip(messages, lengths)]
+            ciphertexts = self._chain_batch(extended, ivs, key, 'CFB')
+            return [c[:n] for c, n in zip(ciphertexts, lengths)], ivs
+        return self._stream_batch(messages, ivs, key, mode), ivs
+
+    def decrypt_batch(self, ciphertexts, key, mode='CBC', ivs=None):
+        """
+        Decrypt many ciphertexts under one key
+        ECB/CBC/CFB need no chaining on decryption: every record is
+        decrypted in a single batched engine call
+        ivs: one IV per ciphertext (required for every mode except ECB)
+        Returns: list of plaintexts
+        """
+        mode = self._validate_mode(mode)
+        key = self.expand_key(key)
+        bs = self.block_size
+        ciphertexts = [memoryview(c).cast('B') for c in ciphertexts]
+        if mode != 'ECB':
+            if ivs is None:
+                raise ValueError(f"IV is required for {mode} mode")
+            ivs = self._batch_ivs(ivs, len(ciphertexts))
+
+        if mode in ('OFB', 'CTR'):
+            return self._stream_batch(ciphertexts, ivs, key, mode)
+
+        lengths = [len(c) for c in ciphertexts]
+        if mode == 'CFB':
+            # P_i = C_i XOR E(C_{i-1}) - the feedback is all known ciphertext
+            sizes = [n + -n % bs for n in lengths]
+            feedback = b''.join(bytes(iv) + bytes(c[:size - bs]) if size else b''
+                                for iv, c, size in zip(ivs, ciphertexts, sizes))
+            data = b''.join(bytes(c) + bytes(size - n)
+                            for c, n, size in zip(ciphertexts, lengths, sizes))
+            xored = xor_bytes(data, self.core.encrypt_blocks(feedback, key))
+            return _split_records(xored, lengths, sizes)
+
+        for n in lengths:
+            if n == 0 or n % bs != 0:
+                raise ValueError("Ciphertext length must be multiple of block size")
+        decrypted = self.core.decrypt_blocks(b''.join(ciphertexts), key)
+        if mode == 'CBC':
+            chained = b''.join(bytes(iv) + bytes(c[:-bs]) for iv, c in zip(ivs, ciphertexts))
+            decrypted = xor_bytes(decrypted, chained)
+
+        records = _split_records(decrypted, lengths)
+        return [r[:pkcs7_unpadded_length(r, bs)] for r in records]
+
+    # ==================== STREAMING ====================
+
+    def encryptor(self, key, mode='ECB', iv=None):
+        """
+        Incremental encryptor: out = enc.update(chunk) ... + enc.finalize()
+        Chaining state and partial blocks are carried between update() calls
+        mode: 'ECB', 'CBC', 'CFB', 'OFB' or 'CTR'
+        iv: block_size bytes (if None, generate random - read it from enc.iv)
+        Returns: StreamEncryptor
+        """
+        mode = self._validate_mode(mode)
+        key = self.expand_key(key)
+        iv = None if mode == 'ECB' else self._new_iv(iv)
+        return StreamEncryptor(self.core, self.block_size, key, mode, iv)
+
+    def decryptor(self, key, mode='ECB', iv=None):
+        """
+        Incremental decryptor (padding is checked in finalize())
+        iv: required for every mode except ECB
+        Returns: StreamDecryptor
+        """
+        mode = self._validate_mode(mode)
+        key = self.expand_key(key)
+        iv = None if mode == 'ECB' else self._require_iv(iv, mode)
+        return StreamDecryptor(self.core, self.block_size, key, mode, iv)
+
+    def encrypt_file(self, input_path, output_path, key, mode='ECB', iv=None,
+                     chunk_size=CHUNK_SIZE):
+        """
+        Encrypt a file to a raw ciphertext file in fixed-size chunks
+        Input and output are memory-mapped; memory use is bounded by
+        chunk_size, not by the file size
+        Returns: iv_used (None for ECB)
+        """
+        enc = self.encryptor(key, mode, iv)
+        map_file(enc, input_path, output_path, chunk_size)
+        return enc.iv
+
+    def decrypt_file(self, input_path, output_path, key, mode='ECB', iv=None,
+                     chunk_size=CHUNK_SIZE):
+        """
+        Decrypt a raw ciphertext file in fixed-size chunks
+        Returns: number of plaintext bytes written
+        """
+        dec = self.decryptor(key, mode, iv)
+        return map_file(dec, input_path, output_path, chunk_size)
+
+    # ==================== GENERAL INTERFACE ====================
+
+    def encrypt(self, plaintext, key, mode='ECB', iv=None):
+        """
+        General encryption interface
+        mode: 'ECB', 'CBC', 'CFB', 'OFB' or 'CTR'
+        Returns: (ciphertext, iv_used) - iv_used is None for ECB
+        """
+        mode = self._validate_mode(mode)
+
+        if mode == 'ECB':
+            return self.encrypt_ecb(plaintext, key), None
+        if mode == 'CBC':
+            return self.encrypt_cbc(plaintext, key, iv)
+        if mode == 'CFB':
+            return self.encrypt_cfb(plaintext, key, iv)
+        if mode == 'OFB':
+            return self.encrypt_ofb(plaintext, key, iv)
+        return self.encrypt_ctr(plaintext, key, iv)
+
+    def decrypt(self, ciphertext, key, mode='ECB', iv=None):
+        """
+        General decryption interface
+        iv: required for every mode except ECB
+        Returns: plaintext
+        """
+        mode = self._validate_mode(mode)
+
+        if mode == 'ECB':
+            return self.decrypt_ecb(ciphertext, key)
+
+        iv = self._require_iv(iv, mode)
+        if mode == 'CBC':
+            return self.decrypt_cbc(ciphertext, key, iv)
+        if mode == 'CFB':
+            return self.decrypt_cfb(ciphertext, key, iv)
+        if mode == 'OFB':
+            return self.decrypt_ofb(ciphertext, key, iv)
+        return self.decrypt_ctr(ciphertext, key, iv)
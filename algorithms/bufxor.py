@@ -0,0 +1,41 @@
+"""
+Whole-buffer XOR for the block cipher modes
+Chaining (CBC/CFB) and keystream (OFB/CTR/GCM) XORs go through xor_bytes:
+one big-int XOR for short buffers, one vectorised NumPy XOR for long ones,
+never a Python-level loop over bytes
+NumPy is optional - without it every buffer uses the big-int path
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy not installed - big-int XOR only
+    np = None
+
+HAS_NUMPY = np is not None
+
+# From this length on NumPy beats int.from_bytes / to_bytes
+XOR_NUMPY_MIN_BYTES = 512
+
+
+def _xor_int(a, b):
+    """XOR as two big integers (little-endian conversion is the cheaper one)"""
+    xored = int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')
+    return xored.to_bytes(len(a), 'little')
+
+
+def _xor_numpy(a, b):
+    """XOR as uint8 arrays viewed straight over the input buffers"""
+    return np.bitwise_xor(np.frombuffer(a, dtype=np.uint8),
+                          np.frombuffer(b, dtype=np.uint8)).tobytes()
+
+
+def xor_bytes(a, b):
+    """
+    XOR two equal-length buffers (bytes, bytearray, memoryview)
+    Returns: bytes
+    """
+    if len(a) != len(b):
+        raise ValueError(f"XOR operands differ in length: {len(a)} != {len(b)}")
+    if HAS_NUMPY and len(a) >= XOR_NUMPY_MIN_BYTES:
+        return _xor_numpy(a, b)
+    return _xor_int(a, b)
@@ -3,7 +3,43 @@ Caesar Cipher - Brute Force Attack (Improved Version)
 Cải tiến: Thêm bigram analysis và cải thiện scoring mechanism
 """
 
+import os
+import re
+from collections import Counter
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+
+# Mọi byte không phải chữ cái thường a-z (bị xóa khi lọc dòng chữ cái)
+_NON_LETTERS = bytes(b for b in range(256) if not 97 <= b <= 122)
+
+# 26 bảng str.translate: _SHIFT_TABLES[s] dịch mỗi chữ cái đi s vị trí (giữ hoa/thường)
+_SHIFT_TABLES = [
+    str.maketrans(ALPHABET + ALPHABET.upper(),
+                  ALPHABET[s:] + ALPHABET[:s] + (ALPHABET[s:] + ALPHABET[:s]).upper())
+    for s in range(26)
+]
+
+
+# Crack thích nghi: số chữ cái của các đoạn đầu được thử trước khi phân tích cả văn bản
+SAMPLE_SIZES = (1024, 4096, 16384)
+
+# Độ chênh tương đối tối thiểu giữa ứng viên tốt nhất và ứng viên thứ hai để dừng sớm
+MIN_CONFIDENCE = 0.15
+
+
+def letter_prefix_end(text, letters):
+    """
+    Vị trí kết thúc của đoạn đầu text chứa đúng `letters` chữ cái a-z / A-Z
+    Returns: index, hoặc None nếu text có ít chữ cái hơn
+    """
+    match = re.match(r'(?:[^A-Za-z]*[A-Za-z]){%d}' % letters, text)
+    return match.end() if match else None
+
+
 class CaesarCipher:
+    # Số ứng viên được giải mã thật sự (các khóa còn lại chỉ có điểm)
+    TOP_CANDIDATES = 5
+    
     def __init__(self):
         # Tần suất chữ cái tiếng Anh (%)
         self.english_freq = {
@@ -30,21 +66,13 @@ class CaesarCipher:
             'was', 'are', 'been', 'has', 'had', 'were', 'said', 'can', 'what', 'so'
         }
     
+    def encrypt_with_key(self, plaintext, key):
+        """Mã hóa với một khóa cụ thể (chỉ dịch chữ cái a-z / A-Z)"""
+        return plaintext.translate(_SHIFT_TABLES[key % 26])
+    
     def decrypt_with_key(self, ciphertext, key):
-        """Giải mã với một khóa cụ thể"""
-        plaintext = []
-        
-        for char in ciphertext:
-            if char.isupper():
-                shifted = (ord(char) - ord('A') - key) % 26
-                plaintext.append(chr(shifted + ord('A')))
-            elif char.islower():
-                shifted = (ord(char) - ord('a') - key) % 26
-                plaintext.append(chr(shifted + ord('a')))
-            else:
-                plaintext.append(char)
-        
-        return ''.join(plaintext)
+        """Giải mã với một khóa cụ thể (chỉ dịch chữ cái a-z / A-Z)"""
+        return ciphertext.translate(_SHIFT_TABLES[-key % 26])
     
     def calculate_frequency_score(self, text):
         """Tính điểm dựa trên tần suất chữ cái (chi-squared test)"""
@@ -117,36 +145,154 @@ class CaesarCipher:
         
         return composite
     
-    def brute_force(self, ciphertext):
+    def count_statistics(self, ciphertext):
         """
-        Thử tất cả 26 khóa và trả về kết quả tốt nhất
-        Returns: (key, plaintext, results)
+        Đếm một lần duy nhất trên ciphertext: tần suất chữ cái, bigram và từ
+        Mọi khóa đều được chấm điểm từ các bảng này (xem score_shifts)
+        Returns: dict {'letters', 'bigrams', 'words', 'total_words'}
         """
-        results = []
+        return self.count_chunk_statistics([ciphertext])
+    
+    def count_chunk_statistics(self, chunks):
+        """
+        Như count_statistics nhưng trên một dãy chunk (vd. đọc dần từ file)
+        Bigram và từ nằm vắt qua ranh giới hai chunk vẫn được đếm đúng
+        Chỉ giữ các từ đủ ngắn để có thể là từ phổ biến -> bộ nhớ không tăng theo kích thước file
+        Returns: dict {'letters', 'bigrams', 'words', 'total_words'}
+        """
+        max_word_len = max(len(word) for word in self.common_words)
+        letter_counts = [0] * 26
+        bigram_counts = Counter()
+        word_counts = Counter()
+        total_words = 0
+        
+        last_letter = b''   # chữ cái cuối của chunk trước (cho bigram vắt qua ranh giới)
+        pending = None      # từ chưa kết thúc ở cuối chunk trước (đã làm sạch, tối đa max_word_len + 1)
         
+        for chunk in chunks:
+            if not chunk:
+                continue
+            text_lower = chunk.lower()
+            
+            # Dòng chữ cái a-z liền nhau (bỏ dấu câu, khoảng trắng) dạng bytes
+            letters = text_lower.encode('ascii', 'ignore').translate(None, _NON_LETTERS)
+            if letters:
+                for i, c in enumerate(ALPHABET.encode()):
+                    letter_counts[i] += letters.count(c)
+                letters = last_letter + letters
+                bigram_counts.update(zip(letters, letters[1:]))
+                last_letter = letters[-1:]
+            
+            # Nối phần từ còn dở của chunk trước vào từ đầu tiên (hoặc kết thúc nó)
+            words = text_lower.split()
+            if pending is not None:
+                if text_lower[0].isspace():
+                    words.insert(0, pending)
+                else:
+                    words[0] = pending + words[0]
+                pending = None
+            
+            # Từ cuối chưa chắc đã hết nếu chunk không kết thúc bằng khoảng trắng
+            # Chỉ giữ max_word_len + 1 chữ cái: từ dài hơn không thể là từ phổ biến,
+            # nên văn bản không có khoảng trắng không làm pending lớn dần theo file
+            if not text_lower[-1].isspace():
+                pending = self._clean_word(words.pop())[:max_word_len + 1]
+            
+            # Từ đã bỏ dấu câu -> số lần xuất hiện (mỗi từ khác nhau chỉ làm sạch một lần)
+            for word, count in Counter(words).items():
+                total_words += count
+                word = self._clean_word(word)
+                if len(word) <= max_word_len:
+                    word_counts[word] += count
+        
+        if pending is not None:
+            total_words += 1
+            if len(pending) <= max_word_len:
+                word_counts[pending] += 1
+        
+        return {
+            'letters': letter_counts,
+            'bigrams': {(a - 97, b - 97): n for (a, b), n in bigram_counts.items()},
+            'words': word_counts,
+            'total_words': total_words
+        }
+    
+    def _shift_word(self, word, key):
+        """Mã hóa một từ chữ thường với khóa key"""
+        return word.translate(_SHIFT_TABLES[key % 26])
+    
+    def score_shifts(self, stats):
+        """
+        Chấm điểm cả 26 khóa bằng cách xoay các bảng đếm của count_statistics
+        Plaintext chữ i ứng với ciphertext chữ (i + key) % 26, nên không cần giải mã
+        Kết quả giống hệt calculate_*_score trên từng bản giải mã
+        Returns: list 26 dict (chưa có 'plaintext')
+        """
+        letter_counts = stats['letters']
+        bigram_counts = stats['bigrams']
+        word_counts = stats['words']
+        total_words = stats['total_words']
+        total_letters = sum(letter_counts)
+        total_bigrams = total_letters - 1
+        
+        bigram_index = [(ord(b[0]) - 97, ord(b[1]) - 97) for b in self.common_bigrams]
+        
+        results = []
         for key in range(26):
-            plaintext = self.decrypt_with_key(ciphertext, key)
+            # Chi-squared trên bảng tần suất đã xoay
+            if total_letters == 0:
+                freq_score = float('inf')
+            else:
+                freq_score = 0
+                for i, letter in enumerate(ALPHABET):
+                    observed = letter_counts[(i + key) % 26] / total_letters * 100
+                    expected = self.english_freq[letter]
+                    freq_score += ((observed - expected) ** 2) / expected
             
-            # Tính các điểm thành phần
-            freq_score = self.calculate_frequency_score(plaintext)
-            bigram_score = self.calculate_bigram_score(plaintext)
-            word_score = self.calculate_word_score(plaintext)
+            # Bigram phổ biến sau khi giải mã = bigram đã xoay trong ciphertext
+            if total_letters < 2:
+                bigram_score = 0
+            else:
+                bigram_count = sum(bigram_counts.get(((a + key) % 26, (b + key) % 26), 0)
+                                   for a, b in bigram_index)
+                bigram_score = bigram_count / total_bigrams * 100
             
-            # Tính điểm tổng hợp
-            composite_score = self.calculate_composite_score(freq_score, bigram_score, word_score)
+            # Từ hợp lệ: mã hóa từ điển với khóa key rồi tra bảng từ của ciphertext
+            if total_words == 0:
+                word_score = 0
+            else:
+                valid_words = sum(word_counts.get(self._shift_word(word, key), 0)
+                                  for word in self.common_words)
+                word_score = valid_words / total_words * 100
             
             results.append({
                 'key': key,
-                'plaintext': plaintext,
                 'freq_score': freq_score,
                 'bigram_score': bigram_score,
                 'word_score': word_score,
-                'composite_score': composite_score
+                'composite_score': self.calculate_composite_score(freq_score, bigram_score, word_score)
             })
         
+        return results
+    
+    def brute_force(self, ciphertext, top=None):
+        """
+        Thử tất cả 26 khóa và trả về kết quả tốt nhất
+        Điểm của mọi khóa lấy từ một lần đếm duy nhất; chỉ `top` ứng viên tốt nhất
+        (mặc định TOP_CANDIDATES) được giải mã, các ứng viên khác có plaintext = None
+        Returns: (key, plaintext, results)
+        """
+        if top is None:
+            top = self.TOP_CANDIDATES
+        
+        results = self.score_shifts(self.count_statistics(ciphertext))
+        
         # Sắp xếp theo composite score (thấp nhất = tốt nhất)
         results.sort(key=lambda x: x['composite_score'])
         
+        for i, result in enumerate(results):
+            result['plaintext'] = self.decrypt_with_key(ciphertext, result['key']) if i < max(top, 1) else None
+        
         best_result = results[0]
         return best_result['key'], best_result['plaintext'], results
     
@@ -156,18 +302,77 @@ class CaesarCipher:
         Returns: (key, plaintext)
         """
         key, plaintext, all_results = self.brute_force(ciphertext)
+        self.print_candidates(all_results, ciphertext)
+        return key, plaintext
+    
+    def confidence(self, results):
+        """
+        Độ tin cậy của kết quả đã sắp xếp: (điểm thứ hai - điểm tốt nhất) / điểm thứ hai
+        0 = không phân biệt được, càng gần 1 càng chắc chắn
+        """
+        best, second = results[0]['composite_score'], results[1]['composite_score']
+        if second == 0 or second == float('inf'):
+            return 0.0
+        return (second - best) / second
+    
+    def crack_adaptive(self, ciphertext, sample_sizes=SAMPLE_SIZES, min_confidence=MIN_CONFIDENCE):
+        """
+        Crack trên các đoạn đầu ciphertext dài dần (sample_sizes chữ cái, cuối cùng là cả văn bản),
+        dừng ngay khi độ tin cậy đạt min_confidence
+        Returns: (key, plaintext, confidence, số chữ cái đã phân tích)
+        """
+        for letters in list(sample_sizes) + [None]:
+            end = letter_prefix_end(ciphertext, letters) if letters is not None else None
+            sample = ciphertext if end is None else ciphertext[:end]
+            stats = self.count_statistics(sample)
+            results = self.score_shifts(stats)
+            results.sort(key=lambda x: x['composite_score'])
+            confidence = self.confidence(results)
+            if confidence >= min_confidence or end is None:
+                break
         
-        # In ra top 5 kết quả tốt nhất
-        print("\n=== Top 5 Candidates ===")
+        key = results[0]['key']
+        analysed = sum(stats['letters'])
+        self.print_candidates(results, ciphertext)
+        print(f"\nConfidence: {confidence:.2f} after {analysed} letters "
+              f"({len(sample)}/{len(ciphertext)} characters)")
         
-        for i, result in enumerate(all_results[:5], 1):
+        return key, self.decrypt_with_key(ciphertext, key), confidence, analysed
+    
+    def print_candidates(self, results, ciphertext):
+        """In ra TOP_CANDIDATES kết quả tốt nhất, preview giải mã từ đầu ciphertext"""
+        print(f"\n=== Top {self.TOP_CANDIDATES} Candidates ===")
+        
+        for i, result in enumerate(results[:self.TOP_CANDIDATES], 1):
             print(f"\n#{i} - Key: {result['key']}")
             print(f"  Word Score: {result['word_score']:.1f}% | Bigram Score: {result['bigram_score']:.1f}%")
             print(f"  Freq Score: {result['freq_score']:.2f} | Composite: {result['composite_score']:.2f}")
-            preview = result['plaintext'][:150].replace('\n', ' ')
+            preview = self.decrypt_with_key(ciphertext[:150], result['key']).replace('\n', ' ')
             print(f"  Preview: {preview}...")
-        
-        return key, plaintext
+
+
+# Kích thước chunk khi đọc file (ký tự)
+CHUNK_SIZE = 1 << 20
+
+# Số ký tự plaintext đầu file được trả về bởi crack_file_streaming
+PREVIEW_SIZE = 1000
+
+
+def read_chunks(path, chunk_size=CHUNK_SIZE, limit=None):
+    """
+    Đọc file text theo từng chunk chunk_size ký tự
+    limit: chỉ đọc tối đa limit ký tự đầu file (None = cả file)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            chunk = f.read(size)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
 
 
 def crack_from_file(input_file, output_file):
@@ -199,6 +404,42 @@ def crack_from_file(input_file, output_file):
     return key, plaintext
 
 
+def crack_file_streaming(input_file, output_file, chunk_size=CHUNK_SIZE, sample_size=None):
+    """
+    Crack Caesar cipher từ file với bộ nhớ cố định (không phụ thuộc kích thước file)
+    - Lượt 1: đọc từng chunk, cộng dồn thống kê chữ cái / bigram / từ
+      (sample_size: chỉ phân tích sample_size ký tự đầu file, None = cả file)
+    - Lượt 2: đọc lại từng chunk, giải mã với khóa tốt nhất và ghi thẳng ra output_file
+    
+    Output format giống crack_from_file
+    Returns: (key, preview) - preview là PREVIEW_SIZE ký tự plaintext đầu tiên
+    """
+    print(f"Reading ciphertext from: {input_file}")
+    print(f"Ciphertext size: {os.path.getsize(input_file)} bytes")
+    
+    cipher = CaesarCipher()
+    
+    # Lượt 1: thống kê
+    stats = cipher.count_chunk_statistics(read_chunks(input_file, chunk_size, sample_size))
+    results = cipher.score_shifts(stats)
+    results.sort(key=lambda x: x['composite_score'])
+    key = results[0]['key']
+    
+    head = next(read_chunks(input_file, PREVIEW_SIZE, PREVIEW_SIZE), '')
+    cipher.print_candidates(results, head)
+    
+    # Lượt 2: giải mã và ghi từng chunk
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(f"{key}\n")
+        for chunk in read_chunks(input_file, chunk_size):
+            f.write(cipher.decrypt_with_key(chunk, key))
+    
+    print(f"\n✓ Results saved to: {output_file}")
+    print(f"✓ Best key found: {key}")
+    
+    return key, cipher.decrypt_with_key(head, key)
+
+
 # Test với ví dụ
 if __name__ == "__main__":
     # Ví dụ test nhanh
@@ -3,7 +3,11 @@ DES Package
 Export DES core and modes
 """
 
-from .des_core import DESCore
+from .des_core import DESCore, DESKey
+from .des_int import DESInt, DESIntKey
+from .des_bitslice import DESBitslice
 from .des_modes import DESModes
+from .tdes import TDESInt, TDESKey, TDESModes
 
-__all__ = ['DESCore', 'DESModes']
\ No newline at end of file
+__all__ = ['DESCore', 'DESKey', 'DESInt', 'DESIntKey', 'DESBitslice', 'DESModes',
+           'TDESInt', 'TDESKey', 'TDESModes']
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""
+DES Bitslice Engine
+Mã hóa N block độc lập cùng lúc: 64 "bit-plane" là số nguyên N bit,
+plane j chứa bit thứ j của mọi block (block 0 ở bit cao nhất)
+- IP, IP_INV, E, P: chỉ là đổi chỗ các plane (không tốn phép tính)
+- S-box: mạch boolean (decoder 2-bit + minterm) chạy trên mọi block
+  bằng vài trăm phép AND/OR/XOR số nguyên lớn mỗi round
+Dùng cho ECB/CTR khối lượng lớn; block đơn lẻ đi qua DESInt
+"""
+
+from .des_core import IP, IP_INV, E, P, S_BOXES
+from .des_int import DESInt
+
+# Số block xử lý trong một lần (giới hạn kích thước plane)
+BATCH_BLOCKS = 1 << 16
+
+# Ít block hơn mức này thì vòng lặp DESInt nhanh hơn
+BITSLICE_MIN_BLOCKS = 128
+
+# _BIT_TO_ASCII[k]: byte -> b'1' nếu bit k (tính từ bit cao) bằng 1, ngược lại b'0'
+_BIT_TO_ASCII = [bytes(0x31 if (x >> (7 - k)) & 1 else 0x30 for x in range(256))
+                 for k in range(8)]
+
+
+def _sbox_circuits():
+    """
+    Dựng mạch cho 8 S-box
+    Input 6 bit b1..b6 chia thành 3 cặp (b1b2)(b3b4)(b5b6), v = 16a + 4b + c
+    Mỗi output bit = OR theo (a, b) của minterm4[4a+b] AND (OR các d2[c] cần thiết)
+    circuits[i][j] = list (4a+b, subset của c) cho output bit j của S-box i
+    """
+    circuits = []
+    for sbox in S_BOXES:
+        outputs = []
+        for j in range(4):
+            terms = []
+            for ab in range(16):
+                subset = 0
+                for c in range(4):
+                    v = 4 * ab + c
+                    row = ((v >> 4) & 2) | (v & 1)
+                    col = (v >> 1) & 0xF
+                    if (sbox[row][col] >> (3 - j)) & 1:
+                        subset |= 1 << c
+                if subset:
+                    terms.append((ab, subset))
+            outputs.append(terms)
+        circuits.append(outputs)
+    return circuits
+
+
+_CIRCUITS = _sbox_circuits()
+
+
+def _decode2(x, y, mask):
+    """Decoder 2-bit: [~x~y, ~xy, x~y, xy]"""
+    nx = x ^ mask
+    ny = y ^ mask
+    return [nx & ny, nx & y, x & ny, x & y]
+
+
+def _sbox(inputs, circuit, mask):
+    """Một S-box trên mọi block: 6 plane input -> 4 plane output"""
+    b1, b2, b3, b4, b5, b6 = inputs
+    d0 = _decode2(b1, b2, mask)
+    d1 = _decode2(b3, b4, mask)
+    d2 = _decode2(b5, b6, mask)
+
+    minterm4 = [x & y for x in d0 for y in d1]
+
+    # OR của mọi tập con các minterm d2 (16 tập)
+    subsets = [0] * 16
+    for s in range(1, 16):
+        low = s & -s
+        subsets[s] = subsets[s ^ low] | d2[low.bit_length() - 1]
+
+    outputs = []
+    for terms in circuit:
+        plane = 0
+        for ab, subset in terms:
+            plane |= minterm4[ab] if subset == 15 else minterm4[ab] & subsets[subset]
+        outputs.append(plane)
+    return outputs
+
+
+def _to_planes(data, n):
+    """Chuyển n block (bytes) thành 64 plane N bit"""
+    planes = []
+    for b in range(8):
+        column = bytes(data[b::8])  # memoryview: copy chỉ 1/8 dữ liệu
+        for k in range(8):
+            planes.append(int(column.translate(_BIT_TO_ASCII[k]), 2))
+    return planes
+
+
+def _from_planes(planes, n):
+    """Chuyển 64 plane ngược lại thành n block (bytes)"""
+    ones = int.from_bytes(b'\x01' * n, 'big')
+    result = bytearray(8 * n)
+    for b in range(8):
+        column = 0
+        for k in range(8):
+            # '0'/'1' ASCII có bit thấp nhất chính là bit cần lấy
+            ascii_bits = format(planes[8 * b + k], f'0{n}b').encode()
+            column |= (int.from_bytes(ascii_bits, 'big') & ones) << (7 - k)
+        result[b::8] = column.to_bytes(n, 'big')
+    return bytes(result)
+
+
+def _crypt_planes(planes, subkeys, mask):
+    """16 rounds DES trên các plane"""
+    x = [planes[i - 1] for i in IP]
+    left = x[:32]
+    right = x[32:]
+
+    for k in subkeys:
+        # E + XOR subkey (bit key = 1 -> đảo plane)
+        er = [right[e - 1] ^ mask if (k >> (47 - j)) & 1 else right[e - 1]
+              for j, e in enumerate(E)]
+
+        s_out = []
+        for i in range(8):
+            s_out.extend(_sbox(er[6 * i:6 * i + 6], _CIRCUITS[i], mask))
+
+        left, right = right, [left[j] ^ s_out[p - 1] for j, p in enumerate(P)]
+
+    combined = right + left
+    return [combined[i - 1] for i in IP_INV]
+
+
+class DESBitslice(DESInt):
+    """
+    DES Bitslice Engine - cùng API với DESInt
+    encrypt_blocks/decrypt_blocks xử lý đồng thời tối đa BATCH_BLOCKS block
+    """
+
+    def _crypt_blocks(self, data, subkeys):
+        if len(data) % 8 != 0:
+            raise ValueError("Data length must be multiple of 8 bytes")
+
+        n_blocks = len(data) // 8
+        if n_blocks < BITSLICE_MIN_BLOCKS:
+            return super()._crypt_blocks(data, subkeys)
+
+        data = memoryview(data).cast('B')
+        result = bytearray()
+        for start in range(0, n_blocks, BATCH_BLOCKS):
+            n = min(BATCH_BLOCKS, n_blocks - start)
+            mask = (1 << n) - 1
+            planes = _to_planes(data[8 * start:8 * (start + n)], n)
+            result += _from_planes(_crypt_planes(planes, subkeys, mask), n)
+        return bytes(result)
+
+
+def test_des_bitslice():
+    """Test bitslice engine với DESInt"""
+    import os
+
+    des = DESBitslice()
+    reference = DESInt()
+
+    print("Testing DES bitslice engine...")
+    key = os.urandom(8)
+    data = os.urandom(8 * 1000)
+    assert des.encrypt_blocks(data, key) == reference.encrypt_blocks(data, key)
+    assert des.decrypt_blocks(data, key) == reference.decrypt_blocks(data, key)
+
+    print("✓ All DES bitslice tests passed!")
+
+
+if __name__ == "__main__":
+    test_des_bitslice()
@@ -1,3 +1,7 @@
+from functools import lru_cache
+
+# Số key schedule gần nhất được giữ trong bộ nhớ (LRU)
+KEY_CACHE_SIZE = 32
 
 
 # Initial Permutation (IP) Table
@@ -132,12 +136,42 @@ PC2 = [
 SHIFTS = [1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1]
 
 
+class DESKey:
+    """
+    Key DES đã expand - 16 subkeys tính 1 lần, dùng lại cho mọi block
+    subkeys: thứ tự mã hóa (K1..K16)
+    dec_subkeys: thứ tự giải mã (K16..K1), tính sẵn
+    """
+    
+    __slots__ = ('key', 'subkeys', 'dec_subkeys')
+    
+    def __init__(self, key, subkeys, dec_subkeys):
+        self.key = key
+        self.subkeys = subkeys
+        self.dec_subkeys = dec_subkeys
+    
+    def __repr__(self):
+        return "DESKey()"
+
+
 class DESCore:
     """DES Core Algorithm - mã hóa/giải mã 1 block 64-bit"""
     
     def __init__(self):
         pass
     
+    def expand_key(self, key):
+        """
+        Tạo (hoặc lấy từ LRU cache) DESKey cho key
+        key: 8 bytes hoặc DESKey (trả về nguyên)
+        Returns: DESKey
+        """
+        if isinstance(key, DESKey):
+            if type(key) is DESKey:
+                return key
+            key = key.key  # context của engine khác
+        return _expand_key_cached(bytes(key))
+    
     def _permute(self, block, table):
         """Áp dụng permutation table lên block"""
         return [block[i - 1] for i in table]
@@ -245,12 +279,13 @@ class DESCore:
         """
         Mã hóa 1 block 64-bit
         plaintext_block: 8 bytes
-        key: 8 bytes
+        key: 8 bytes hoặc DESKey (từ expand_key)
         Returns: 8 bytes
         """
+        des_key = self.expand_key(key)
+        
         # Chuyển thành bits
         plain_bits = self._bytes_to_bits(plaintext_block)
-        key_bits = self._bytes_to_bits(key)
         
         # Initial permutation
         permuted = self._permute(plain_bits, IP)
@@ -259,12 +294,9 @@ class DESCore:
         left = permuted[:32]
         right = permuted[32:]
         
-        # Generate subkeys
-        subkeys = self._generate_subkeys(key_bits)
-        
-        # 16 rounds
-        for i in range(16):
-            left, right = self._des_round(left, right, subkeys[i])
+        # 16 rounds (subkeys đã tính sẵn trong DESKey)
+        for subkey in des_key.subkeys:
+            left, right = self._des_round(left, right, subkey)
         
         # Swap cuối cùng
         combined = right + left
@@ -280,9 +312,10 @@ class DESCore:
         Giải mã 1 block 64-bit
         Giống encrypt nhưng dùng subkeys theo thứ tự ngược lại
         """
+        des_key = self.expand_key(key)
+        
         # Chuyển thành bits
         cipher_bits = self._bytes_to_bits(ciphertext_block)
-        key_bits = self._bytes_to_bits(key)
         
         # Initial permutation
         permuted = self._permute(cipher_bits, IP)
@@ -291,12 +324,9 @@ class DESCore:
         left = permuted[:32]
         right = permuted[32:]
         
-        # Generate subkeys
-        subkeys = self._generate_subkeys(key_bits)
-        
-        # 16 rounds với subkeys ngược
-        for i in range(15, -1, -1):
-            left, right = self._des_round(left, right, subkeys[i])
+        # 16 rounds với subkeys ngược (tính sẵn trong DESKey)
+        for subkey in des_key.dec_subkeys:
+            left, right = self._des_round(left, right, subkey)
         
         # Swap cuối cùng
         combined = right + left
@@ -306,6 +336,56 @@ class DESCore:
         
         # Chuyển về bytes
         return self._bits_to_bytes(plaintext_bits)
+    
+    def encrypt_blocks(self, data, key):
+        """
+        Mã hóa nhiều block 8 bytes độc lập (ECB trên cả buffer)
+        data: bytes, độ dài là bội của 8
+        Returns: bytes
+        """
+        if len(data) % 8 != 0:
+            raise ValueError("Data length must be multiple of 8 bytes")
+        
+        des_key = self.expand_key(key)
+        result = bytearray()
+        for i in range(0, len(data), 8):
+            result += self.encrypt_block(data[i:i + 8], des_key)
+        return bytes(result)
+    
+    def decrypt_blocks(self, data, key):
+        """
+        Giải mã nhiều block 8 bytes độc lập
+        data: bytes, độ dài là bội của 8
+        Returns: bytes
+        """
+        if len(data) % 8 != 0:
+            raise ValueError("Data length must be multiple of 8 bytes")
+        
+        des_key = self.expand_key(key)
+        result = bytearray()
+        for i in range(0, len(data), 8):
+            result += self.decrypt_block(data[i:i + 8], des_key)
+        return bytes(result)
+
+
+def validate_key_length(key):
+    """Kiểm tra độ dài key DES (8 bytes)"""
+    if len(key) != 8:
+        raise ValueError(f"DES key must be 8 bytes, got {len(key)}")
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _expand_key_cached(key):
+    """Tính 16 subkeys 1 lần cho mỗi key, giữ trong LRU cache giới hạn"""
+    validate_key_length(key)
+    core = DESCore()
+    subkeys = tuple(core._generate_subkeys(core._bytes_to_bits(key)))
+    return DESKey(key, subkeys, subkeys[::-1])
+
+
+def clear_key_cache():
+    """Xóa toàn bộ key schedule đã cache"""
+    _expand_key_cached.cache_clear()
 
 
 def test_des_core():
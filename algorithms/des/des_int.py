@@ -0,0 +1,229 @@
+"""
+DES Integer Engine
+Block, hai nửa L/R và subkeys là số nguyên 64/32/48-bit thay vì list các bit
+- IP, IP_INV, E, PC1, PC2: bảng tra theo từng byte (mỗi byte input -> các bit output)
+- S-box + P gộp thành 8 bảng "SP" 64 phần tử
+Kết quả giống DESCore, nhanh hơn nhiều lần
+"""
+
+from functools import lru_cache
+
+from .des_core import (
+    IP, IP_INV, E, P, S_BOXES, PC1, PC2, SHIFTS,
+    DESKey, KEY_CACHE_SIZE, validate_key_length
+)
+
+_MASK_28 = (1 << 28) - 1
+_MASK_32 = 0xFFFFFFFF
+
+
+def _permute_bits(value, table, n_in):
+    """Permutation từng bit trên số nguyên (chỉ dùng khi dựng bảng)"""
+    result = 0
+    for position in table:
+        result = (result << 1) | ((value >> (n_in - position)) & 1)
+    return result
+
+
+def _byte_tables(table, n_in):
+    """
+    Dựng bảng tra theo byte cho một permutation table
+    tables[i][b] = output khi byte thứ i (tính từ bên trái) của input là b
+    permutation(x) = OR của tables[i][byte i của x]
+    """
+    tables = []
+    for i in range(n_in // 8):
+        shift = n_in - 8 * (i + 1)
+        tables.append([_permute_bits(b << shift, table, n_in) for b in range(256)])
+    return tables
+
+
+def _sp_tables():
+    """SP[i][v] = P(output S-box i với input 6-bit v, đặt đúng vị trí 4 bit)"""
+    tables = []
+    for i, sbox in enumerate(S_BOXES):
+        table = []
+        for v in range(64):
+            row = ((v >> 4) & 2) | (v & 1)
+            col = (v >> 1) & 0xF
+            table.append(_permute_bits(sbox[row][col] << (28 - 4 * i), P, 32))
+        tables.append(table)
+    return tables
+
+
+_IP = _byte_tables(IP, 64)
+_IP_INV = _byte_tables(IP_INV, 64)
+_E = _byte_tables(E, 32)
+_PC1 = _byte_tables(PC1, 64)
+_PC2 = _byte_tables(PC2, 56)
+_SP = _sp_tables()
+
+
+def _permute64(x, t):
+    """Permutation 64-bit -> qua 8 bảng byte"""
+    return (t[0][x >> 56] | t[1][(x >> 48) & 0xFF] | t[2][(x >> 40) & 0xFF] |
+            t[3][(x >> 32) & 0xFF] | t[4][(x >> 24) & 0xFF] | t[5][(x >> 16) & 0xFF] |
+            t[6][(x >> 8) & 0xFF] | t[7][x & 0xFF])
+
+
+def key_schedule(key):
+    """
+    Tạo 16 subkeys 48-bit (số nguyên) từ key 8 bytes
+    Returns: list 16 subkeys theo thứ tự mã hóa
+    """
+    cd = _permute64(int.from_bytes(key, 'big'), _PC1)
+    c = cd >> 28
+    d = cd & _MASK_28
+    t = _PC2
+
+    subkeys = []
+    for shift in SHIFTS:
+        c = ((c << shift) | (c >> (28 - shift))) & _MASK_28
+        d = ((d << shift) | (d >> (28 - shift))) & _MASK_28
+        cd = (c << 28) | d
+        subkeys.append(t[0][cd >> 48] | t[1][(cd >> 40) & 0xFF] | t[2][(cd >> 32) & 0xFF] |
+                       t[3][(cd >> 24) & 0xFF] | t[4][(cd >> 16) & 0xFF] |
+                       t[5][(cd >> 8) & 0xFF] | t[6][cd & 0xFF])
+    return subkeys
+
+
+def _crypt_block(block, subkeys):
+    """16 rounds DES trên 1 block 8 bytes với subkeys cho trước"""
+    e0, e1, e2, e3 = _E
+    sp0, sp1, sp2, sp3, sp4, sp5, sp6, sp7 = _SP
+
+    x = _permute64(int.from_bytes(block, 'big'), _IP)
+    left = x >> 32
+    right = x & _MASK_32
+
+    for k in subkeys:
+        # E: 32 -> 48 bits, XOR subkey, rồi S-box + P qua bảng SP
+        er = (e0[right >> 24] | e1[(right >> 16) & 0xFF] |
+              e2[(right >> 8) & 0xFF] | e3[right & 0xFF]) ^ k
+        left, right = right, left ^ (
+            sp0[er >> 42] ^ sp1[(er >> 36) & 63] ^ sp2[(er >> 30) & 63] ^
+            sp3[(er >> 24) & 63] ^ sp4[(er >> 18) & 63] ^ sp5[(er >> 12) & 63] ^
+            sp6[(er >> 6) & 63] ^ sp7[er & 63])
+
+    # Swap cuối cùng + Final permutation
+    return _permute64((right << 32) | left, _IP_INV).to_bytes(8, 'big')
+
+
+class DESIntKey(DESKey):
+    """
+    Key DES đã expand cho integer engine
+    subkeys / dec_subkeys: tuple 16 số nguyên 48-bit
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "DESIntKey()"
+
+
+class DESInt:
+    """DES Integer Engine - cùng API với DESCore"""
+
+    def expand_key(self, key):
+        """
+        Tạo (hoặc lấy từ LRU cache) DESIntKey cho key
+        key: 8 bytes, DESIntKey (trả về nguyên) hoặc DESKey
+        Returns: DESIntKey
+        """
+        if isinstance(key, DESIntKey):
+            return key
+        if isinstance(key, DESKey):
+            key = key.key
+        return _expand_int_key_cached(bytes(key))
+
+    def encrypt_block(self, plaintext_block, key):
+        """
+        Mã hóa 1 block 64-bit
+        plaintext_block: 8 bytes
+        key: 8 bytes hoặc DESIntKey
+        Returns: 8 bytes
+        """
+        if len(plaintext_block) != 8:
+            raise ValueError("Block must be 8 bytes")
+        return _crypt_block(plaintext_block, self.expand_key(key).subkeys)
+
+    def decrypt_block(self, ciphertext_block, key):
+        """
+        Giải mã 1 block 64-bit (subkeys theo thứ tự ngược)
+        ciphertext_block: 8 bytes
+        key: 8 bytes hoặc DESIntKey
+        Returns: 8 bytes
+        """
+        if len(ciphertext_block) != 8:
+            raise ValueError("Block must be 8 bytes")
+        return _crypt_block(ciphertext_block, self.expand_key(key).dec_subkeys)
+
+    def _crypt_blocks(self, data, subkeys):
+        if len(data) % 8 != 0:
+            raise ValueError("Data length must be multiple of 8 bytes")
+
+        result = bytearray()
+        for i in range(0, len(data), 8):
+            result += _crypt_block(data[i:i + 8], subkeys)
+        return bytes(result)
+
+    def encrypt_blocks(self, data, key):
+        """
+        Mã hóa nhiều block 8 bytes độc lập
+        data: bytes, độ dài là bội của 8
+        Returns: bytes
+        """
+        return self._crypt_blocks(data, self.expand_key(key).subkeys)
+
+    def decrypt_blocks(self, data, key):
+        """
+        Giải mã nhiều block 8 bytes độc lập
+        data: bytes, độ dài là bội của 8
+        Returns: bytes
+        """
+        return self._crypt_blocks(data, self.expand_key(key).dec_subkeys)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _expand_int_key_cached(key):
+    """Tính subkeys số nguyên 1 lần cho mỗi key, giữ trong LRU cache giới hạn"""
+    validate_key_length(key)
+    subkeys = tuple(key_schedule(key))
+    return DESIntKey(key, subkeys, subkeys[::-1])
+
+
+def clear_key_cache():
+    """Xóa toàn bộ key schedule đã cache"""
+    _expand_int_key_cached.cache_clear()
+
+
+def test_des_int():
+    """Test integer engine với test vector chuẩn và DESCore"""
+    import os
+    from .des_core import DESCore
+
+    des = DESInt()
+
+    key = bytes.fromhex('0123456789ABCDEF')
+    plaintext = b'Now is t'
+    expected_ciphertext = bytes.fromhex('3FA40E8A984D4815')
+
+    print("Testing DES integer engine...")
+    ciphertext = des.encrypt_block(plaintext, key)
+    print(f"Ciphertext: {ciphertext.hex()}")
+    print(f"Expected:   {expected_ciphertext.hex()}")
+    assert ciphertext == expected_ciphertext, "Encryption test failed!"
+    assert des.decrypt_block(ciphertext, key) == plaintext, "Decryption test failed!"
+
+    core = DESCore()
+    for _ in range(50):
+        key = os.urandom(8)
+        block = os.urandom(8)
+        assert des.encrypt_block(block, key) == core.encrypt_block(block, key)
+        assert des.decrypt_block(block, key) == core.decrypt_block(block, key)
+
+    print("✓ All DES integer engine tests passed!")
+
+
+if __name__ == "__main__":
+    test_des_int()
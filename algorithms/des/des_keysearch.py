@@ -0,0 +1,428 @@
+"""
+DES Known-Plaintext Key Search
+Vét cạn key DES trong một không gian key thu hẹp (key ASCII, key biết một phần)
+từ cặp plaintext/ciphertext đã biết
+- Bit thấp nhất mỗi byte key là bit parity, DES bỏ qua -> mỗi vị trí chỉ thử
+  1 giá trị cho mỗi lớp (b & 0xFE), không gian key giảm tới 2^8 lần
+- Key schedule tuyến tính theo bit key: subkey round r = OR các bảng theo
+  từng byte key, nên phần của các byte ngoài chỉ tính 1 lần cho cả vòng trong
+- Không gian key chia thành shard chạy trên process pool, báo tiến độ,
+  dừng sớm khi tìm thấy key, lưu checkpoint để chạy tiếp
+
+Usage:
+    python -m algorithms.des.des_keysearch --plaintext 4e6f772069732074 \\
+        --ciphertext ... --pattern "key??ab?" --charset printable
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+import concurrent.futures
+
+from .des_int import DESInt, key_schedule, _E, _SP, _IP, _MASK_32, _permute64
+
+# Bảng ký tự cho các byte key chưa biết
+CHARSETS = {
+    'printable': bytes(range(0x20, 0x7F)),
+    'alnum': b'0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz',
+    'lower': b'abcdefghijklmnopqrstuvwxyz',
+    'upper': b'ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+    'digits': b'0123456789',
+    'hex': b'0123456789abcdefABCDEF',
+    'all': bytes(range(256)),
+}
+
+# Số key (xấp xỉ) trong một shard gửi cho worker
+SHARD_KEYS = 1 << 15
+
+# Số shard đang chạy trên mỗi worker (giữ pool luôn bận mà không submit hết một lần)
+SHARDS_PER_WORKER = 4
+
+# Khoảng thời gian (giây) giữa hai lần ghi checkpoint
+CHECKPOINT_INTERVAL = 30.0
+
+
+class KeySpace:
+    """
+    Không gian key DES: 8 vị trí byte, mỗi vị trí một danh sách giá trị ứng viên
+    Key thứ index đánh số theo hệ cơ số hỗn hợp; vị trí nhiều ứng viên nhất
+    là vòng trong cùng (inner), các vị trí còn lại là vòng ngoài (outer)
+    """
+
+    def __init__(self, candidates):
+        """
+        candidates: 8 iterable các giá trị byte
+        Giá trị chỉ khác bit parity bị loại (giữ giá trị xuất hiện trước)
+        """
+        candidates = list(candidates)
+        if len(candidates) != 8:
+            raise ValueError(f"Key space needs 8 byte positions, got {len(candidates)}")
+
+        self.candidates = []
+        for position in candidates:
+            seen = set()
+            values = []
+            for b in position:
+                if not 0 <= b <= 0xFF:
+                    raise ValueError(f"Invalid key byte: {b}")
+                if b & 0xFE not in seen:
+                    seen.add(b & 0xFE)
+                    values.append(b)
+            if not values:
+                raise ValueError("Every key position needs at least one candidate")
+            self.candidates.append(tuple(values))
+        self.candidates = tuple(self.candidates)
+
+        radices = [len(c) for c in self.candidates]
+        self.inner = max(range(8), key=lambda i: (radices[i], i))
+        self.outer = tuple(i for i in range(8) if i != self.inner)
+        self.outer_size = 1
+        for i in self.outer:
+            self.outer_size *= radices[i]
+        self.size = self.outer_size * radices[self.inner]
+
+    @classmethod
+    def from_pattern(cls, pattern, charset='printable'):
+        """
+        Tạo key space từ pattern key biết một phần
+        pattern: 8 ký tự ('?' = chưa biết) hoặc 16 ký tự hex ('??' = chưa biết)
+        charset: tên trong CHARSETS hoặc bytes các giá trị cho byte chưa biết
+        """
+        if isinstance(charset, str):
+            if charset not in CHARSETS:
+                raise ValueError(f"Unknown charset: {charset}")
+            charset = CHARSETS[charset]
+
+        if len(pattern) == 8:
+            parts = list(pattern)
+            known = [None if p == '?' else ord(p) for p in parts]
+        elif len(pattern) == 16:
+            parts = [pattern[i:i + 2] for i in range(0, 16, 2)]
+            known = [None if p == '??' else int(p, 16) for p in parts]
+        else:
+            raise ValueError("Key pattern must be 8 characters or 16 hex digits")
+
+        return cls([charset if b is None else [b] for b in known])
+
+    def describe(self):
+        """Mô tả dạng JSON được (dùng để kiểm tra checkpoint)"""
+        return [bytes(c).hex() for c in self.candidates]
+
+    def key_at(self, index):
+        """Key (8 bytes) ở vị trí index: outer index * số inner + inner index"""
+        if not 0 <= index < self.size:
+            raise IndexError("Key index out of range")
+        outer_index, inner_index = divmod(index, len(self.candidates[self.inner]))
+        key = bytearray(8)
+        key[self.inner] = self.candidates[self.inner][inner_index]
+        for i in reversed(self.outer):
+            outer_index, digit = divmod(outer_index, len(self.candidates[i]))
+            key[i] = self.candidates[i][digit]
+        return bytes(key)
+
+    def shards(self, shard_keys=SHARD_KEYS):
+        """Chia outer index thành các khoảng [start, end) khoảng shard_keys key mỗi khoảng"""
+        per_shard = max(1, shard_keys // len(self.candidates[self.inner]))
+        return [(start, min(start + per_shard, self.outer_size))
+                for start in range(0, self.outer_size, per_shard)]
+
+
+def _subkey_tables(space):
+    """
+    tables[i][b] = tuple 16 subkeys khi chỉ byte i của key bằng b (các byte khác 0)
+    Subkeys của cả key = OR theo từng round của tables[i][key[i]]
+    """
+    tables = []
+    for i, values in enumerate(space.candidates):
+        table = {}
+        for b in values:
+            key = bytearray(8)
+            key[i] = b
+            table[b] = tuple(key_schedule(bytes(key)))
+        tables.append(table)
+    return tables
+
+
+# Trạng thái của worker process (dựng 1 lần trong initializer)
+_worker_state = {}
+
+
+def _init_worker(candidates, plaintext, ciphertext, cancel_event):
+    """Initializer của process pool: dựng key space, bảng subkey, block đã qua IP"""
+    space = KeySpace(candidates)
+    _worker_state['space'] = space
+    _worker_state['tables'] = _subkey_tables(space)
+    _worker_state['plaintext'] = plaintext
+    _worker_state['ciphertext'] = ciphertext
+    _worker_state['cancel'] = cancel_event
+
+    # So sánh trước IP_INV: IP(ciphertext) = R16 || L16
+    _worker_state['block'] = _permute64(int.from_bytes(plaintext[:8], 'big'), _IP)
+    _worker_state['target'] = _permute64(int.from_bytes(ciphertext[:8], 'big'), _IP)
+
+
+def _verify_key(key, plaintext, ciphertext):
+    """Kiểm tra key trên toàn bộ cặp đã biết (loại false positive của block đầu)"""
+    return DESInt().encrypt_blocks(plaintext, key) == ciphertext
+
+
+def _search_shard(start, end):
+    """
+    Thử mọi key có outer index trong [start, end)
+    Returns: (số key đã thử, key tìm thấy hoặc None, True nếu hết shard)
+    """
+    space = _worker_state['space']
+    tables = _worker_state['tables']
+    cancel = _worker_state['cancel']
+    block = _worker_state['block']
+    target = _worker_state['target']
+
+    e0, e1, e2, e3 = _E
+    sp0, sp1, sp2, sp3, sp4, sp5, sp6, sp7 = _SP
+    x_left = block >> 32
+    x_right = block & _MASK_32
+
+    inner_values = space.candidates[space.inner]
+    inner_tables = [tables[space.inner][b] for b in inner_values]
+    outer = space.outer
+    radices = [len(space.candidates[i]) for i in outer]
+
+    tested = 0
+    for outer_index in range(start, end):
+        if cancel is not None and cancel.is_set():
+            return tested, None, False
+
+        # Subkeys phần outer (OR 7 bảng), dùng chung cho cả vòng inner
+        outer_key = bytearray(8)
+        partial = [0] * 16
+        rest = outer_index
+        for i, radix in zip(reversed(outer), reversed(radices)):
+            rest, digit = divmod(rest, radix)
+            b = space.candidates[i][digit]
+            outer_key[i] = b
+            partial = [p | t for p, t in zip(partial, tables[i][b])]
+
+        for b, inner_subkeys in zip(inner_values, inner_tables):
+            left = x_left
+            right = x_right
+            for p, q in zip(partial, inner_subkeys):
+                er = (e0[right >> 24] | e1[(right >> 16) & 0xFF] |
+                      e2[(right >> 8) & 0xFF] | e3[right & 0xFF]) ^ p ^ q
+                left, right = right, left ^ (
+                    sp0[er >> 42] ^ sp1[(er >> 36) & 63] ^ sp2[(er >> 30) & 63] ^
+                    sp3[(er >> 24) & 63] ^ sp4[(er >> 18) & 63] ^ sp5[(er >> 12) & 63] ^
+                    sp6[(er >> 6) & 63] ^ sp7[er & 63])
+
+            if (right << 32) | left == target:
+                outer_key[space.inner] = b
+                key = bytes(outer_key)
+                if _verify_key(key, _worker_state['plaintext'], _worker_state['ciphertext']):
+                    return tested + 1, key, True
+        tested += len(inner_values)
+
+    return tested, None, True
+
+
+class Checkpoint:
+    """
+    Các shard đã xong, lưu ra file JSON
+    watermark: mọi shard < watermark đã xong; done: các shard xong lẻ phía trên
+    """
+
+    def __init__(self, path, space, plaintext, ciphertext, shard_keys):
+        self.path = path
+        self.header = {
+            'space': space.describe(),
+            'shard_keys': shard_keys,
+            'plaintext': plaintext.hex(),
+            'ciphertext': ciphertext.hex(),
+        }
+        self.watermark = 0
+        self.done = set()
+        self.tested = 0
+        self._saved_at = time.monotonic()
+
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        for name, value in self.header.items():
+            if state.get(name) != value:
+                raise ValueError(f"Checkpoint {self.path} is for a different search ({name})")
+        self.watermark = state['watermark']
+        self.done = set(state['done'])
+        self.tested = state['tested']
+
+    def is_done(self, shard):
+        return shard < self.watermark or shard in self.done
+
+    def mark_done(self, shard, tested):
+        self.done.add(shard)
+        self.tested += tested
+        while self.watermark in self.done:
+            self.done.discard(self.watermark)
+            self.watermark += 1
+
+    def save(self, force=False):
+        """Ghi file (tạm rồi rename) nếu đã quá CHECKPOINT_INTERVAL hoặc force"""
+        if not self.path:
+            return
+        if not force and time.monotonic() - self._saved_at < CHECKPOINT_INTERVAL:
+            return
+        state = dict(self.header, watermark=self.watermark,
+                     done=sorted(self.done), tested=self.tested)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+        self._saved_at = time.monotonic()
+
+
+def search_key(space, plaintext, ciphertext, workers=None, checkpoint=None,
+               progress=None, shard_keys=SHARD_KEYS):
+    """
+    Tìm key DES mã hóa plaintext thành ciphertext trong key space
+    space: KeySpace
+    plaintext, ciphertext: bytes cùng độ dài, bội của 8 (block đầu để lọc,
+                           các block sau để xác nhận)
+    workers: số process (None = mọi CPU, 1 = chạy tuần tự trong process hiện tại)
+    checkpoint: đường dẫn file checkpoint (đã có thì chạy tiếp từ đó)
+    progress: callback(tested, total, keys_per_second) - tested tính cả các shard
+              đã xong ở lần chạy trước (checkpoint)
+    Returns: dict key (bytes hoặc None), tested (số key đã thử trong lần chạy này,
+             kể cả phần shard đang chạy khi tìm thấy key), elapsed, keys_per_second
+    Key tìm được là đại diện của lớp parity: mọi key chỉ khác bit thấp nhất
+    của các byte đều cho cùng kết quả
+    """
+    plaintext = bytes(plaintext)
+    ciphertext = bytes(ciphertext)
+    if len(plaintext) < 8 or len(plaintext) % 8 != 0:
+        raise ValueError("Known plaintext must be a non-empty multiple of 8 bytes")
+    if len(ciphertext) != len(plaintext):
+        raise ValueError("Plaintext and ciphertext must have the same length")
+
+    shards = space.shards(shard_keys)
+    state = Checkpoint(checkpoint, space, plaintext, ciphertext, shard_keys)
+    pending = [s for s in range(len(shards)) if not state.is_done(s)]
+    workers = max(1, int(workers)) if workers is not None else (os.cpu_count() or 1)
+
+    start_time = time.monotonic()
+    resumed = state.tested
+    tested = 0
+    found = None
+
+    def report():
+        if progress is not None:
+            elapsed = time.monotonic() - start_time
+            rate = tested / elapsed if elapsed > 0 else 0.0
+            progress(resumed + tested, space.size, rate)
+
+    if workers == 1:
+        _init_worker(space.candidates, plaintext, ciphertext, None)
+        for shard in pending:
+            count, key, complete = _search_shard(*shards[shard])
+            tested += count
+            if key is not None:
+                found = key
+                break
+            state.mark_done(shard, count)
+            state.save()
+            report()
+    else:
+        # Start method chọn theo executor, không đổi cấu hình toàn cục của multiprocessing
+        context = multiprocessing.get_context('spawn' if sys.platform.startswith('win') else None)
+        cancel_event = context.Event()
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, mp_context=context, initializer=_init_worker,
+                initargs=(space.candidates, plaintext, ciphertext, cancel_event)) as executor:
+            queue = iter(pending)
+            running = {}
+
+            def submit(n):
+                for shard in queue:
+                    running[executor.submit(_search_shard, *shards[shard])] = shard
+                    n -= 1
+                    if n == 0:
+                        break
+
+            submit(workers * SHARDS_PER_WORKER)
+            while running:
+                finished, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    shard = running.pop(future)
+                    if future.cancelled():
+                        continue  # queued shard dropped after the key was found
+                    count, key, complete = future.result()
+                    tested += count
+                    if key is not None and found is None:
+                        found = key
+                        cancel_event.set()
+                        for other in running:
+                            other.cancel()
+                    elif complete and found is None:
+                        state.mark_done(shard, count)
+                if found is None:
+                    submit(len(finished))
+                    state.save()
+                    report()
+
+    state.save(force=True)
+    report()
+    elapsed = time.monotonic() - start_time
+    return {
+        'key': found,
+        'tested': tested,
+        'elapsed': elapsed,
+        'keys_per_second': tested / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DES known-plaintext key search over a reduced key space.")
+    parser.add_argument("--plaintext", required=True, help="Plaintext đã biết (hex, bội của 8 bytes)")
+    parser.add_argument("--ciphertext", required=True, help="Ciphertext tương ứng (hex)")
+    parser.add_argument("--pattern", default="????????",
+                        help="Key biết một phần: 8 ký tự hoặc 16 hex, '?'/'??' = chưa biết")
+    parser.add_argument("--charset", default="printable", choices=sorted(CHARSETS),
+                        help="Giá trị thử cho các byte chưa biết")
+    parser.add_argument("--workers", type=int, default=None, help="Số process (mặc định: mọi CPU)")
+    parser.add_argument("--checkpoint", type=str, default=None, help="File checkpoint để chạy tiếp")
+    args = parser.parse_args()
+
+    try:
+        space = KeySpace.from_pattern(args.pattern, args.charset)
+        plaintext = bytes.fromhex(args.plaintext)
+        ciphertext = bytes.fromhex(args.ciphertext)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print("=" * 64)
+    print("DES KEY SEARCH")
+    print("=" * 64)
+    print(f"Key space: {space.size:,} keys (parity-equivalent keys skipped)")
+
+    def progress(tested, total, rate):
+        print(f"\r{tested:,}/{total:,} keys ({100 * tested / total:.2f}%) - "
+              f"{rate:,.0f} keys/s", end="", flush=True)
+
+    result = search_key(space, plaintext, ciphertext, workers=args.workers,
+                        checkpoint=args.checkpoint, progress=progress)
+
+    print("\n" + "=" * 64)
+    if result['key'] is not None:
+        print(f"KEY FOUND: {result['key'].hex()} ({result['key']!r})")
+    else:
+        print("KEY NOT FOUND")
+    print(f"Tested: {result['tested']:,} keys this run in {result['elapsed']:.2f}s "
+          f"({result['keys_per_second']:,.0f} keys/s)")
+    print("=" * 64)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Triple DES (TDEA) - NIST SP 800-67
+EDE: C = E_K3(D_K2(E_K1(P))),  P = D_K1(E_K2(D_K3(C)))
+- EDE3: key 24 bytes (K1, K2, K3 độc lập)
+- EDE2: key 16 bytes (K3 = K1)
+Block function gộp 3 lần DES: IP_INV của lần trước và IP của lần sau
+triệt tiêu nhau, nên chỉ cần IP 1 lần, 48 rounds, IP_INV 1 lần
+"""
+
+from functools import lru_cache
+
+from .des_core import DESKey, KEY_CACHE_SIZE
+from .des_int import DESInt, _E, _SP, _IP, _IP_INV, _MASK_32, _permute64
+from .des_modes import DESModes
+
+# Độ dài key bundle (bytes) -> keying option
+TDES_KEY_SIZES = {16: 'EDE2', 24: 'EDE3'}
+
+
+def validate_key_length(key):
+    """Kiểm tra độ dài key 3DES (16 hoặc 24 bytes)"""
+    if len(key) not in TDES_KEY_SIZES:
+        raise ValueError(f"3DES key must be 16 or 24 bytes, got {len(key)}")
+    return TDES_KEY_SIZES[len(key)]
+
+
+class TDESKey(DESKey):
+    """
+    Key bundle 3DES đã expand
+    subkeys: 3 nhóm 16 subkeys cho E_K1, D_K2, E_K3
+    dec_subkeys: 3 nhóm cho D_K3, E_K2, D_K1
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"TDESKey({TDES_KEY_SIZES[len(self.key)]})"
+
+
+def _crypt_block_ede(block, stages):
+    """3 lần DES trên 1 block 8 bytes: IP, 3 x 16 rounds, IP_INV"""
+    e0, e1, e2, e3 = _E
+    sp0, sp1, sp2, sp3, sp4, sp5, sp6, sp7 = _SP
+
+    x = _permute64(int.from_bytes(block, 'big'), _IP)
+    left = x >> 32
+    right = x & _MASK_32
+
+    for subkeys in stages:
+        for k in subkeys:
+            er = (e0[right >> 24] | e1[(right >> 16) & 0xFF] |
+                  e2[(right >> 8) & 0xFF] | e3[right & 0xFF]) ^ k
+            left, right = right, left ^ (
+                sp0[er >> 42] ^ sp1[(er >> 36) & 63] ^ sp2[(er >> 30) & 63] ^
+                sp3[(er >> 24) & 63] ^ sp4[(er >> 18) & 63] ^ sp5[(er >> 12) & 63] ^
+                sp6[(er >> 6) & 63] ^ sp7[er & 63])
+        # Swap cuối mỗi lần DES (IP_INV rồi IP của lần sau triệt tiêu nhau)
+        left, right = right, left
+
+    return _permute64((left << 32) | right, _IP_INV).to_bytes(8, 'big')
+
+
+class TDESInt:
+    """3DES Engine (integer DES) - cùng API với DESCore/DESInt"""
+
+    def expand_key(self, key):
+        """
+        Tạo (hoặc lấy từ LRU cache) TDESKey cho key bundle
+        key: 16/24 bytes, TDESKey (trả về nguyên) hoặc DESKey (dùng lại key gốc)
+        Returns: TDESKey
+        """
+        if isinstance(key, TDESKey):
+            return key
+        if isinstance(key, DESKey):
+            key = key.key
+        return _expand_tdes_key_cached(bytes(key))
+
+    def encrypt_block(self, plaintext_block, key):
+        """
+        Mã hóa 1 block 64-bit (E-D-E)
+        plaintext_block: 8 bytes
+        key: 16/24 bytes hoặc TDESKey
+        Returns: 8 bytes
+        """
+        if len(plaintext_block) != 8:
+            raise ValueError("Block must be 8 bytes")
+        return _crypt_block_ede(plaintext_block, self.expand_key(key).subkeys)
+
+    def decrypt_block(self, ciphertext_block, key):
+        """
+        Giải mã 1 block 64-bit (D-E-D)
+        ciphertext_block: 8 bytes
+        key: 16/24 bytes hoặc TDESKey
+        Returns: 8 bytes
+        """
+        if len(ciphertext_block) != 8:
+            raise ValueError("Block must be 8 bytes")
+        return _crypt_block_ede(ciphertext_block, self.expand_key(key).dec_subkeys)
+
+    def _crypt_blocks(self, data, stages):
+        if len(data) % 8 != 0:
+            raise ValueError("Data length must be multiple of 8 bytes")
+
+        result = bytearray()
+        for i in range(0, len(data), 8):
+            result += _crypt_block_ede(data[i:i + 8], stages)
+        return bytes(result)
+
+    def encrypt_blocks(self, data, key):
+        """
+        Mã hóa nhiều block 8 bytes độc lập
+        data: bytes, độ dài là bội của 8
+        Returns: bytes
+        """
+        return self._crypt_blocks(data, self.expand_key(key).subkeys)
+
+    def decrypt_blocks(self, data, key):
+        """
+        Giải mã nhiều block 8 bytes độc lập
+        data: bytes, độ dài là bội của 8
+        Returns: bytes
+        """
+        return self._crypt_blocks(data, self.expand_key(key).dec_subkeys)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _expand_tdes_key_cached(key):
+    """Tính 3 key schedule 1 lần cho mỗi key bundle, giữ trong LRU cache giới hạn"""
+    validate_key_length(key)
+    single = DESInt()
+    k1 = single.expand_key(key[0:8])
+    k2 = single.expand_key(key[8:16])
+    k3 = single.expand_key(key[16:24]) if len(key) == 24 else k1  # EDE2: K3 = K1
+
+    subkeys = (k1.subkeys, k2.dec_subkeys, k3.subkeys)
+    dec_subkeys = (k3.dec_subkeys, k2.subkeys, k1.dec_subkeys)
+    return TDESKey(key, subkeys, dec_subkeys)
+
+
+def clear_key_cache():
+    """Xóa toàn bộ key schedule 3DES đã cache"""
+    _expand_tdes_key_cached.cache_clear()
+
+
+class TDESModes(DESModes):
+    """
+    3DES với các modes của DESModes (ECB, CBC, CFB, OFB, CTR, streaming, file)
+    Keying option theo độ dài key: 16 bytes = EDE2, 24 bytes = EDE3
+    """
+
+    name = '3DES'
+    ENGINES = {'tdes': TDESInt}
+
+    def __init__(self, engine='tdes'):
+        super().__init__(engine)
+
+    def _validate_key(self, key):
+        """Validate key length (16 hoặc 24 bytes)"""
+        if isinstance(key, TDESKey):
+            return key
+        if isinstance(key, DESKey):
+            key = key.key  # context của engine DES 1 key
+        validate_key_length(key)
+        return key
+
+
+def test_tdes():
+    """Test 3DES với vector NIST SP 800-67"""
+    tdes = TDESModes()
+
+    key = bytes.fromhex('0123456789ABCDEF' '23456789ABCDEF01' '456789ABCDEF0123')
+    plaintext = b'The qufck brown fox jump'
+    expected = bytes.fromhex('A826FD8CE53B855F' 'CCE21C8112256FE6' '68D5C05DD9B6B900')
+
+    print("Testing 3DES...")
+    ciphertext = tdes.des_core.encrypt_blocks(plaintext, key)
+    print(f"Ciphertext: {ciphertext.hex()}")
+    print(f"Expected:   {expected.hex()}")
+    assert ciphertext == expected, "Encryption test failed!"
+    assert tdes.des_core.decrypt_blocks(ciphertext, key) == plaintext, "Decryption test failed!"
+
+    print("✓ All 3DES tests passed!")
+
+
+if __name__ == "__main__":
+    test_tdes()
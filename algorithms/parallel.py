@@ -0,0 +1,56 @@
+"""
+Parallel helpers for block cipher modes
+Split a buffer into whole-block chunks, run them on a process pool
+(same pattern as mono_cipher.crack_cipher_parallel) and stitch the
+results back together by offset
+"""
+
+import os
+import concurrent.futures
+
+# Inputs at least this large use a process pool by default
+PARALLEL_MIN_BYTES = 1 << 20
+
+# Tasks submitted per worker (keeps the pool evenly loaded)
+TASKS_PER_WORKER = 4
+
+
+def resolve_workers(workers, data_len):
+    """
+    Number of processes to use
+    workers: None = serial below PARALLEL_MIN_BYTES, all CPUs above
+             int  = exactly that many (1 = serial)
+    """
+    if workers is None:
+        if data_len < PARALLEL_MIN_BYTES:
+            return 1
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def chunk_size_for(data_len, block_size, workers):
+    """Chunk size (whole blocks) giving about TASKS_PER_WORKER tasks per worker"""
+    n_blocks = (data_len + block_size - 1) // block_size
+    n_tasks = max(1, min(n_blocks, workers * TASKS_PER_WORKER))
+    chunk_blocks = (n_blocks + n_tasks - 1) // n_tasks
+    return max(1, chunk_blocks) * block_size
+
+
+def run_chunk_tasks(worker, tasks, total_len, workers):
+    """
+    Run tasks on a process pool and stitch the results
+    worker: module-level function (picklable) returning bytes
+    tasks: list of (offset, args) - worker(*args) goes to result[offset:]
+    Returns: bytes of length total_len
+    """
+    result = bytearray(total_len)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(worker, *args): offset for offset, args in tasks}
+
+        for future in concurrent.futures.as_completed(futures):
+            offset = futures[future]
+            chunk = future.result()
+            result[offset:offset + len(chunk)] = chunk
+
+    return bytes(result)
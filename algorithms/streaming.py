@@ -0,0 +1,379 @@
+"""
+Streaming block cipher modes
+Incremental encryptor/decryptor objects (update(chunk) / finalize())
+that carry chaining state and pending partial blocks, plus file-to-file
+helpers that stream in fixed-size chunks with bounded memory
+ECB/CBC are PKCS#7 padded; CFB/OFB/CTR are stream modes (no padding,
+any length)
+Works with any block engine exposing encrypt_block / encrypt_blocks /
+decrypt_blocks (AESCore, AESTTable, AESNumpy, DESCore, ...)
+Whole blocks are processed straight from memoryview slices of the input
+(e.g. an mmapped file) - only partial blocks and the final padded block
+are copied
+"""
+
+import os
+import mmap
+from contextlib import contextmanager
+
+from .bufxor import xor_bytes
+
+# Default file chunk size (bytes) - a multiple of every block size
+CHUNK_SIZE = 1 << 20
+
+STREAM_MODES = ('ECB', 'CBC', 'CFB', 'OFB', 'CTR')
+
+# Modes that PKCS#7-pad the plaintext; the others are stream modes that
+# handle a partial final block directly
+PADDED_MODES = ('ECB', 'CBC')
+
+
+def pkcs7_pad_tail(tail, block_size):
+    """
+    PKCS#7 padding of the final partial block only
+    tail: the last len(data) % block_size bytes
+    Returns: one (or, if tail is empty, a full padding) block
+    """
+    pad_len = block_size - len(tail)
+    return bytes(tail) + bytes([pad_len] * pad_len)
+
+
+def pkcs7_unpadded_length(data, block_size):
+    """
+    Length of data without its PKCS#7 padding
+    Only the last block is inspected - the data itself is not copied
+    """
+    if not data:
+        return 0
+
+    pad_len = data[-1]
+
+    # Validate padding
+    if pad_len > block_size or pad_len == 0:
+        raise ValueError("Invalid padding")
+
+    # Check if all padding bytes are correct
+    if data[-pad_len:] != bytes([pad_len] * pad_len):
+        raise ValueError("Invalid padding")
+
+    return len(data) - pad_len
+
+
+def pkcs7_unpad(data, block_size):
+    """Remove PKCS#7 padding (same validation as the mode classes)"""
+    return data[:pkcs7_unpadded_length(data, block_size)]
+
+
+class _StreamCipher:
+    """Shared state for StreamEncryptor / StreamDecryptor"""
+
+    def __init__(self, engine, block_size, key, mode, iv=None):
+        mode = mode.upper()
+        if mode not in STREAM_MODES:
+            raise ValueError(f"Unsupported mode: {mode}")
+        if mode != 'ECB' and iv is None:
+            raise ValueError(f"IV is required for {mode} mode")
+
+        self.engine = engine
+        self.block_size = block_size
+        self.key = key
+        self.mode = mode
+        self.iv = iv
+
+        self._buffer = bytearray()
+        self._previous = iv                                   # CBC/CFB/OFB feedback block
+        self._counter = int.from_bytes(iv, 'big') if mode == 'CTR' else 0
+        self._counter_mask = (1 << (8 * block_size)) - 1
+        self._finalized = False
+
+    def _check_open(self):
+        if self._finalized:
+            raise ValueError("Stream already finalized")
+
+    def _split(self, data, keep_last_block=False):
+        """
+        Split pending bytes + new data into runs of whole blocks to process now
+        Whole blocks of data are returned as memoryview slices (no copy);
+        only a partial block (< block_size bytes) is copied into the buffer
+        keep_last_block: hold back the final whole block (may be the padded one)
+        Returns: list of runs
+        """
+        bs = self.block_size
+        view = memoryview(data).cast('B')
+        runs = []
+
+        if self._buffer:
+            fill = min(-len(self._buffer) % bs, len(view))
+            self._buffer += view[:fill]
+            view = view[fill:]
+            if len(self._buffer) % bs or (keep_last_block and not view):
+                return runs
+            runs.append(bytes(self._buffer))
+            self._buffer.clear()
+
+        n = len(view) - len(view) % bs
+        if keep_last_block and n == len(view):
+            n -= bs
+        if n > 0:
+            runs.append(view[:n])
+        self._buffer += view[max(n, 0):]
+        return runs
+
+    def _ctr(self, data):
+        """XOR data with the next len(data) bytes of CTR keystream"""
+        bs = self.block_size
+        n_blocks = (len(data) + bs - 1) // bs
+        counters = b''.join(((self._counter + i) & self._counter_mask).to_bytes(bs, 'big')
+                            for i in range(n_blocks))
+        self._counter += n_blocks
+        keystream = self.engine.encrypt_blocks(counters, self.key)[:len(data)]
+        return xor_bytes(data, keystream)
+
+    def _ofb(self, data):
+        """XOR data with the next OFB output blocks O_i = E(O_{i-1})"""
+        bs = self.block_size
+        encrypt_block = self.engine.encrypt_block
+        key = self.key
+        output = self._previous
+        keystream = bytearray()
+        for _ in range((len(data) + bs - 1) // bs):
+            output = encrypt_block(output, key)
+            keystream += output
+        self._previous = output
+        return xor_bytes(data, keystream[:len(data)])
+
+    def _stream_tail(self, tail):
+        """Final partial block of a stream mode (no padding)"""
+        if not tail:
+            return b''
+        if self.mode == 'CTR':
+            return self._ctr(tail)
+        if self.mode == 'OFB':
+            return self._ofb(tail)
+        # CFB: truncated keystream E(C_{n-1}); nothing chains after it
+        keystream = self.engine.encrypt_block(self._previous, self.key)
+        return xor_bytes(tail, keystream[:len(tail)])
+
+
+class StreamEncryptor(_StreamCipher):
+    """
+    Incremental encryption
+    enc = StreamEncryptor(engine, 16, key, 'CBC', iv)
+    out = enc.update(chunk1) + enc.update(chunk2) + enc.finalize()
+    """
+
+    def output_capacity(self, input_len):
+        """Upper bound on the output length for input_len bytes of plaintext"""
+        if self.mode not in PADDED_MODES:
+            return input_len
+        return input_len - input_len % self.block_size + self.block_size
+
+    def _encrypt(self, blocks):
+        if not blocks:
+            return b''
+        if self.mode == 'ECB':
+            return self.engine.encrypt_blocks(blocks, self.key)
+        if self.mode == 'CTR':
+            return self._ctr(blocks)
+        if self.mode == 'OFB':
+            return self._ofb(blocks)
+
+        bs = self.block_size
+        encrypt_block = self.engine.encrypt_block
+        key = self.key
+        previous = self._previous
+        result = bytearray()
+        if self.mode == 'CBC':
+            # Serial chain C_i = E(P_i XOR C_{i-1})
+            for i in range(0, len(blocks), bs):
+                xored = (int.from_bytes(blocks[i:i + bs], 'big') ^
+                         int.from_bytes(previous, 'big')).to_bytes(bs, 'big')
+                previous = encrypt_block(xored, key)
+                result += previous
+        else:
+            # CFB: serial chain C_i = P_i XOR E(C_{i-1})
+            for i in range(0, len(blocks), bs):
+                previous = (int.from_bytes(blocks[i:i + bs], 'big') ^
+                            int.from_bytes(encrypt_block(previous, key), 'big')).to_bytes(bs, 'big')
+                result += previous
+        self._previous = previous
+        return bytes(result)
+
+    def update(self, data):
+        """Encrypt as many whole blocks as are available, buffer the rest"""
+        self._check_open()
+        return b''.join(self._encrypt(run) for run in self._split(data))
+
+    def finalize(self):
+        """Encrypt the pending tail (PKCS#7 padded for ECB/CBC)"""
+        self._check_open()
+        self._finalized = True
+        tail = bytes(self._buffer)
+        self._buffer.clear()
+
+        if self.mode not in PADDED_MODES:
+            return self._stream_tail(tail)
+        return self._encrypt(pkcs7_pad_tail(tail, self.block_size))
+
+
+class StreamDecryptor(_StreamCipher):
+    """
+    Incremental decryption
+    The last whole block is held back until finalize() (it carries the padding)
+    """
+
+    def output_capacity(self, input_len):
+        """Upper bound on the output length for input_len bytes of ciphertext"""
+        return input_len
+
+    def _decrypt(self, blocks):
+        if not blocks:
+            return b''
+        if self.mode == 'ECB':
+            return self.engine.decrypt_blocks(blocks, self.key)
+        if self.mode == 'CTR':
+            return self._ctr(blocks)
+        if self.mode == 'OFB':
+            return self._ofb(blocks)
+
+        bs = self.block_size
+        chained = bytes(self._previous) + blocks[:-bs]
+        self._previous = bytes(blocks[-bs:])
+        if self.mode == 'CBC':
+            # P_i = D(C_i) XOR C_{i-1} - whole run in one batch
+            return xor_bytes(self.engine.decrypt_blocks(blocks, self.key), chained)
+        # CFB: P_i = C_i XOR E(C_{i-1}) - whole run in one batch
+        return xor_bytes(blocks, self.engine.encrypt_blocks(chained, self.key))
+
+    def update(self, data):
+        """Decrypt whole blocks (except the possibly padded last one)"""
+        self._check_open()
+        runs = self._split(data, keep_last_block=self.mode in PADDED_MODES)
+        return b''.join(self._decrypt(run) for run in runs)
+
+    def finalize(self):
+        """Decrypt the held-back block and remove padding"""
+        self._check_open()
+        self._finalized = True
+        tail = bytes(self._buffer)
+        self._buffer.clear()
+
+        if self.mode not in PADDED_MODES:
+            return self._stream_tail(tail)
+        if len(tail) % self.block_size != 0:
+            raise ValueError("Ciphertext length must be multiple of block size")
+        return pkcs7_unpad(self._decrypt(tail), self.block_size)
+
+
+def stream_copy(processor, fin, fout, chunk_size=CHUNK_SIZE):
+    """
+    Run a StreamEncryptor/StreamDecryptor from one file object to another
+    fin: anything with read(n); fout: anything with write(data)
+    Returns: number of bytes written
+    """
+    written = 0
+    while True:
+        chunk = fin.read(chunk_size)
+        if not chunk:
+            break
+        out = processor.update(chunk)
+        if out:
+            fout.write(out)
+            written += len(out)
+
+    out = processor.finalize()
+    if out:
+        fout.write(out)
+        written += len(out)
+
+    return written
+
+
+def stream_file(processor, input_path, output_path, chunk_size=CHUNK_SIZE):
+    """
+    Run a StreamEncryptor/StreamDecryptor over a file, chunk by chunk
+    Memory use is bounded by chunk_size regardless of file size
+    Returns: number of bytes written
+    """
+    with open(input_path, 'rb') as fin, open(output_path, 'wb') as fout:
+        return stream_copy(processor, fin, fout, chunk_size)
+
+
+@contextmanager
+def mapped_input(input_path):
+    """
+    Memory-map a file read-only and yield a memoryview over it
+    Slices of the view are zero-copy; do not keep them past the with block
+    Empty files (which cannot be mapped) yield an empty view
+    """
+    with open(input_path, 'rb') as fin:
+        if os.fstat(fin.fileno()).st_size == 0:
+            yield memoryview(b'')
+            return
+        with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+def stream_buffer(processor, buffer, fout, chunk_size=CHUNK_SIZE):
+    """
+    Like stream_copy, but the input is an in-memory buffer (bytes, memoryview, mmap)
+    fed to the processor as zero-copy memoryview slices
+    Returns: number of bytes written
+    """
+    view = memoryview(buffer)
+    written = 0
+    for start in range(0, len(view), chunk_size):
+        out = processor.update(view[start:start + chunk_size])
+        if out:
+            fout.write(out)
+            written += len(out)
+
+    out = processor.finalize()
+    if out:
+        fout.write(out)
+        written += len(out)
+
+    return written
+
+
+def map_file(processor, input_path, output_path, chunk_size=CHUNK_SIZE):
+    """
+    Memory-mapped variant of stream_file
+    The input is mmapped and processed through memoryview slices; output is
+    written into a pre-sized, mmapped output file, truncated to the real
+    length at the end. Peak memory stays around one chunk
+    If processing fails (e.g. bad padding) the output file is removed rather
+    than left full-size with partly processed bytes
+    Returns: number of bytes written
+    """
+    size = os.path.getsize(input_path)
+    capacity = processor.output_capacity(size)
+    if size == 0 or capacity == 0:
+        return stream_file(processor, input_path, output_path, chunk_size)
+
+    written = 0
+    try:
+        with open(output_path, 'w+b') as fout:
+            fout.truncate(capacity)
+            with mapped_input(input_path) as view, mmap.mmap(fout.fileno(), capacity) as out_map:
+                for start in range(0, size, chunk_size):
+                    out = processor.update(view[start:start + chunk_size])
+                    out_map[written:written + len(out)] = out
+                    written += len(out)
+
+                out = processor.finalize()
+                out_map[written:written + len(out)] = out
+                written += len(out)
+            fout.truncate(written)
+    except BaseException:
+        try:
+            os.remove(output_path)
+        except OSError:
+            pass
+        raise
+
+    return written
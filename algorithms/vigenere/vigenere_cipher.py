@@ -1,5 +1,46 @@
 from collections import Counter, defaultdict
 import math
+import re
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+
+# Splits text into alternating runs: letters, non-letters, letters, ...
+_NON_LETTER_RUNS = re.compile(r'([^A-Za-z]+)')
+
+# _SHIFT_TABLES[s] moves every ASCII letter s places forward (case kept)
+_SHIFT_TABLES = [
+    bytes.maketrans((ALPHABET + ALPHABET.upper()).encode(),
+                    (ALPHABET[s:] + ALPHABET[:s] + (ALPHABET[s:] + ALPHABET[:s]).upper()).encode())
+    for s in range(26)
+]
+
+# ASCII letter -> 0-25 (either case); every other byte is deleted (see letter_codes)
+_LETTER_CODES = bytes.maketrans((ALPHABET + ALPHABET.upper()).encode(), bytes(range(26)) * 2)
+_NON_LETTERS = bytes(b for b in range(256) if not (65 <= b <= 90 or 97 <= b <= 122))
+
+# Adaptive cracking: prefix lengths (letters) tried before the whole text
+SAMPLE_SIZES = (1024, 4096, 16384, 65536)
+
+# Smallest per-column margin (best vs runner-up shift) accepted by crack_adaptive
+MIN_CONFIDENCE = 0.2
+
+
+def letter_prefix_end(text, letters):
+    """
+    End index of the shortest prefix of text holding `letters` ASCII letters
+    Returns: index, or None if text has fewer letters
+    """
+    match = re.match(r'(?:[^A-Za-z]*[A-Za-z]){%d}' % letters, text)
+    return match.end() if match else None
+
+
+def _key_period(key):
+    """Shortest key that repeats to key ('abcabc' -> 'abc')"""
+    for p in range(1, len(key)):
+        if len(key) % p == 0 and key[:p] * (len(key) // p) == key:
+            return key[:p]
+    return key
+
 
 class VigenereCipher:
     def __init__(self):
@@ -15,7 +56,18 @@ class VigenereCipher:
         self.IC_ENGLISH = 0.0686
 
     def clean_text(self, text):
-        return ''.join(c.lower() for c in text if c.isalpha())
+        """
+        ASCII letters of text, lowercased - the same letters encrypt/decrypt shift
+        (non-ASCII letters pass through the cipher untouched, so they are skipped here too)
+        """
+        return text.encode('ascii', 'ignore').translate(None, _NON_LETTERS).decode('ascii').lower()
+
+    def letter_codes(self, text):
+        """
+        ASCII letters of text as bytes of 0-25 (a/A = 0), built in one pass
+        Column i of key length k is then just codes[i::k]
+        """
+        return text.encode('ascii', 'ignore').translate(_LETTER_CODES, _NON_LETTERS)
 
     # ================= KASISKI EXAMINATION =================
     def kasiski_examination(self, ciphertext, min_len=3, max_len=5, max_keylen=30):
@@ -50,14 +102,11 @@ class VigenereCipher:
         return sum(v * (v - 1) for v in freq.values()) / (n * (n - 1))
 
     def ic_analysis(self, ciphertext, max_keylen=20):
-        text = self.clean_text(ciphertext)
+        codes = self.letter_codes(ciphertext)
         results = []
 
         for k in range(1, max_keylen + 1):
-            groups = ['' for _ in range(k)]
-            for i, c in enumerate(text):
-                groups[i % k] += c
-            avg_ic = sum(self.calculate_ic(g) for g in groups) / k
+            avg_ic = sum(self.calculate_ic(codes[i::k]) for i in range(k)) / k
             results.append((k, avg_ic))
 
         results.sort(key=lambda x: abs(x[1] - self.IC_ENGLISH))
@@ -77,48 +126,67 @@ class VigenereCipher:
         return chi2
 
     # ================= FIND KEY =================
-    def crack_caesar(self, text):
-        best_shift = 0
-        best_score = float('inf')
-
+    def shift_scores(self, text):
+        """
+        Chi-squared of text decrypted with each of the 26 shifts, from one letter count
+        text: lowercase letters, or letter codes 0-25 (bytes from letter_codes)
+        Returns: list indexed by shift
+        """
+        n = len(text)
+        if n == 0:
+            return [float('inf')] * 26
+        freq = Counter(text)
+        letters = range(26) if isinstance(text, (bytes, bytearray)) else ALPHABET
+        counts = [freq.get(c, 0) for c in letters]
+        scores = []
         for shift in range(26):
-            decrypted = ''.join(chr((ord(c) - ord('a') - shift) % 26 + ord('a')) for c in text)
-            score = self.chi_squared(decrypted)
-            if score < best_score:
-                best_score = score
-                best_shift = shift
+            chi2 = 0
+            for i, c in enumerate(ALPHABET):
+                observed = counts[(i + shift) % 26] / n
+                expected = self.english_freq[c]
+                chi2 += ((observed - expected) ** 2) / expected
+            scores.append(chi2)
+        return scores
 
-        return best_shift
+    def crack_caesar(self, text):
+        scores = self.shift_scores(text)
+        return scores.index(min(scores))
 
     def find_key(self, ciphertext, keylen):
-        text = self.clean_text(ciphertext)
-        groups = ['' for _ in range(keylen)]
-
-        for i, c in enumerate(text):
-            groups[i % keylen] += c
+        codes = self.letter_codes(ciphertext)
+        return ''.join(ALPHABET[self.crack_caesar(codes[i::keylen])] for i in range(keylen))
+
+    # ================= ENCRYPT / DECRYPT =================
+    def _shift_letters(self, text, shifts):
+        """
+        Shift the i-th ASCII letter of text by shifts[i % len(shifts)]
+        Non-letters are copied and do not advance the key
+        """
+        if not shifts:
+            raise ValueError("Key must not be empty")
+
+        parts = _NON_LETTER_RUNS.split(text)
+        letters = bytearray(''.join(parts[0::2]).encode('ascii'))
+
+        # One translate per key position over its strided column
+        n = len(shifts)
+        for i, shift in enumerate(shifts):
+            letters[i::n] = letters[i::n].translate(_SHIFT_TABLES[shift % 26])
+        letters = letters.decode('ascii')
+
+        # Put the letter runs back between the non-letter runs
+        pos = 0
+        for i in range(0, len(parts), 2):
+            end = pos + len(parts[i])
+            parts[i] = letters[pos:end]
+            pos = end
+        return ''.join(parts)
+
+    def encrypt(self, plaintext, key):
+        return self._shift_letters(plaintext, [ord(k) - ord('a') for k in key.lower()])
 
-        key = ''
-        for g in groups:
-            shift = self.crack_caesar(g)
-            key += chr(shift + ord('a'))
-
-        return key
-
-    # ================= DECRYPT =================
     def decrypt(self, ciphertext, key):
-        result = []
-        ki = 0
-        key = key.lower()
-
-        for c in ciphertext:
-            if c.isalpha():
-                base = ord('A') if c.isupper() else ord('a')
-                shift = ord(key[ki % len(key)]) - ord('a')
-                result.append(chr((ord(c) - base - shift) % 26 + base))
-                ki += 1
-            else:
-                result.append(c)
-        return ''.join(result)
+        return self._shift_letters(ciphertext, [ord('a') - ord(k) for k in key.lower()])
 
     # ================= MAIN CRACK =================
     def crack(self, ciphertext):
@@ -145,6 +213,41 @@ class VigenereCipher:
 
         return best_key, best_plain
 
+    def key_confidence(self, ciphertext, key):
+        """
+        Smallest relative margin (runner-up - best) / runner-up of the chi-squared
+        shift scores over the key's columns: 0 = ambiguous, close to 1 = certain
+        """
+        codes = self.letter_codes(ciphertext)
+        n = len(key)
+        margins = []
+        for i in range(n):
+            scores = sorted(self.shift_scores(codes[i::n]))
+            if scores[1] == 0 or scores[1] == float('inf'):
+                return 0.0
+            margins.append((scores[1] - scores[0]) / scores[1])
+        return min(margins) if margins else 0.0
+
+    def crack_adaptive(self, ciphertext, sample_sizes=SAMPLE_SIZES, min_confidence=MIN_CONFIDENCE):
+        """
+        Crack on growing prefixes of the ciphertext (sample_sizes letters, then the
+        whole text), stopping once two consecutive prefixes give the same key and its
+        key_confidence reaches min_confidence
+        Returns: (key, plaintext, confidence, analysed letters)
+        """
+        previous = None
+        for letters in list(sample_sizes) + [None]:
+            end = letter_prefix_end(ciphertext, letters) if letters is not None else None
+            sample = ciphertext if end is None else ciphertext[:end]
+            key = _key_period(self.crack(sample)[0])
+            confidence = self.key_confidence(sample, key) if key else 0.0
+            if end is None or (key == previous and confidence >= min_confidence):
+                break
+            previous = key
+
+        analysed = len(self.letter_codes(sample))
+        return key, self.decrypt(ciphertext, key) if key else ciphertext, confidence, analysed
+
 
 # ================= FILE HELPER =================
 
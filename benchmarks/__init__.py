@@ -0,0 +1,4 @@
+"""
+Benchmarks Package
+Throughput / latency measurements for the block cipher engines and modes
+"""
@@ -0,0 +1,313 @@
+"""
+Block cipher benchmark suite
+Measures, for every cipher engine:
+- key schedule cost (cache misses - a fresh key each call)
+- single-block encryption latency
+- throughput (MB/s) for every mode x message size through the mode API
+Prints engines side by side and writes JSON results that can be compared
+between commits with --compare
+
+Usage:
+    python -m benchmarks.bench_ciphers                      # default sizes
+    python -m benchmarks.bench_ciphers --sizes 16,1K,1M,100M --json after.json
+    python -m benchmarks.bench_ciphers --cipher AES --compare before.json
+"""
+
+import os
+import json
+import time
+import platform
+import argparse
+import subprocess
+
+from algorithms.aes import AESModes, HAS_NUMPY
+from algorithms.des import DESModes, TDESModes
+
+# cipher -> (factory(engine), engines, key size, modes)
+CIPHERS = {
+    'AES': (lambda engine: AESModes(engine=engine), ['core', 'ttable', 'numpy'], 16,
+            ['ECB', 'CBC', 'CFB', 'OFB', 'CTR', 'GCM']),
+    'DES': (lambda engine: DESModes(engine=engine), ['core', 'int', 'bitslice'], 8,
+            ['ECB', 'CBC', 'CFB', 'OFB', 'CTR']),
+    '3DES': (lambda engine: TDESModes(engine=engine), ['tdes'], 24,
+             ['ECB', 'CBC', 'CFB', 'OFB', 'CTR']),
+}
+
+DEFAULT_SIZES = '16,1K,64K,1M'
+
+# Distinct keys cycled by the key schedule benchmark (more than KEY_CACHE_SIZE,
+# so every expand_key call is a cache miss)
+KEY_POOL_SIZE = 256
+
+_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+
+def parse_size(text):
+    """'16' / '64K' / '100M' -> bytes"""
+    text = text.strip().upper().rstrip('B')
+    unit = text[-1] if text and text[-1] in _UNITS else ''
+    number = text[:-1] if unit else text
+    try:
+        return int(float(number) * _UNITS[unit])
+    except ValueError:
+        raise ValueError(f"Invalid size: {text}") from None
+
+
+def format_size(size):
+    for unit in ('G', 'M', 'K'):
+        if size >= _UNITS[unit] and size % _UNITS[unit] == 0:
+            return f"{size // _UNITS[unit]}{unit}"
+    return str(size)
+
+
+def measure(func, min_time=0.2, repeat=3):
+    """
+    Seconds per call of func(): calls are grouped so each timing lasts at
+    least min_time, and the best of `repeat` groups is kept
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, timeout=10, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def bench_engine(cipher, engine, sizes, modes, decrypt=False, min_time=0.2, repeat=3,
+                 max_seconds=10.0, report=print):
+    """
+    Benchmark one engine
+    Sizes whose estimated run time (from the previous size's throughput)
+    exceeds max_seconds are skipped and recorded with seconds = None
+    Returns: list of result dicts
+    """
+    factory, _, key_size, _ = CIPHERS[cipher]
+    modes_obj = factory(engine)
+    base = {'cipher': cipher, 'engine': modes_obj.engine}
+    results = []
+
+    def add(entry):
+        entry = dict(base, **entry)
+        results.append(entry)
+        report(entry)
+
+    # Key schedule: a different key each call
+    keys = [os.urandom(key_size) for _ in range(KEY_POOL_SIZE)]
+    position = [0]
+
+    def expand():
+        position[0] = (position[0] + 1) % KEY_POOL_SIZE
+        modes_obj.expand_key(keys[position[0]])
+
+    seconds = measure(expand, min_time, repeat)
+    add({'metric': 'key_schedule', 'seconds': seconds, 'ops_per_s': 1 / seconds})
+
+    # Single block, key already expanded
+    key = modes_obj.expand_key(os.urandom(key_size))
+    block = os.urandom(modes_obj.block_size)
+    seconds = measure(lambda: modes_obj.core.encrypt_block(block, key), min_time, repeat)
+    add({'metric': 'block_latency', 'seconds': seconds, 'ops_per_s': 1 / seconds})
+
+    directions = ['encrypt', 'decrypt'] if decrypt else ['encrypt']
+    for mode in modes:
+        rate = None
+        for size in sizes:
+            data = os.urandom(size)
+            ciphertext, iv = modes_obj.encrypt(data, key, mode=mode)
+            for direction in directions:
+                entry = {'metric': 'throughput', 'mode': mode, 'direction': direction,
+                         'size': size}
+                if rate is not None and size / rate > max_seconds:
+                    add(dict(entry, seconds=None, mb_per_s=None, skipped='too slow'))
+                    continue
+                if direction == 'encrypt':
+                    func = lambda: modes_obj.encrypt(data, key, mode=mode, iv=iv)
+                else:
+                    func = lambda: modes_obj.decrypt(ciphertext, key, mode=mode, iv=iv)
+                seconds = measure(func, min_time, repeat if size < (1 << 20) else 1)
+                if direction == 'encrypt':
+                    rate = size / seconds if seconds else None
+                add(dict(entry, seconds=seconds, mb_per_s=size / seconds / (1 << 20)))
+    return results
+
+
+def result_id(entry):
+    """Key identifying the same measurement across runs"""
+    return (entry['cipher'], entry['engine'], entry['metric'], entry.get('mode'),
+            entry.get('direction'), entry.get('size'))
+
+
+def format_entry(entry):
+    name = f"{entry['cipher']:<5}{entry['engine']:<9}"
+    if entry['metric'] != 'throughput':
+        return f"{name}{entry['metric']:<28}{entry['seconds'] * 1e6:12.2f} us"
+    label = f"{entry['mode']} {entry['direction']} {format_size(entry['size'])}"
+    if entry['seconds'] is None:
+        return f"{name}{label:<28}{'skipped':>15}"
+    return f"{name}{label:<28}{entry['mb_per_s']:12.3f} MB/s"
+
+
+def print_side_by_side(results):
+    """One row per measurement, one column per engine of the same cipher"""
+    by_cipher = {}
+    for entry in results:
+        by_cipher.setdefault(entry['cipher'], []).append(entry)
+
+    for cipher, entries in by_cipher.items():
+        engines = list(dict.fromkeys(e['engine'] for e in entries))
+        rows = {}
+        for e in entries:
+            row = (e['metric'], e.get('mode'), e.get('direction'), e.get('size'))
+            rows.setdefault(row, {})[e['engine']] = e
+
+        print("\n" + "=" * 70)
+        print(f"{cipher}: " + " vs ".join(engines))
+        print("=" * 70)
+        print(f"{'':<30}" + "".join(f"{engine:>14}" for engine in engines))
+        for (metric, mode, direction, size), cells in rows.items():
+            if metric == 'throughput':
+                label = f"{mode} {direction} {format_size(size)} (MB/s)"
+            else:
+                label = f"{metric} (us)"
+            values = []
+            for engine in engines:
+                e = cells.get(engine)
+                if e is None or e['seconds'] is None:
+                    values.append(f"{'-':>14}")
+                elif metric == 'throughput':
+                    values.append(f"{e['mb_per_s']:14.3f}")
+                else:
+                    values.append(f"{e['seconds'] * 1e6:14.2f}")
+            print(f"{label:<30}" + "".join(values))
+
+
+def compare(results, baseline):
+    """
+    Print speed ratios against a previous JSON run (> 1 = faster now)
+    Returns: list of (entry, ratio)
+    """
+    old = {result_id(e): e for e in baseline['results'] if e.get('seconds')}
+    ratios = []
+    print("\n" + "=" * 70)
+    print(f"COMPARED WITH {baseline['meta'].get('commit') or 'baseline'}")
+    print("=" * 70)
+    for entry in results:
+        before = old.get(result_id(entry))
+        if before is None or not entry.get('seconds'):
+            continue
+        ratio = before['seconds'] / entry['seconds']
+        ratios.append((entry, ratio))
+        flag = '  <-- slower' if ratio < 0.9 else ''
+        print(f"{format_entry(entry)}   x{ratio:6.2f}{flag}")
+    return ratios
+
+
+def run(ciphers=None, engines=None, modes=None, sizes=DEFAULT_SIZES, decrypt=False,
+        min_time=0.2, repeat=3, max_seconds=10.0, report=print):
+    """
+    Run the suite
+    ciphers / engines / modes: lists of names to keep (None = all)
+    sizes: list of byte counts or a '16,1K,1M' string
+    Returns: {'meta': {...}, 'results': [...]}
+    """
+    if isinstance(sizes, str):
+        sizes = [parse_size(s) for s in sizes.split(',')]
+
+    ciphers = ciphers or list(CIPHERS)
+    for cipher in ciphers:
+        if cipher not in CIPHERS:
+            raise ValueError(f"Unknown cipher: {cipher} (choose from {', '.join(CIPHERS)})")
+    known = list(dict.fromkeys(e for cipher in ciphers for e in CIPHERS[cipher][1]))
+    for engine in engines or []:
+        if engine not in known:
+            raise ValueError(f"Unknown engine for {', '.join(ciphers)}: {engine} "
+                             f"(choose from {', '.join(known)})")
+
+    results = []
+    for cipher in ciphers:
+        _, cipher_engines, _, cipher_modes = CIPHERS[cipher]
+        for engine in cipher_engines:
+            if engines and engine not in engines:
+                continue
+            if engine == 'numpy' and not HAS_NUMPY:
+                continue  # would silently measure the ttable fallback
+            selected = [m for m in cipher_modes if not modes or m in modes]
+            results += bench_engine(cipher, engine, sizes, selected, decrypt,
+                                    min_time, repeat, max_seconds, report)
+
+    meta = {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': HAS_NUMPY,
+        'sizes': sizes,
+    }
+    return {'meta': meta, 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AES / DES / 3DES engines and modes.")
+    parser.add_argument("--cipher", action="append", choices=list(CIPHERS),
+                        help="Cipher to benchmark (repeatable, default: all)")
+    parser.add_argument("--engine", action="append", help="Engine to benchmark (repeatable, default: all)")
+    parser.add_argument("--mode", action="append", help="Mode to benchmark (repeatable, default: all)")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"Comma-separated message sizes, e.g. 16,1K,1M,100M (default: {DEFAULT_SIZES})")
+    parser.add_argument("--decrypt", action="store_true", help="Also measure decryption")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per timing")
+    parser.add_argument("--repeat", type=int, default=3, help="Timings per measurement (best is kept)")
+    parser.add_argument("--max-seconds", type=float, default=10.0,
+                        help="Skip a size whose estimated run time exceeds this")
+    parser.add_argument("--json", type=str, default=None, help="Write results to this JSON file")
+    parser.add_argument("--compare", type=str, default=None, help="Previous JSON results to compare with")
+    args = parser.parse_args()
+
+    try:
+        sizes = [parse_size(s) for s in args.sizes.split(',')]
+    except ValueError as e:
+        parser.error(str(e))
+
+    modes = [m.upper() for m in args.mode] if args.mode else None
+    report = lambda entry: print(format_entry(entry), flush=True)
+    try:
+        data = run(args.cipher, args.engine, modes, sizes, args.decrypt,
+                   args.min_time, args.repeat, args.max_seconds, report)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print_side_by_side(data['results'])
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(data['results'], json.load(f))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        print(f"\n✓ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
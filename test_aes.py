@@ -5,6 +5,7 @@ Bao gồm: Basic tests, File I/O tests, Long text tests, Padding tests
 
 import sys
 import os
+import tempfile
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from algorithms.aes import AESModes
@@ -228,6 +229,699 @@ def test_standard_vectors():
     print("✓ Decryption verification passed!")
 
 
+def test_key_context():
+    """Test cached AESKey context (key schedule computed once)"""
+    print("\n" + "="*70)
+    print("TEST 6: Cached Key Schedule (AESKey)")
+    print("="*70)
+    
+    from algorithms.aes import AESCore, AESKey
+    core = AESCore()
+    aes = AESModes()
+    
+    key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    plaintext = bytes.fromhex('3243f6a8885a308d313198a2e0370734')
+    expected = bytes.fromhex('3925841d02dc09fbdc118597196a0b32')
+    
+    aes_key = aes.expand_key(key)
+    assert isinstance(aes_key, AESKey), "expand_key must return an AESKey"
+    assert core.expand_key(key) is aes_key, "Key schedule should come from the LRU cache"
+    print("✓ Same key reuses the cached schedule")
+    
+    assert core.encrypt_block(plaintext, aes_key) == expected, "AESKey encryption failed!"
+    assert core.decrypt_block(expected, aes_key) == plaintext, "AESKey decryption failed!"
+    print("✓ Block encryption with AESKey matches FIPS 197")
+    
+    message = b'Keyed context shared by every mode function'
+    ciphertext, iv = aes.encrypt(message, aes_key, mode='CBC')
+    assert aes.decrypt(ciphertext, key, mode='CBC', iv=iv) == message, "CBC with AESKey failed!"
+    assert aes.encrypt(message, aes_key, mode='ECB')[0] == aes.encrypt(message, key, mode='ECB')[0]
+    print("✓ Modes accept AESKey and raw key interchangeably")
+
+
+def test_ttable_engine():
+    """Test T-table engine against FIPS 197 vectors and the byte-matrix core"""
+    print("\n" + "="*70)
+    print("TEST 7: T-table Engine")
+    print("="*70)
+    
+    from algorithms.aes import AESCore, AESTTable
+    core = AESCore()
+    fast = AESTTable()
+    
+    vectors = [
+        ('2b7e151628aed2a6abf7158809cf4f3c', '3243f6a8885a308d313198a2e0370734',
+         '3925841d02dc09fbdc118597196a0b32'),
+        ('000102030405060708090a0b0c0d0e0f', '00112233445566778899aabbccddeeff',
+         '69c4e0d86a7b0430d8cdb78070b4c55a'),
+    ]
+    for key_hex, plain_hex, cipher_hex in vectors:
+        key = bytes.fromhex(key_hex)
+        plaintext = bytes.fromhex(plain_hex)
+        expected = bytes.fromhex(cipher_hex)
+        assert fast.encrypt_block(plaintext, key) == expected, "T-table encryption failed!"
+        assert fast.decrypt_block(expected, key) == plaintext, "T-table decryption failed!"
+    print("✓ FIPS 197 vectors passed!")
+    
+    for _ in range(50):
+        key = os.urandom(16)
+        block = os.urandom(16)
+        assert fast.encrypt_block(block, key) == core.encrypt_block(block, key)
+        assert fast.decrypt_block(block, key) == core.decrypt_block(block, key)
+    print("✓ T-table engine matches AESCore on random blocks")
+    
+    message = b'Engine selection must not change the ciphertext!'
+    key = b'YellowSubmarine!'
+    iv = os.urandom(16)
+    reference = AESModes(engine='core').encrypt(message, key, mode='CBC', iv=iv)[0]
+    ttable = AESModes(engine='ttable')
+    assert ttable.encrypt(message, key, mode='CBC', iv=iv)[0] == reference
+    assert ttable.decrypt(reference, key, mode='CBC', iv=iv) == message
+    print("✓ AESModes(engine='ttable') is a drop-in replacement")
+
+
+def test_numpy_engine():
+    """Test batched NumPy engine (skipped when NumPy is not installed)"""
+    print("\n" + "="*70)
+    print("TEST 8: NumPy Batched Engine")
+    print("="*70)
+    
+    from algorithms.aes import AESTTable, HAS_NUMPY
+    
+    aes = AESModes(engine='numpy')
+    if not HAS_NUMPY:
+        assert aes.engine == 'ttable', "Missing NumPy must fall back to pure Python"
+        print("NumPy not installed - fallback to T-table engine verified")
+        return
+    
+    from algorithms.aes import AESNumpy
+    engine = AESNumpy()
+    
+    key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    plaintext = bytes.fromhex('3243f6a8885a308d313198a2e0370734')
+    expected = bytes.fromhex('3925841d02dc09fbdc118597196a0b32')
+    assert engine.encrypt_blocks(plaintext, key) == expected, "NumPy encryption failed!"
+    assert engine.decrypt_blocks(expected, key) == plaintext, "NumPy decryption failed!"
+    print("✓ FIPS 197 vector passed!")
+    
+    key = os.urandom(16)
+    data = os.urandom(16 * 500)
+    reference = AESTTable()
+    assert engine.encrypt_blocks(data, key) == reference.encrypt_blocks(data, key)
+    assert engine.decrypt_blocks(data, key) == reference.decrypt_blocks(data, key)
+    print("✓ 500 blocks in one call match the T-table engine")
+    
+    message = os.urandom(1000)
+    ciphertext, _ = aes.encrypt(message, key, mode='ECB')
+    assert ciphertext == AESModes().encrypt(message, key, mode='ECB')[0]
+    assert aes.decrypt(ciphertext, key, mode='ECB') == message
+    print("✓ AESModes(engine='numpy') ECB round trip passed!")
+
+
+def test_aes_192_256():
+    """Test AES-192/256 with FIPS 197 Appendix C vectors on every engine"""
+    print("\n" + "="*70)
+    print("TEST 9: AES-192 / AES-256")
+    print("="*70)
+    
+    from algorithms.aes import AESCore, AESTTable, HAS_NUMPY
+    engines = [AESCore(), AESTTable()]
+    if HAS_NUMPY:
+        from algorithms.aes import AESNumpy
+        engines.append(AESNumpy())
+    
+    plaintext = bytes.fromhex('00112233445566778899aabbccddeeff')
+    vectors = [
+        ('000102030405060708090a0b0c0d0e0f', '69c4e0d86a7b0430d8cdb78070b4c55a'),
+        ('000102030405060708090a0b0c0d0e0f1011121314151617',
+         'dda97ca4864cdfe06eaf70a0ec0d7191'),
+        ('000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f',
+         '8ea2b7ca516745bfeafc49904b496089'),
+    ]
+    
+    for key_hex, cipher_hex in vectors:
+        key = bytes.fromhex(key_hex)
+        expected = bytes.fromhex(cipher_hex)
+        for engine in engines:
+            name = type(engine).__name__
+            assert engine.encrypt_blocks(plaintext, key) == expected, f"AES-{len(key)*8} {name} failed!"
+            assert engine.decrypt_blocks(expected, key) == plaintext, f"AES-{len(key)*8} {name} decrypt failed!"
+        print(f"✓ AES-{len(key) * 8} vector passed on all engines")
+    
+    message = b'Compliance requires AES-256 for archived files.'
+    key = os.urandom(32)
+    for engine in ['core', 'ttable', 'numpy']:
+        aes = AESModes(engine=engine)
+        ciphertext, iv = aes.encrypt(message, key, mode='CBC')
+        assert aes.decrypt(ciphertext, key, mode='CBC', iv=iv) == message
+    print("✓ AES-256 CBC round trip passed on all engines")
+    
+    try:
+        AESModes().encrypt(message, os.urandom(20), mode='ECB')
+        assert False, "20-byte key must be rejected"
+    except ValueError:
+        print("✓ Invalid key length rejected")
+
+
+def test_ctr_mode():
+    """Test AES-CTR with NIST SP 800-38A F.5.1 and the parallel keystream path"""
+    print("\n" + "="*70)
+    print("TEST 10: CTR Mode")
+    print("="*70)
+    
+    key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    counter = bytes.fromhex('f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff')
+    plaintext = bytes.fromhex(
+        '6bc1bee22e409f96e93d7e117393172a'
+        'ae2d8a571e03ac9c9eb76fac45af8e51'
+        '30c81c46a35ce411e5fbc1191a0a52ef'
+        'f69f2445df4f9b17ad2b417be66c3710')
+    expected = bytes.fromhex(
+        '874d6191b620e3261bef6864990db6ce'
+        '9806f66b7970fdff8617187bb9fffdff'
+        '5ae4df3edbd5d35e5b4f09020db03eab'
+        '1e031dda2fbe03d1792170a0f3009cee')
+    
+    for engine in ['core', 'ttable', 'numpy']:
+        aes = AESModes(engine=engine)
+        ciphertext, _ = aes.encrypt(plaintext, key, mode='CTR', iv=counter)
+        assert ciphertext == expected, f"CTR vector failed on {engine}!"
+        assert aes.decrypt(ciphertext, key, mode='CTR', iv=counter) == plaintext
+    print("✓ NIST SP 800-38A CTR vector passed on all engines")
+    
+    aes = AESModes(engine='numpy')
+    
+    # No padding: ciphertext length == plaintext length
+    message = b'Odd-length message, no padding!'
+    ciphertext, iv = aes.encrypt(message, key, mode='CTR')
+    assert len(ciphertext) == len(message)
+    assert aes.decrypt(ciphertext, key, mode='CTR', iv=iv) == message
+    print("✓ Partial final block handled without padding")
+    
+    # Random access: decrypt block 2 onwards without the first blocks
+    assert aes.crypt_ctr(expected[32:], key, counter, block_offset=2) == plaintext[32:]
+    print("✓ Random access with block_offset passed")
+    
+    # Parallel keystream across worker processes
+    data = os.urandom(16 * 300 + 7)
+    serial, iv = aes.encrypt_ctr(data, key, workers=1)
+    parallel, _ = aes.encrypt_ctr(data, key, iv=iv, workers=2)
+    assert serial == parallel, "Parallel CTR differs from serial CTR!"
+    assert aes.decrypt_ctr(parallel, key, iv, workers=2) == data
+    print("✓ Process-pool CTR matches serial CTR")
+
+
+def test_parallel_cbc_decrypt():
+    """Test batched and process-pool CBC decryption"""
+    print("\n" + "="*70)
+    print("TEST 11: Parallel CBC Decryption")
+    print("="*70)
+    
+    key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    iv = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+    
+    # NIST SP 800-38A F.2.1 (first two blocks)
+    plaintext = bytes.fromhex('6bc1bee22e409f96e93d7e117393172a'
+                              'ae2d8a571e03ac9c9eb76fac45af8e51')
+    expected = bytes.fromhex('7649abac8119b246cee98e9b12e9197d'
+                             '5086cb9b507219ee95db113a917678b2')
+    aes = AESModes(engine='ttable')
+    ciphertext, _ = aes.encrypt_cbc(plaintext, key, iv)
+    assert ciphertext[:32] == expected, "CBC vector failed!"
+    print("✓ NIST SP 800-38A CBC vector passed")
+    
+    data = os.urandom(16 * 200 + 5)
+    for engine in ['ttable', 'numpy']:
+        aes = AESModes(engine=engine)
+        ciphertext, iv = aes.encrypt(data, key, mode='CBC')
+        assert aes.decrypt_cbc(ciphertext, key, iv, workers=1) == data
+        assert aes.decrypt_cbc(ciphertext, key, iv, workers=3) == data
+    print("✓ Serial and process-pool CBC decryption agree")
+
+
+def test_streaming():
+    """Test incremental encryptor/decryptor and file streaming"""
+    print("\n" + "="*70)
+    print("TEST 12: Streaming API")
+    print("="*70)
+    
+    key = os.urandom(16)
+    data = os.urandom(16 * 50 + 9)
+    chunk_sizes = [1, 7, 16, 33, 1000]
+    
+    for engine in ['core', 'ttable', 'numpy']:
+        aes = AESModes(engine=engine)
+        for mode in ['ECB', 'CBC', 'CTR']:
+            expected, iv = aes.encrypt(data, key, mode=mode, iv=os.urandom(16))
+            for size in chunk_sizes:
+                enc = aes.encryptor(key, mode, iv)
+                ciphertext = b''.join(enc.update(data[i:i + size])
+                                      for i in range(0, len(data), size)) + enc.finalize()
+                assert ciphertext == expected, f"{engine} {mode} streaming encrypt failed!"
+                
+                dec = aes.decryptor(key, mode, iv)
+                plaintext = b''.join(dec.update(ciphertext[i:i + size])
+                                     for i in range(0, len(ciphertext), size)) + dec.finalize()
+                assert plaintext == data, f"{engine} {mode} streaming decrypt failed!"
+        print(f"✓ {engine}: ECB/CBC/CTR streaming matches one-shot")
+    
+    # File to file, chunk size not a multiple of the block size
+    aes = AESModes(engine='ttable')
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'aes_stream_plain.bin')
+        encrypted = os.path.join(tmp, 'aes_stream_enc.bin')
+        decrypted = os.path.join(tmp, 'aes_stream_dec.bin')
+        with open(source, 'wb') as f:
+            f.write(data)
+        
+        for mode in ['ECB', 'CBC', 'CTR']:
+            iv = aes.encrypt_file(source, encrypted, key, mode=mode, chunk_size=100)
+            aes.decrypt_file(encrypted, decrypted, key, mode=mode, iv=iv, chunk_size=100)
+            with open(decrypted, 'rb') as f:
+                assert f.read() == data, f"{mode} file streaming failed!"
+        print("✓ File-to-file streaming round trips")
+    
+    enc = aes.encryptor(key)
+    enc.finalize()
+    try:
+        enc.update(b'more')
+        assert False, "update() after finalize() should fail"
+    except ValueError:
+        print("✓ Finalized stream rejects further data")
+
+
+def test_container_format():
+    """Test binary container: streaming writer/reader and format auto-detection"""
+    print("\n" + "="*70)
+    print("TEST 13: Binary Container Format")
+    print("="*70)
+    
+    aes = AESModes(engine='ttable')
+    key = os.urandom(32)
+    data = os.urandom(16 * 40 + 3)
+    with tempfile.TemporaryDirectory() as tmp:
+        container_file = os.path.join(tmp, 'aes_container.enc')
+        legacy_file = os.path.join(tmp, 'aes_legacy.txt')
+        
+        enc = aes.encryptor(key, 'CBC')
+        with EncryptedFileWriter(container_file, 'AES', 'CBC', enc.iv, chunk_index=True) as writer:
+            for i in range(0, len(data), 100):
+                writer.write(enc.update(data[i:i + 100]))
+            writer.write(enc.finalize())
+        
+        with EncryptedFileReader(container_file) as reader:
+            assert (reader.algorithm, reader.mode, reader.iv) == ('AES', 'CBC', enc.iv)
+            assert reader.length == len(data) + 13
+            assert reader.index[0] == 0 and len(reader.index) == 8
+            dec = aes.decryptor(key, reader.mode, reader.iv)
+            plaintext = b''.join(dec.update(chunk) for chunk in reader.iter_chunks(64)) + dec.finalize()
+        assert plaintext == data, "Container round trip failed!"
+        print("✓ Streaming container round trip (with chunk index)")
+        
+        # Raw ciphertext: header + IV + length is all the overhead (hex was 2x+)
+        overhead = os.path.getsize(container_file) - reader.length
+        print(f"  Container overhead: {overhead} bytes")
+        
+        # Auto-detection: binary and legacy hex give the same result
+        ciphertext, iv = aes.encrypt(data, key, mode='CTR')
+        save_encrypted_container(container_file, ciphertext, 'AES', 'CTR', iv)
+        save_encrypted_output(legacy_file, ciphertext.hex(), iv.hex(), 'CTR')
+        for path, fmt in [(container_file, 'binary'), (legacy_file, 'hex')]:
+            parsed = read_encrypted_file(path)
+            assert parsed['format'] == fmt
+            assert parsed['mode'] == 'CTR' and parsed['iv'] == iv
+            assert parsed['ciphertext'] == ciphertext
+        print("✓ Binary and legacy hex formats auto-detected")
+        
+        try:
+            EncryptedFileReader(legacy_file)
+            assert False, "Legacy file must not parse as container"
+        except ValueError:
+            pass
+        print("✓ Non-container file rejected by reader")
+        
+        # Container bị cắt mất phần cuối ciphertext (CTR: không có tag/index để phát hiện)
+        with open(container_file, 'r+b') as f:
+            f.truncate(os.path.getsize(container_file) - 40)
+        try:
+            read_encrypted_file(container_file)
+            assert False, "Truncated container body accepted"
+        except ValueError as e:
+            assert 'Truncated container body' in str(e)
+        print("✓ Truncated ciphertext rejected")
+        
+        # GCM: tag lưu sau ciphertext và được kiểm tra khi giải mã
+        ciphertext, tag, iv = aes.encrypt_gcm(data, key, aad=b'hdr')
+        with EncryptedFileWriter(container_file, 'AES', 'GCM', iv, chunk_index=True) as writer:
+            writer.write(ciphertext[:100])
+            writer.write(ciphertext[100:])
+            writer.tag = tag
+        parsed = read_encrypted_file(container_file)
+        assert (parsed['mode'], parsed['iv'], parsed['tag']) == ('GCM', iv, tag)
+        assert parsed['ciphertext'] == ciphertext
+        assert aes.decrypt_gcm(parsed['ciphertext'], key, parsed['iv'], parsed['tag'], aad=b'hdr') == data
+        with EncryptedFileReader(container_file) as reader:
+            assert reader.index == [0, 100]
+        print("✓ GCM container stores and returns the tag")
+        
+        # Chunk index bị cắt: thiếu một phần offset, rồi thiếu cả count
+        for cut in (3, 15):
+            with open(container_file, 'r+b') as f:
+                f.truncate(os.path.getsize(container_file) - cut)
+            try:
+                read_encrypted_file(container_file)
+                assert False, "Truncated chunk index accepted"
+            except ValueError as e:
+                assert 'Truncated chunk index' in str(e)
+        print("✓ Truncated chunk index rejected")
+        
+        for bad in [lambda: save_encrypted_container(container_file, ciphertext, 'AES', 'GCM', iv),
+                    lambda: save_encrypted_container(container_file, ciphertext, 'AES', 'CTR', iv, tag=tag),
+                    lambda: save_encrypted_container(container_file, ciphertext, 'DES', 'GCM', iv, tag=tag)]:
+            try:
+                bad()
+                assert False, "Invalid tag / mode combination accepted"
+            except ValueError:
+                pass
+        save_encrypted_container(container_file, ciphertext, 'AES', 'GCM', iv, tag=tag)
+        with open(container_file, 'r+b') as f:
+            f.truncate(os.path.getsize(container_file) - 3)
+        try:
+            read_encrypted_file(container_file)
+            assert False, "Truncated tag accepted"
+        except ValueError:
+            pass
+        print("✓ Missing, misplaced and truncated tags rejected")
+        
+        # Lỗi trong khối with: lỗi gốc được giữ nguyên, không để lại container dở dang
+        try:
+            with EncryptedFileWriter(container_file, 'AES', 'GCM', iv) as writer:
+                writer.write(ciphertext[:100])
+                raise RuntimeError("encryption failed")
+        except RuntimeError as e:
+            assert str(e) == "encryption failed"
+        assert not os.path.exists(container_file), "Partial container left behind"
+        print("✓ Failed write leaves no container and keeps the original error")
+        
+        # 3DES có mã thuật toán riêng
+        save_encrypted_container(container_file, b'\x00' * 16, '3DES', 'CBC', bytes(8))
+        parsed = read_encrypted_file(container_file)
+        assert (parsed['algorithm'], parsed['mode'], parsed['tag']) == ('3DES', 'CBC', None)
+        print("✓ 3DES container round trip")
+
+
+def test_mapped_files():
+    """Test memory-mapped file path (zero-copy input, mmapped output)"""
+    print("\n" + "="*70)
+    print("TEST 14: Memory-Mapped File Path")
+    print("="*70)
+    
+    import tracemalloc
+    from algorithms.streaming import mapped_input, stream_buffer
+    
+    aes = AESModes(engine='numpy')
+    key = os.urandom(16)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'aes_mmap_plain.bin')
+        encrypted = os.path.join(tmp, 'aes_mmap_enc.bin')
+        decrypted = os.path.join(tmp, 'aes_mmap_dec.bin')
+        
+        for size in [0, 1, 16, 100, 4096]:
+            data = os.urandom(size)
+            with open(source, 'wb') as f:
+                f.write(data)
+            for mode in ['ECB', 'CBC', 'CTR']:
+                iv = aes.encrypt_file(source, encrypted, key, mode=mode, chunk_size=48)
+                with open(encrypted, 'rb') as f:
+                    expected, _ = aes.encrypt(data, key, mode=mode, iv=iv)
+                    assert f.read() == expected, f"{mode} mmap encrypt failed ({size} bytes)!"
+                aes.decrypt_file(encrypted, decrypted, key, mode=mode, iv=iv, chunk_size=48)
+                with open(decrypted, 'rb') as f:
+                    assert f.read() == data, f"{mode} mmap decrypt failed ({size} bytes)!"
+        print("✓ mmap encrypt/decrypt matches one-shot for all sizes")
+        
+        # Bad padding: no full-size output file of partly decrypted bytes is left behind
+        with open(source, 'wb') as f:
+            f.write(aes.encryptor(key, 'ECB').update(bytes(64)))
+        try:
+            aes.decrypt_file(source, decrypted, key, mode='ECB', chunk_size=48)
+            assert False, "Invalid padding accepted"
+        except ValueError:
+            pass
+        assert not os.path.exists(decrypted), "Failed decrypt left its output file"
+        print("✓ Failed decrypt removes the output file")
+        
+        # Peak Python memory stays around one chunk, not a multiple of the file size
+        size = 1 << 20
+        with open(source, 'wb') as f:
+            f.write(os.urandom(size))
+        tracemalloc.start()
+        aes.encrypt_file(source, encrypted, key, mode='ECB', chunk_size=1 << 15)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  File: {size} bytes, peak allocations: {peak} bytes")
+        assert peak < size // 2, "mmap path should not copy the whole file"
+        
+        # mmapped input into any writer (UI path)
+        enc = aes.encryptor(key, 'CTR')
+        with mapped_input(source) as view, open(encrypted, 'wb') as fout:
+            stream_buffer(enc, view, fout)
+        aes.decrypt_file(encrypted, decrypted, key, mode='CTR', iv=enc.iv)
+        with open(source, 'rb') as f1, open(decrypted, 'rb') as f2:
+            assert f1.read() == f2.read(), "mapped_input round trip failed!"
+        print("✓ Bounded memory on large files")
+
+
+def test_gcm_mode():
+    """Test AES-GCM against NIST SP 800-38D (GCM spec) vectors"""
+    print("\n" + "="*70)
+    print("TEST 15: GCM Mode")
+    print("="*70)
+    
+    from algorithms.aes.aes_gcm import GHash, gf_mult
+    
+    k3 = 'feffe9928665731c6d6a8f9467308308'
+    p3 = ('d9313225f88406e5a55909c5aff5269a86a7a9531534f7da2e4c303d8a318a72'
+          '1c3c0c95956809532fcf0e2449a6b525b16aedf5aa0de657ba637b391aafd255')
+    c3 = ('42831ec2217774244b7221b784d0d49ce3aa212f2c02a4e035c17e2329aca12e'
+          '21d514b25466931c7d8f6a5aac84aa051ba30b396a0aac973d58e091473f5985')
+    aad = 'feedfacedeadbeeffeedfacedeadbeefabaddad2'
+    
+    # (key, iv, plaintext, aad, ciphertext, tag)
+    vectors = [
+        ('00' * 16, '00' * 12, '', '', '', '58e2fccefa7e3061367f1d57a4e7455a'),
+        ('00' * 16, '00' * 12, '00' * 16, '',
+         '0388dace60b6a392f328c2b971b2fe78', 'ab6e47d42cec13bdf53a67b21257bddf'),
+        (k3, 'cafebabefacedbaddecaf888', p3, '', c3, '4d5c2af327cd64a62cf35abd2ba6fab4'),
+        (k3, 'cafebabefacedbaddecaf888', p3[:120], aad, c3[:120],
+         '5bc94fbc3221a5db94fae95ae7121a47'),
+        ('00' * 32, '00' * 12, '', '', '', '530f8afbc74536b9a963b4f1c4cb738b'),
+        ('00' * 32, '00' * 12, '00' * 16, '',
+         'cea7403d4d606b6e074ec5d3baf39d18', 'd0d1c8a799996bf0265b98b5d48ab919'),
+    ]
+    
+    for engine in ['core', 'ttable', 'numpy']:
+        aes = AESModes(engine=engine)
+        for i, (key, iv, pt, a, ct, tag) in enumerate(vectors, 1):
+            key, iv, pt, a = map(bytes.fromhex, (key, iv, pt, a))
+            ciphertext, got_tag, _ = aes.encrypt_gcm(pt, key, iv, aad=a)
+            assert ciphertext.hex() == ct, f"GCM vector {i} ciphertext failed ({engine})!"
+            assert got_tag.hex() == tag, f"GCM vector {i} tag failed ({engine})!"
+            assert aes.decrypt_gcm(ciphertext, key, iv, got_tag, aad=a) == pt
+    
+    # Test cases 5 and 6: IVs other than 96 bits go through GHASH to form J0
+    iv6 = ('9313225df88406e555909c5aff5269aa6a7a9538534f7da1e4c303d2a318a728'
+           'c3c0c95156809539fcf0e2429a6b525416aedbf5a0de6a57a637b39b')
+    for iv, tag in [('cafebabefacedbad', '3612d2e79e3b0785561be14aaca2fccb'),
+                    (iv6, '619cc5aefffe0bfa462af43c1699d050')]:
+        _, got_tag, _ = aes.encrypt_gcm(bytes.fromhex(p3[:120]), bytes.fromhex(k3),
+                                        bytes.fromhex(iv), aad=bytes.fromhex(aad))
+        assert got_tag.hex() == tag, "GCM non-96-bit IV vector failed!"
+    print("✓ NIST GCM vectors passed (AES-128 and AES-256, all engines)")
+    
+    # Table-driven GHASH agrees with the bitwise reference multiplication
+    h = os.urandom(16)
+    data = os.urandom(16 * 9)
+    ghash = GHash(h)
+    ghash.update(data)
+    y = 0
+    for i in range(0, len(data), 16):
+        y = gf_mult(y ^ int.from_bytes(data[i:i + 16], 'big'), int.from_bytes(h, 'big'))
+    assert ghash.digest() == y.to_bytes(16, 'big'), "GHASH tables disagree with reference!"
+    print("✓ GHASH tables match bitwise GF(2^128) multiplication")
+    
+    # Streaming, tampering and the general interface
+    aes = AESModes(engine='ttable')
+    key = os.urandom(16)
+    data = os.urandom(1000)
+    ciphertext, tag, iv = aes.encrypt_gcm(data, key, aad=b'header')
+    enc = aes.gcm_encryptor(key, iv, aad=b'header')
+    streamed = b''.join(enc.update(data[i:i + 37]) for i in range(0, len(data), 37)) + enc.finalize()
+    assert (streamed, enc.tag) == (ciphertext, tag), "Streaming GCM differs from one-shot!"
+    
+    tampered = bytes([ciphertext[0] ^ 1]) + ciphertext[1:]
+    for bad in [(tampered, b'header'), (ciphertext, b'Header')]:
+        try:
+            aes.decrypt_gcm(bad[0], key, iv, tag, aad=bad[1])
+            assert False, "Tampered GCM message was accepted!"
+        except ValueError:
+            pass
+    
+    sealed, iv = aes.encrypt(data, key, mode='GCM')
+    assert len(sealed) == len(data) + 16
+    assert aes.decrypt(sealed, key, mode='GCM', iv=iv) == data
+    print("✓ Streaming, tamper detection and general interface passed")
+
+
+def test_feedback_modes():
+    """Test ECB/CBC/CFB/OFB/CTR against NIST SP 800-38A vectors"""
+    print("\n" + "="*70)
+    print("TEST 16: CFB/OFB Modes (SP 800-38A)")
+    print("="*70)
+    
+    key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    iv = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+    plaintext = bytes.fromhex('6bc1bee22e409f96e93d7e117393172a'
+                              'ae2d8a571e03ac9c9eb76fac45af8e51'
+                              '30c81c46a35ce411e5fbc1191a0a52ef'
+                              'f69f2445df4f9b17ad2b417be66c3710')
+    # (mode, iv, ciphertext of the 4 blocks - padded modes add one more block)
+    vectors = [
+        ('ECB', None, '3ad77bb40d7a3660a89ecaf32466ef97' 'f5d3d58503b9699de785895a96fdbaaf'
+                      '43b1cd7f598ece23881b00e3ed030688' '7b0c785e27e8ad3f8223207104725dd4'),
+        ('CBC', iv, '7649abac8119b246cee98e9b12e9197d' '5086cb9b507219ee95db113a917678b2'
+                    '73bed6b8e3c1743b7116e69e22229516' '3ff1caa1681fac09120eca307586e1a7'),
+        ('CFB', iv, '3b3fd92eb72dad20333449f8e83cfb4a' 'c8a64537a0b3a93fcde3cdad9f1ce58b'
+                    '26751f67a3cbb140b1808cf187a4f4df' 'c04b05357c5d1c0eeac4c66f9ff7f2e6'),
+        ('OFB', iv, '3b3fd92eb72dad20333449f8e83cfb4a' '7789508d16918f03f53c52dac54ed825'
+                    '9740051e9c5fecf64344f7a82260edcc' '304c6528f659c77866a510d9c1d6ae5e'),
+        ('CTR', bytes.fromhex('f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff'),
+                    '874d6191b620e3261bef6864990db6ce' '9806f66b7970fdff8617187bb9fffdff'
+                    '5ae4df3edbd5d35e5b4f09020db03eab' '1e031dda2fbe03d1792170a0f3009cee'),
+    ]
+    
+    for engine in ['core', 'ttable', 'numpy']:
+        aes = AESModes(engine=engine)
+        for mode, mode_iv, expected in vectors:
+            expected = bytes.fromhex(expected)
+            ciphertext, _ = aes.encrypt(plaintext, key, mode=mode, iv=mode_iv)
+            assert ciphertext[:64] == expected, f"{engine} {mode}: vector mismatch!"
+            assert aes.decrypt(ciphertext, key, mode=mode, iv=mode_iv) == plaintext
+    print("✓ SP 800-38A vectors match for every engine")
+    
+    # Stream modes: no padding, partial final block, chunked streaming
+    aes = AESModes(engine='ttable')
+    data = os.urandom(1000)
+    for mode in ['CFB', 'OFB', 'CTR']:
+        ciphertext, mode_iv = aes.encrypt(data[:37], key, mode=mode)
+        assert len(ciphertext) == 37, f"{mode} must not pad"
+        assert aes.decrypt(ciphertext, key, mode=mode, iv=mode_iv) == data[:37]
+        
+        ciphertext, mode_iv = aes.encrypt(data, key, mode=mode)
+        enc = aes.encryptor(key, mode, mode_iv)
+        dec = aes.decryptor(key, mode, mode_iv)
+        out = enc.update(data[:5]) + enc.update(data[5:517]) + enc.update(data[517:])
+        assert out + enc.finalize() == ciphertext
+        assert dec.update(ciphertext[:100]) + dec.update(ciphertext[100:]) + dec.finalize() == data
+    print("✓ CFB/OFB/CTR partial blocks and streaming passed")
+    
+    # Parallel CFB decryption matches serial
+    data = os.urandom(16 * 50 + 9)
+    ciphertext, mode_iv = aes.encrypt_cfb(data, key)
+    assert aes.decrypt_cfb(ciphertext, key, mode_iv, workers=2) == data
+    print("✓ Parallel CFB decryption passed")
+
+
+def test_buffer_xor():
+    """Test the shared whole-buffer XOR primitive"""
+    print("\n" + "="*70)
+    print("TEST 17: Buffer XOR")
+    print("="*70)
+    
+    from algorithms.bufxor import xor_bytes, _xor_int, HAS_NUMPY, XOR_NUMPY_MIN_BYTES
+    
+    for n in [0, 1, 16, XOR_NUMPY_MIN_BYTES - 1, XOR_NUMPY_MIN_BYTES, 100003]:
+        a = os.urandom(n)
+        b = os.urandom(n)
+        expected = bytes(x ^ y for x, y in zip(a, b))
+        assert xor_bytes(a, b) == expected, f"XOR mismatch at {n} bytes"
+        assert _xor_int(a, b) == expected, f"Big-int XOR mismatch at {n} bytes"
+        assert xor_bytes(memoryview(a), bytearray(b)) == expected
+    print(f"✓ XOR matches byte-wise reference (NumPy path: {'on' if HAS_NUMPY else 'off'})")
+    
+    try:
+        xor_bytes(b'abc', b'ab')
+        assert False, "Length mismatch must be rejected"
+    except ValueError:
+        print("✓ Length mismatch rejected")
+
+
+def test_padding_views():
+    """Test PKCS#7 handling without padded copies"""
+    print("\n" + "="*70)
+    print("TEST 18: Padding Without Copies")
+    print("="*70)
+    
+    aes = AESModes(engine='ttable')
+    key = b'TestPadding_Key!'
+    iv = bytes(16)
+    
+    for n in [0, 1, 15, 16, 17, 47, 48]:
+        plaintext = os.urandom(n)
+        for mode in ['ECB', 'CBC']:
+            ciphertext, _ = aes.encrypt(memoryview(plaintext), key, mode=mode, iv=iv)
+            assert ciphertext == aes.encrypt(plaintext, key, mode=mode, iv=iv)[0]
+            assert len(ciphertext) == n - n % 16 + 16, f"{mode}: wrong padded length"
+            assert aes.decrypt(memoryview(ciphertext), key, mode=mode, iv=iv) == plaintext
+    print("✓ Padding correct for every tail length (bytes and memoryview input)")
+    
+    # Padding errors are still detected from the last block alone
+    unpadded = {
+        'ECB': aes.aes_core.encrypt_blocks(b'A' * 32, key),
+        'CBC': aes.encrypt_cbc(b'A' * 31, key, iv)[0][:16],  # first block only: no padding
+    }
+    for mode, bad in unpadded.items():
+        try:
+            aes.decrypt(bad, key, mode=mode, iv=iv)
+            assert False, f"{mode}: invalid padding accepted"
+        except ValueError as e:
+            assert str(e) == "Invalid padding"
+    try:
+        aes.decrypt(bytes(20), key, mode='ECB')
+        assert False, "Partial block accepted"
+    except ValueError:
+        pass
+    print("✓ Invalid padding rejected")
+
+
+def test_batch_api():
+    """Test batch encryption of many records under one key"""
+    print("\n" + "="*70)
+    print("TEST 19: Batch API")
+    print("="*70)
+    
+    key = os.urandom(16)
+    messages = [os.urandom(n) for n in [0, 1, 15, 16, 17, 40, 64, 3] * 4]
+    
+    for engine in ['ttable', 'numpy']:
+        aes = AESModes(engine=engine)
+        for mode in ['ECB', 'CBC', 'CFB', 'OFB', 'CTR']:
+            ciphertexts, ivs = aes.encrypt_batch(iter(messages), key, mode=mode)
+            assert (ivs is None) == (mode == 'ECB')
+            for i, (message, ciphertext) in enumerate(zip(messages, ciphertexts)):
+                iv = None if ivs is None else ivs[i]
+                assert ciphertext == aes.encrypt(message, key, mode=mode, iv=iv)[0], \
+                    f"{engine} {mode}: record {i} differs from encrypt()"
+            assert aes.decrypt_batch(ciphertexts, key, mode=mode, ivs=ivs) == messages
+        print(f"✓ {engine}: batch matches per-record encrypt for every mode")
+    
+    try:
+        aes.encrypt_batch(messages, key, mode='CBC', ivs=[bytes(16)])
+        assert False, "IV count mismatch accepted"
+    except ValueError:
+        print("✓ IV count mismatch rejected")
+
+
 def run_all_tests():
     """Run all AES tests"""
     print("\n" + "="*70)
@@ -240,6 +934,20 @@ def run_all_tests():
         test_aes_long_text()
         test_padding()
         test_standard_vectors()
+        test_key_context()
+        test_ttable_engine()
+        test_numpy_engine()
+        test_aes_192_256()
+        test_ctr_mode()
+        test_parallel_cbc_decrypt()
+        test_streaming()
+        test_container_format()
+        test_mapped_files()
+        test_gcm_mode()
+        test_feedback_modes()
+        test_buffer_xor()
+        test_padding_views()
+        test_batch_api()
         
         print("\n" + "="*70)
         print(" "*20 + "✓ ALL TESTS PASSED!")
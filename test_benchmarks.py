@@ -0,0 +1,115 @@
+import sys
+import os
+import json
+import tempfile
+import subprocess
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.bench_ciphers import parse_size, format_size, run, compare, result_id
+
+
+def test_parse_size():
+    """Test message size parsing"""
+    print("="*70)
+    print("TEST 1: Size Parsing")
+    print("="*70)
+    
+    cases = {'16': 16, '1K': 1024, '64k': 64 * 1024, '1M': 1 << 20, '100MB': 100 << 20,
+             ' 2G ': 2 << 30, '1.5K': 1536}
+    for text, expected in cases.items():
+        assert parse_size(text) == expected, f"{text!r} -> {parse_size(text)}"
+        assert parse_size(format_size(expected)) == expected
+    print("✓ Sizes with and without units parsed")
+    
+    for text in ['', 'K', 'abc', '1X', '1..5M']:
+        try:
+            parse_size(text)
+            assert False, f"Invalid size {text!r} accepted"
+        except ValueError:
+            pass
+    print("✓ Invalid sizes rejected")
+
+
+def test_json_compare():
+    """Test JSON results and comparison with a saved run"""
+    print("\n" + "="*70)
+    print("TEST 2: JSON Output + Compare")
+    print("="*70)
+    
+    data = run(ciphers=['DES'], engines=['int'], modes=['ECB', 'CTR'], sizes='16,1K',
+               min_time=0.001, repeat=1, report=lambda entry: None)
+    assert data['meta']['sizes'] == [16, 1024]
+    metrics = [(e['metric'], e.get('mode'), e.get('size')) for e in data['results']]
+    assert metrics == [('key_schedule', None, None), ('block_latency', None, None),
+                       ('throughput', 'ECB', 16), ('throughput', 'ECB', 1024),
+                       ('throughput', 'CTR', 16), ('throughput', 'CTR', 1024)]
+    print("✓ One result per metric / mode / size")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'before.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        with open(path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    assert baseline['results'] == data['results']
+    print("✓ Results survive the JSON round trip")
+    
+    # Baseline twice as slow -> every ratio is 2; entries missing from it are skipped
+    for entry in baseline['results']:
+        entry['seconds'] *= 2
+    baseline['results'] = [e for e in baseline['results'] if e.get('size') != 1024]
+    ratios = compare(data['results'], baseline)
+    assert [result_id(e) for e, _ in ratios] == [result_id(e) for e in baseline['results']]
+    assert all(abs(ratio - 2) < 1e-9 for _, ratio in ratios)
+    print("✓ Compare matches measurements across runs and computes speed ratios")
+    
+    # Command line: --json writes a run, --compare reads it back
+    root = os.path.dirname(os.path.abspath(__file__))
+    command = [sys.executable, '-m', 'benchmarks.bench_ciphers', '--cipher', 'DES', '--engine', 'int',
+               '--mode', 'ECB', '--sizes', '16', '--min-time', '0.001', '--repeat', '1']
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'run.json')
+        subprocess.run(command + ['--json', path], cwd=root, check=True, capture_output=True)
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        assert {'commit', 'python', 'sizes'} <= set(saved['meta']) and len(saved['results']) == 3
+        result = subprocess.run(command + ['--compare', path], cwd=root, check=True,
+                                capture_output=True, text=True)
+        assert 'COMPARED WITH' in result.stdout and result.stdout.count(' x') >= 3
+        result = subprocess.run(command + ['--sizes', '1Q'], cwd=root, capture_output=True, text=True)
+        assert result.returncode == 2 and 'Invalid size' in result.stderr
+        result = subprocess.run(command + ['--engine', 'intt'], cwd=root, capture_output=True, text=True)
+        assert result.returncode == 2 and 'Unknown engine' in result.stderr
+    print("✓ --json / --compare / invalid --sizes / unknown --engine on the command line")
+    
+    for ciphers, engines in [(['RC4'], None), (['DES'], ['intt']), (['AES'], ['int'])]:
+        try:
+            run(ciphers=ciphers, engines=engines, sizes='16', report=lambda entry: None)
+            assert False, f"Unknown cipher / engine accepted: {ciphers} {engines}"
+        except ValueError:
+            pass
+    print("✓ Unknown cipher and engine rejected")
+
+
+def run_all_tests():
+    """Run all benchmark suite tests"""
+    print("\n" + "="*70)
+    print(" "*15 + "BENCHMARK SUITE TESTS")
+    print("="*70 + "\n")
+    
+    try:
+        test_parse_size()
+        test_json_compare()
+        
+        print("\n" + "="*70)
+        print(" "*20 + "✓ ALL TESTS PASSED!")
+        print("="*70 + "\n")
+    
+    except Exception as e:
+        print(f"\n✗ TEST FAILED: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    run_all_tests()
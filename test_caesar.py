@@ -0,0 +1,183 @@
+import sys
+import os
+import tempfile
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from algorithms.caesar.caesar_cipher import CaesarCipher, crack_file_streaming
+
+
+PLAINTEXT = """The Caesar cipher is one of the simplest and most widely known encryption
+techniques. It is a type of substitution cipher in which each letter in the plaintext
+is replaced by a letter some fixed number of positions down the alphabet. With a shift
+of three, A would be replaced by D, B would become E, and so on. The method is named
+after Julius Caesar, who used it in his private correspondence."""
+
+
+def test_brute_force():
+    """Test brute force tìm đúng khóa"""
+    print("="*60)
+    print("TEST 1: Caesar Brute Force")
+    print("="*60)
+    
+    cipher = CaesarCipher()
+    
+    for key in (0, 3, 13, 25):
+        ciphertext = cipher.decrypt_with_key(PLAINTEXT, -key)
+        found_key, plaintext, results = cipher.brute_force(ciphertext)
+        
+        assert found_key == key, f"Key {key}: found {found_key}"
+        assert plaintext == PLAINTEXT, f"Key {key}: wrong plaintext"
+        assert len(results) == 26
+        
+        # Chỉ các ứng viên tốt nhất được giải mã
+        assert all(r['plaintext'] is not None for r in results[:cipher.TOP_CANDIDATES])
+        assert all(r['plaintext'] is None for r in results[cipher.TOP_CANDIDATES:])
+        print(f"✓ Key {key} recovered")
+
+
+def test_histogram_scores():
+    """Test điểm từ bảng đếm khớp với chấm điểm trên từng bản giải mã"""
+    print("\n" + "="*60)
+    print("TEST 2: Histogram Scores")
+    print("="*60)
+    
+    cipher = CaesarCipher()
+    ciphertext = cipher.decrypt_with_key(PLAINTEXT, -11)
+    
+    results = cipher.score_shifts(cipher.count_statistics(ciphertext))
+    for result in results:
+        plaintext = cipher.decrypt_with_key(ciphertext, result['key'])
+        assert result['freq_score'] == cipher.calculate_frequency_score(plaintext)
+        assert result['bigram_score'] == cipher.calculate_bigram_score(plaintext)
+        assert result['word_score'] == cipher.calculate_word_score(plaintext)
+    print("✓ All 26 shifts scored without decrypting")
+    
+    # Không có chữ cái
+    key, plaintext, _ = cipher.brute_force("123 !?")
+    assert plaintext == "123 !?"
+    print("✓ Text without letters handled")
+
+
+def test_translate_engine():
+    """Test encrypt/decrypt bằng bảng translate"""
+    print("\n" + "="*60)
+    print("TEST 3: Translate Engine")
+    print("="*60)
+    
+    cipher = CaesarCipher()
+    
+    # Kết quả tham chiếu: dịch từng ký tự
+    def shift(text, key):
+        return ''.join(chr((ord(c) - 65 + key) % 26 + 65) if 'A' <= c <= 'Z' else
+                       chr((ord(c) - 97 + key) % 26 + 97) if 'a' <= c <= 'z' else c
+                       for c in text)
+    
+    for key in (0, 1, 7, 25, 26, -3, 40):
+        ciphertext = cipher.encrypt_with_key(PLAINTEXT, key)
+        assert ciphertext == shift(PLAINTEXT, key), f"Key {key}: encrypt mismatch"
+        assert cipher.decrypt_with_key(ciphertext, key) == PLAINTEXT, f"Key {key}: round trip failed"
+    print("✓ Encrypt matches per-character shift, decrypt inverts it")
+    
+    assert cipher.encrypt_with_key("Hello, World! 123", 3) == "Khoor, Zruog! 123"
+    print("✓ Case and non-letters preserved")
+
+
+def test_streaming_crack():
+    """Test crack file theo chunk (hai lượt, bộ nhớ cố định)"""
+    print("\n" + "="*60)
+    print("TEST 4: Streaming Crack")
+    print("="*60)
+    
+    cipher = CaesarCipher()
+    plaintext = PLAINTEXT * 50
+    ciphertext = cipher.encrypt_with_key(plaintext, 17)
+    
+    # Thống kê theo chunk khớp với thống kê một lần
+    stats = cipher.count_statistics(ciphertext)
+    for chunk_size in (1, 7, 100, 4096):
+        chunks = [ciphertext[i:i + chunk_size] for i in range(0, len(ciphertext), chunk_size)]
+        assert cipher.count_chunk_statistics(chunks) == stats, f"Chunk size {chunk_size}: stats differ"
+    print("✓ Chunked statistics match single-pass statistics")
+    
+    # Văn bản không có khoảng trắng: từ dở dang giữa các chunk không lớn dần theo file
+    block = cipher.encrypt_with_key(PLAINTEXT.replace(' ', '').replace('\n', '') * 20, 17)
+    expected = cipher.count_statistics(block * 64)
+    tracemalloc.start()
+    stats = cipher.count_chunk_statistics(block for _ in range(64))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert stats == expected and stats['total_words'] == 1 and not stats['words']
+    assert peak < 1 << 20, f"Peak memory {peak} bytes for {64 * len(block)} characters"
+    print(f"✓ {64 * len(block)} characters without spaces streamed (peak {peak} bytes)")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = os.path.join(tmp, 'caesar_stream_in.txt')
+        output_file = os.path.join(tmp, 'caesar_stream_out.txt')
+        with open(input_file, 'w', encoding='utf-8') as f:
+            f.write(ciphertext)
+        
+        for sample_size in (None, 2000):
+            key, preview = crack_file_streaming(input_file, output_file, chunk_size=333,
+                                                sample_size=sample_size)
+            assert key == 17, f"Sample {sample_size}: found {key}"
+            assert plaintext.startswith(preview)
+            with open(output_file, 'r', encoding='utf-8') as f:
+                assert f.read() == f"17\n{plaintext}"
+            print(f"✓ Sample {sample_size}: key recovered, output file decrypted")
+
+
+def test_adaptive_crack():
+    """Test crack thích nghi dừng sớm trên đoạn đầu"""
+    print("\n" + "="*60)
+    print("TEST 5: Adaptive Crack")
+    print("="*60)
+    
+    cipher = CaesarCipher()
+    plaintext = PLAINTEXT * 100
+    ciphertext = cipher.encrypt_with_key(plaintext, 20)
+    
+    letters = sum(c.isalpha() for c in ciphertext)
+    
+    key, decrypted, confidence, analysed = cipher.crack_adaptive(ciphertext)
+    assert key == 20 and decrypted == plaintext
+    assert confidence >= 0.15 and analysed == 1024
+    print(f"✓ Key found after {analysed}/{letters} letters (confidence {confidence:.2f})")
+    
+    # Đoạn đầu đo bằng chữ cái, không phải ký tự
+    padded = ciphertext.replace(' ', ' ... ;; ')
+    key, _, _, analysed = cipher.crack_adaptive(padded)
+    assert key == 20 and analysed == 1024
+    print("✓ Sample sizes count letters, not punctuation")
+    
+    # Ngưỡng không thể đạt -> phân tích cả văn bản
+    key, _, _, analysed = cipher.crack_adaptive(ciphertext, min_confidence=2)
+    assert key == 20 and analysed == letters
+    print("✓ Falls back to the whole text below the confidence threshold")
+
+
+def run_all_tests():
+    """Run tất cả các tests"""
+    print("\n" + "="*70)
+    print(" "*15 + "CAESAR CIPHER TEST SUITE")
+    print("="*70 + "\n")
+    
+    try:
+        test_brute_force()
+        test_histogram_scores()
+        test_translate_engine()
+        test_streaming_crack()
+        test_adaptive_crack()
+        
+        print("\n" + "="*70)
+        print(" "*20 + "✓ ALL TESTS PASSED!")
+        print("="*70 + "\n")
+    
+    except Exception as e:
+        print(f"\n✗ TEST FAILED: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    run_all_tests()
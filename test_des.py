@@ -1,6 +1,7 @@
 
 import sys
 import os
+import tempfile
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from algorithms.des import DESModes
@@ -190,6 +191,343 @@ def test_padding():
     print("\n✓ All padding tests passed!")
 
 
+def test_parallel_cbc_decrypt():
+    """Test giải mã CBC theo lô và trên process pool"""
+    print("\n" + "="*60)
+    print("TEST 5: Parallel CBC Decryption")
+    print("="*60)
+    
+    des = DESModes()
+    key = b'Parallel'
+    data = os.urandom(8 * 60 + 3)
+    
+    ciphertext, iv = des.encrypt(data, key, mode='CBC')
+    assert des.decrypt_cbc(ciphertext, key, iv, workers=1) == data, "Serial CBC failed!"
+    assert des.decrypt_cbc(ciphertext, key, iv, workers=3) == data, "Parallel CBC failed!"
+    print("✓ Serial and process-pool CBC decryption agree")
+
+
+def test_streaming():
+    """Test mã hóa/giải mã từng phần và stream file"""
+    print("\n" + "="*60)
+    print("TEST 6: Streaming API")
+    print("="*60)
+    
+    des = DESModes()
+    key = b'StreamK1'
+    data = os.urandom(8 * 20 + 5)
+    
+    for mode in ['ECB', 'CBC']:
+        expected, iv = des.encrypt(data, key, mode=mode, iv=os.urandom(8))
+        for size in [1, 5, 8, 29]:
+            enc = des.encryptor(key, mode, iv)
+            ciphertext = b''.join(enc.update(data[i:i + size])
+                                  for i in range(0, len(data), size)) + enc.finalize()
+            assert ciphertext == expected, f"{mode} streaming encrypt failed!"
+            
+            dec = des.decryptor(key, mode, iv)
+            plaintext = b''.join(dec.update(ciphertext[i:i + size])
+                                 for i in range(0, len(ciphertext), size)) + dec.finalize()
+            assert plaintext == data, f"{mode} streaming decrypt failed!"
+    print("✓ ECB/CBC streaming matches one-shot")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'des_stream_plain.bin')
+        encrypted = os.path.join(tmp, 'des_stream_enc.bin')
+        decrypted = os.path.join(tmp, 'des_stream_dec.bin')
+        with open(source, 'wb') as f:
+            f.write(data)
+        
+        iv = des.encrypt_file(source, encrypted, key, mode='CBC', chunk_size=50)
+        des.decrypt_file(encrypted, decrypted, key, mode='CBC', iv=iv, chunk_size=50)
+        with open(decrypted, 'rb') as f:
+            assert f.read() == data, "File streaming failed!"
+        print("✓ File-to-file streaming round trips")
+
+
+def test_int_engine():
+    """Test integer engine: test vector chuẩn và so sánh với DESCore"""
+    print("\n" + "="*60)
+    print("TEST 7: Integer DES Engine")
+    print("="*60)
+    
+    from algorithms.des import DESCore, DESInt
+    
+    key = bytes.fromhex('0123456789ABCDEF')
+    plaintext = b'Now is t'
+    expected = bytes.fromhex('3FA40E8A984D4815')
+    
+    for engine in [DESCore(), DESInt()]:
+        ciphertext = engine.encrypt_block(plaintext, key)
+        assert ciphertext == expected, f"{type(engine).__name__} vector failed!"
+        assert engine.decrypt_block(ciphertext, key) == plaintext
+    print("✓ Known-answer vector passed on both engines")
+    
+    core = DESModes(engine='core')
+    fast = DESModes(engine='int')
+    assert DESModes().engine == 'int', "Integer engine should be the default"
+    
+    data = os.urandom(8 * 30 + 5)
+    key = os.urandom(8)
+    iv = os.urandom(8)
+    for mode in ['ECB', 'CBC']:
+        ct_core, _ = core.encrypt(data, key, mode=mode, iv=iv)
+        ct_fast, _ = fast.encrypt(data, key, mode=mode, iv=iv)
+        assert ct_core == ct_fast, f"{mode}: engines disagree!"
+        assert fast.decrypt(ct_fast, key, mode=mode, iv=iv) == data
+    assert fast.decrypt_cbc(ct_fast, key, iv, workers=2) == data
+    print("✓ Integer engine matches DESCore in ECB/CBC")
+
+
+def test_key_context():
+    """Test DESKey: subkeys tính 1 lần cho mỗi key và dùng lại"""
+    print("\n" + "="*60)
+    print("TEST 8: Key Context (subkey cache)")
+    print("="*60)
+    
+    from algorithms.des import DESKey, DESIntKey
+    from algorithms.des.des_core import DESCore
+    
+    key = b'CacheKey'
+    data = b'Key schedule computed once per key!'
+    
+    for engine, key_type in [('core', DESKey), ('int', DESIntKey)]:
+        des = DESModes(engine=engine)
+        des_key = des.expand_key(key)
+        assert type(des_key) is key_type, f"{engine}: wrong context type"
+        assert des.expand_key(key) is des_key, f"{engine}: schedule not cached"
+        assert des_key.dec_subkeys == des_key.subkeys[::-1]
+        
+        for mode in ['ECB', 'CBC']:
+            ciphertext, iv = des.encrypt(data, des_key, mode=mode)
+            assert des.decrypt(ciphertext, key, mode=mode, iv=iv) == data
+    print("✓ Contexts cached per key and accepted by every mode")
+    
+    # Context from one engine works on the other
+    core_key = DESModes(engine='core').expand_key(key)
+    subkeys = DESCore()._generate_subkeys(DESCore()._bytes_to_bits(key))
+    assert list(core_key.subkeys) == subkeys
+    ciphertext, _ = DESModes(engine='int').encrypt(data, core_key, mode='ECB')
+    assert DESModes(engine='core').decrypt(ciphertext, key, mode='ECB') == data
+    print("✓ Contexts interchangeable between engines")
+    
+    try:
+        DESModes().expand_key(b'short')
+        assert False, "Short key should be rejected"
+    except ValueError:
+        print("✓ Invalid key length rejected")
+
+
+def test_triple_des():
+    """Test 3DES (EDE2/EDE3) với vector NIST SP 800-67"""
+    print("\n" + "="*60)
+    print("TEST 9: Triple DES")
+    print("="*60)
+    
+    from algorithms.des import TDESModes
+    
+    tdes = TDESModes()
+    k1 = bytes.fromhex('0123456789ABCDEF')
+    k2 = bytes.fromhex('23456789ABCDEF01')
+    k3 = bytes.fromhex('456789ABCDEF0123')
+    plaintext = b'The qufck brown fox jump'
+    expected = bytes.fromhex('A826FD8CE53B855F' 'CCE21C8112256FE6' '68D5C05DD9B6B900')
+    
+    ciphertext, _ = tdes.encrypt(plaintext, k1 + k2 + k3, mode='ECB')
+    assert ciphertext[:24] == expected, "NIST TDEA vector failed!"
+    assert tdes.decrypt(ciphertext, k1 + k2 + k3, mode='ECB') == plaintext
+    print("✓ NIST SP 800-67 EDE3 vector passed")
+    
+    # EDE2 = EDE3 với K3 = K1; K1 = K2 = K3 tương đương single DES
+    data = os.urandom(8 * 12 + 3)
+    iv = os.urandom(8)
+    ede2, _ = tdes.encrypt(data, k1 + k2, mode='CBC', iv=iv)
+    ede3, _ = tdes.encrypt(data, k1 + k2 + k1, mode='CBC', iv=iv)
+    assert ede2 == ede3, "EDE2 differs from EDE3 with K3 = K1!"
+    single, _ = DESModes().encrypt(data, k1, mode='CBC', iv=iv)
+    assert tdes.encrypt(data, k1 * 3, mode='CBC', iv=iv)[0] == single
+    print("✓ EDE2 and single-DES compatibility keying passed")
+    
+    tdes_key = tdes.expand_key(k1 + k2 + k3)
+    assert tdes.expand_key(k1 + k2 + k3) is tdes_key, "Key bundle not cached"
+    assert tdes.decrypt_cbc(ede2, k1 + k2, iv, workers=2) == data
+    enc = tdes.encryptor(tdes.expand_key(k1 + k2), 'CBC', iv)
+    assert enc.update(data[:20]) + enc.update(data[20:]) + enc.finalize() == ede2
+    print("✓ Cached schedules, parallel CBC and streaming passed")
+    
+    single_key = DESModes().expand_key(k1)
+    for expand, short_key in [(tdes.expand_key, k1), (tdes.expand_key, single_key),
+                              (tdes.core.expand_key, single_key)]:
+        try:
+            expand(short_key)
+            assert False, "8-byte key should be rejected for 3DES"
+        except ValueError as e:
+            assert 'got 8' in str(e), f"Unexpected error: {e}"
+    print("✓ Invalid key length rejected (bytes or single-DES key)")
+    
+    for bad in [lambda: TDESModes(engine='int'), lambda: tdes.encrypt(data, k1 + k2, mode='CBC', iv=b'short')]:
+        try:
+            bad()
+            assert False, "Invalid engine / IV accepted"
+        except ValueError as e:
+            assert '3DES ' in str(e), f"Wrong cipher name in error: {e}"
+    print("✓ Errors name 3DES")
+
+
+def test_bitslice_engine():
+    """Test bitslice engine và CTR mode"""
+    print("\n" + "="*60)
+    print("TEST 10: Bitslice Engine + CTR Mode")
+    print("="*60)
+    
+    from algorithms.des import DESBitslice, DESInt
+    
+    key = os.urandom(8)
+    data = os.urandom(8 * 700)
+    bitslice = DESBitslice()
+    reference = DESInt()
+    assert bitslice.encrypt_blocks(data, key) == reference.encrypt_blocks(data, key)
+    assert bitslice.decrypt_blocks(data, key) == reference.decrypt_blocks(data, key)
+    assert bitslice.encrypt_block(b'Now is t', bytes.fromhex('0123456789ABCDEF')) == \
+        bytes.fromhex('3FA40E8A984D4815')
+    print("✓ Bitslice blocks match integer engine")
+    
+    fast = DESModes(engine='bitslice')
+    slow = DESModes(engine='int')
+    data = os.urandom(8 * 500 + 3)
+    for mode in ['ECB', 'CTR']:
+        ciphertext, iv = fast.encrypt(data, key, mode=mode)
+        assert slow.encrypt(data, key, mode=mode, iv=iv)[0] == ciphertext, f"{mode}: engines disagree!"
+        assert fast.decrypt(ciphertext, key, mode=mode, iv=iv) == data
+    print("✓ Bitslice ECB/CTR matches integer engine")
+    
+    # CTR: truy cập ngẫu nhiên, process pool, streaming
+    ciphertext, iv = fast.encrypt_ctr(data, key)
+    assert fast.crypt_ctr(ciphertext[80:160], key, iv, block_offset=10) == data[80:160]
+    assert fast.decrypt_ctr(ciphertext, key, iv, workers=2) == data
+    enc = fast.encryptor(key, 'CTR', iv)
+    assert enc.update(data[:13]) + enc.update(data[13:]) + enc.finalize() == ciphertext
+    print("✓ CTR random access, process pool and streaming passed")
+
+
+def test_key_search():
+    """Test known-plaintext key search"""
+    print("\n" + "="*60)
+    print("TEST 11: Key Search")
+    print("="*60)
+    
+    from algorithms.des import DESInt
+    from algorithms.des.des_keysearch import KeySpace, search_key
+    
+    key = b'kE7!x9Qz'
+    plaintext = b'Now is the time '
+    ciphertext = DESInt().encrypt_blocks(plaintext, key)
+    
+    # Bỏ các key chỉ khác bit parity: 95 ký tự printable -> 48 lớp
+    space = KeySpace.from_pattern('kE7!x??z', 'printable')
+    assert space.size == 48 * 48
+    assert KeySpace.from_pattern('6b45372178' '????' '7a').size == space.size
+    
+    for workers in [1, 2]:
+        reported = []
+        result = search_key(space, plaintext, ciphertext, workers=workers,
+                            progress=lambda tested, total, rate: reported.append(tested))
+        found = result['key']
+        # Số key báo cáo cuối cùng khớp chính xác với số key đã thử
+        assert reported[-1] == result['tested'] <= space.size, "Tested count mismatch!"
+        assert found is not None, "Key not found!"
+        assert all(a & 0xFE == b & 0xFE for a, b in zip(found, key)), "Wrong key class!"
+        assert DESInt().encrypt_blocks(plaintext, found) == ciphertext
+    print(f"✓ Found key {found!r} ({result['keys_per_second']:,.0f} keys/s)")
+    
+    # Nhiều shard hơn worker, key nằm ở shard sau: các shard còn chờ bị hủy
+    key = b'keyZPPbP'
+    ciphertext_late = DESInt().encrypt_blocks(plaintext, key)
+    space_late = KeySpace.from_pattern('keyZ??b?', 'printable')
+    result = search_key(space_late, plaintext, ciphertext_late, workers=2, shard_keys=1 << 10)
+    assert result['key'] is not None, "Key not found in a later shard!"
+    assert DESInt().encrypt_blocks(plaintext, result['key']) == ciphertext_late
+    print(f"✓ Key found in a later shard ({space_late.size // (1 << 10) + 1} shards, 2 workers)")
+    
+    # Checkpoint: lần chạy thứ 2 không phải thử lại shard nào
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = os.path.join(tmp, 'search.json')
+        wrong = bytes(len(plaintext))
+        first = search_key(space, plaintext, wrong, workers=1, checkpoint=checkpoint, shard_keys=256)
+        assert first['key'] is None and first['tested'] == space.size
+        second = search_key(space, plaintext, wrong, workers=1, checkpoint=checkpoint, shard_keys=256)
+        assert second['tested'] == 0
+        try:
+            search_key(space, plaintext, ciphertext, workers=1, checkpoint=checkpoint)
+            assert False, "Mismatched checkpoint accepted!"
+        except ValueError:
+            pass
+    print("✓ Checkpoint resume passed")
+
+
+def test_feedback_modes():
+    """Test CFB/OFB modes (dùng chung BlockModes với AES)"""
+    print("\n" + "="*60)
+    print("TEST 12: CFB/OFB Modes")
+    print("="*60)
+    
+    from algorithms.des import DESInt, TDESModes
+    
+    des = DESModes()
+    engine = DESInt()
+    key = b'TestKey1'
+    iv = b'initvec!'
+    data = os.urandom(8 * 20 + 5)
+    
+    # Dựng lại từ định nghĩa SP 800-38A bằng block cipher trực tiếp
+    def keystream_ofb(n):
+        out, block = b'', iv
+        while len(out) < n:
+            block = engine.encrypt_block(block, key)
+            out += block
+        return out[:n]
+    
+    expected_ofb = bytes(a ^ b for a, b in zip(data, keystream_ofb(len(data))))
+    assert des.encrypt_ofb(data, key, iv)[0] == expected_ofb, "OFB mismatch!"
+    
+    expected_cfb, previous = b'', iv
+    for i in range(0, len(data), 8):
+        block = bytes(a ^ b for a, b in zip(data[i:i + 8], engine.encrypt_block(previous, key)))
+        expected_cfb += block
+        previous = block
+    assert des.encrypt_cfb(data, key, iv)[0] == expected_cfb, "CFB mismatch!"
+    print("✓ CFB64/OFB match the SP 800-38A definitions")
+    
+    for mode in ['CFB', 'OFB']:
+        for cipher, mode_key in [(des, key), (TDESModes(), os.urandom(24))]:
+            ciphertext, mode_iv = cipher.encrypt(data, mode_key, mode=mode)
+            assert len(ciphertext) == len(data), f"{mode} must not pad"
+            assert cipher.decrypt(ciphertext, mode_key, mode=mode, iv=mode_iv) == data
+            dec = cipher.decryptor(mode_key, mode, mode_iv)
+            assert dec.update(ciphertext[:11]) + dec.update(ciphertext[11:]) + dec.finalize() == data
+    print("✓ DES/3DES CFB/OFB round trip and streaming passed")
+
+
+def test_batch_api():
+    """Test batch API (nhiều record, 1 key)"""
+    print("\n" + "="*60)
+    print("TEST 13: Batch API")
+    print("="*60)
+    
+    from algorithms.des import TDESModes
+    
+    messages = [os.urandom(n) for n in [0, 1, 7, 8, 9, 20, 32] * 3]
+    for cipher, key in [(DESModes(engine='bitslice'), os.urandom(8)), (TDESModes(), os.urandom(16))]:
+        for mode in ['ECB', 'CBC', 'CFB', 'OFB', 'CTR']:
+            ciphertexts, ivs = cipher.encrypt_batch(messages, key, mode=mode)
+            for i, (message, ciphertext) in enumerate(zip(messages, ciphertexts)):
+                iv = None if ivs is None else ivs[i]
+                assert ciphertext == cipher.encrypt(message, key, mode=mode, iv=iv)[0], \
+                    f"{mode}: record {i} differs from encrypt()"
+            assert cipher.decrypt_batch(ciphertexts, key, mode=mode, ivs=ivs) == messages
+    print("✓ DES/3DES batch matches per-record encrypt for every mode")
+
+
 def run_all_tests():
     """Run tất cả các tests"""
     print("\n" + "="*70)
@@ -201,6 +539,15 @@ def run_all_tests():
         test_des_with_files()
         test_des_long_text()
         test_padding()
+        test_parallel_cbc_decrypt()
+        test_streaming()
+        test_int_engine()
+        test_key_context()
+        test_triple_des()
+        test_bitslice_engine()
+        test_key_search()
+        test_feedback_modes()
+        test_batch_api()
         
         print("\n" + "="*70)
         print(" "*20 + "✓ ALL TESTS PASSED!")
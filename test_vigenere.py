@@ -0,0 +1,144 @@
+import sys
+import os
+import pydoc_data.topics
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from algorithms.vigenere.vigenere_cipher import VigenereCipher
+
+
+PLAINTEXT = """The Vigenere cipher is a method of encrypting alphabetic text by using a
+series of interwoven Caesar ciphers based on the letters of a keyword. It employs a
+form of polyalphabetic substitution. First described by Giovan Battista Bellaso in
+1553, the cipher is easy to understand and implement, but it resisted all attempts to
+break it until 1863, three centuries later. This earned it the description le chiffre
+indechiffrable, French for the indecipherable cipher. Many people have tried to
+implement encryption schemes that are essentially Vigenere ciphers."""
+
+
+def reference_decrypt(ciphertext, key):
+    """Per-character decrypt (original implementation)"""
+    result = []
+    ki = 0
+    key = key.lower()
+    for c in ciphertext:
+        if c.isalpha():
+            base = ord('A') if c.isupper() else ord('a')
+            shift = ord(key[ki % len(key)]) - ord('a')
+            result.append(chr((ord(c) - base - shift) % 26 + base))
+            ki += 1
+        else:
+            result.append(c)
+    return ''.join(result)
+
+
+def test_encrypt_decrypt():
+    """Test Vigenere translate-table encrypt/decrypt"""
+    print("="*60)
+    print("TEST 1: Vigenere Encrypt / Decrypt")
+    print("="*60)
+    
+    cipher = VigenereCipher()
+    
+    assert cipher.encrypt("Attack at dawn!", "LEMON") == "Lxfopv ef rnhr!"
+    print("✓ Known vector: Attack at dawn! -> Lxfopv ef rnhr!")
+    
+    for key in ("a", "key", "Lemon", "crypto", "abcdefghijklmnopqrstuvwxyz"):
+        ciphertext = cipher.encrypt(PLAINTEXT, key)
+        assert cipher.decrypt(ciphertext, key) == reference_decrypt(ciphertext, key), \
+            f"Key {key}: decrypt differs from per-character version"
+        assert cipher.decrypt(ciphertext, key) == PLAINTEXT, f"Key {key}: round trip failed"
+    print("✓ Decrypt matches per-character version, round trip OK")
+    
+    assert cipher.decrypt("", "key") == ""
+    assert cipher.decrypt("123 ...", "key") == "123 ..."
+    try:
+        cipher.encrypt(PLAINTEXT, "")
+        assert False, "Empty key accepted"
+    except ValueError:
+        pass
+    print("✓ Empty text / empty key handled")
+
+
+def test_adaptive_crack():
+    """Test adaptive cracking on growing prefixes"""
+    print("\n" + "="*60)
+    print("TEST 2: Vigenere Adaptive Crack")
+    print("="*60)
+    
+    cipher = VigenereCipher()
+    
+    # Long English text: the pydoc topics shipped with Python
+    plaintext = ' '.join(pydoc_data.topics.topics.values())[:100000]
+    ciphertext = cipher.encrypt(plaintext, "lemonade")
+    
+    key, decrypted, confidence, analysed = cipher.crack_adaptive(ciphertext)
+    assert key == "lemonade" and decrypted == plaintext
+    assert confidence >= 0.2 and analysed in (1024, 4096, 16384)
+    print(f"✓ Key found after {analysed} letters of {len(ciphertext)} characters (confidence {confidence:.2f})")
+    
+    # Repeated key reduced to its period
+    key, _, _, _ = cipher.crack_adaptive(cipher.encrypt(plaintext[:20000], "keykey"))
+    assert key == "key", f"Got {key}"
+    print("✓ Repeated key reported as its period")
+
+
+def test_column_analysis():
+    """Test IC analysis / find_key on letter codes split by strided slices"""
+    print("\n" + "="*60)
+    print("TEST 3: Vigenere Column Analysis")
+    print("="*60)
+    
+    cipher = VigenereCipher()
+    
+    codes = cipher.letter_codes("Ab, c! Zz 1")
+    assert codes == bytes([0, 1, 2, 25, 25])
+    print("✓ Letter codes: ASCII letters only, a/A = 0")
+    
+    # Kasiski / IC and decryption see the same letter stream
+    accented = "Été naïve \u212a Ab"
+    assert cipher.clean_text(accented) == "tnaveab"
+    assert bytes(ord(c) - ord('a') for c in cipher.clean_text(accented)) == cipher.letter_codes(accented)
+    assert cipher.decrypt(cipher.encrypt(accented, "key"), "key") == accented
+    print("✓ clean_text and letter_codes skip the same non-ASCII letters")
+    
+    plaintext = ' '.join(pydoc_data.topics.topics.values())[:50000]
+    ciphertext = cipher.encrypt(plaintext, "python")
+    
+    # Same result as building each column character by character
+    text = cipher.clean_text(ciphertext)
+    for k in (1, 3, 6, 7):
+        groups = ['' for _ in range(k)]
+        for i, c in enumerate(text):
+            groups[i % k] += c
+        expected = ''.join(chr(cipher.crack_caesar(g) + ord('a')) for g in groups)
+        assert cipher.find_key(ciphertext, k) == expected, f"Key length {k}: columns differ"
+    print("✓ find_key matches per-character column building")
+    
+    assert cipher.ic_analysis(ciphertext)[0] % 6 == 0
+    assert cipher.find_key(ciphertext, 6) == "python"
+    print("✓ IC analysis ranks the key length (or a multiple) first, key recovered")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "="*70)
+    print(" "*15 + "VIGENERE CIPHER TEST SUITE")
+    print("="*70 + "\n")
+    
+    try:
+        test_encrypt_decrypt()
+        test_adaptive_crack()
+        test_column_analysis()
+        
+        print("\n" + "="*70)
+        print(" "*20 + "✓ ALL TESTS PASSED!")
+        print("="*70 + "\n")
+    
+    except Exception as e:
+        print(f"\n✗ TEST FAILED: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -9,16 +9,19 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import algorithms (Giữ nguyên import của bạn)
 try:
-    from algorithms.caesar.caesar_cipher import crack_from_file as crack_caesar_file
+    from algorithms.caesar.caesar_cipher import crack_file_streaming as crack_caesar_file
     from algorithms.monoalphabetic.mono_cipher import crack_from_file as crack_mono_file
     from algorithms.vigenere.vigenere_cipher import crack_from_file as crack_vigenere_file
     from algorithms.des import DESModes
     from algorithms.aes import AESModes
+    from algorithms.streaming import stream_copy, stream_buffer, mapped_input
     from utils.file_handler import (
         read_text_file, write_text_file,
         hex_to_bytes, bytes_to_hex,
         read_des_key_from_hex, read_des_iv_from_hex,
-        save_encrypted_output, parse_encrypted_input
+        read_aes_key_from_hex,
+        EncryptedFileWriter, EncryptedFileReader,
+        is_container_file, read_encrypted_file
     )
 except ImportError:
     # Đoạn này để tránh lỗi nếu chạy test mà không có folder algorithms
@@ -56,7 +59,7 @@ class CryptoApp(ctk.CTk):
         # Khởi tạo DES & AES
         try:
             self.des = DESModes()
-            self.aes = AESModes()
+            self.aes = AESModes(engine='numpy')
         except:
             pass
         
@@ -371,6 +374,9 @@ class CryptoApp(ctk.CTk):
         self.des_mode_var = ctk.StringVar(value="ECB")
         ctk.CTkRadioButton(mode_frame, text="ECB", variable=self.des_mode_var, value="ECB", fg_color=BROWN_COLOR, command=self.on_des_mode_change).pack(side="left", padx=5)
         ctk.CTkRadioButton(mode_frame, text="CBC", variable=self.des_mode_var, value="CBC", fg_color=BROWN_COLOR, command=self.on_des_mode_change).pack(side="left", padx=5)
+        ctk.CTkRadioButton(mode_frame, text="CFB", variable=self.des_mode_var, value="CFB", fg_color=BROWN_COLOR, command=self.on_des_mode_change).pack(side="left", padx=5)
+        ctk.CTkRadioButton(mode_frame, text="OFB", variable=self.des_mode_var, value="OFB", fg_color=BROWN_COLOR, command=self.on_des_mode_change).pack(side="left", padx=5)
+        ctk.CTkRadioButton(mode_frame, text="CTR", variable=self.des_mode_var, value="CTR", fg_color=BROWN_COLOR, command=self.on_des_mode_change).pack(side="left", padx=5)
         
         # Action
         ctk.CTkLabel(controls_frame, text="Action:", anchor="w").grid(row=1, column=0, sticky="w", pady=5)
@@ -433,7 +439,7 @@ class CryptoApp(ctk.CTk):
         main_frame.grid_columnconfigure(1, weight=3) # Result rộng hơn
         main_frame.grid_rowconfigure(1, weight=1)
         
-        title = ctk.CTkLabel(main_frame, text="AES-128 Encryption/Decryption",
+        title = ctk.CTkLabel(main_frame, text="AES Encryption/Decryption",
                              font=("Roboto", 20, "bold"), text_color=BROWN_COLOR)
         title.grid(row=0, column=0, columnspan=2, pady=(15, 10), sticky="ew")
         
@@ -454,6 +460,9 @@ class CryptoApp(ctk.CTk):
         self.aes_mode_var = ctk.StringVar(value="ECB")
         ctk.CTkRadioButton(mode_frame, text="ECB", variable=self.aes_mode_var, value="ECB", fg_color=BROWN_COLOR, command=self.on_aes_mode_change).pack(side="left", padx=5)
         ctk.CTkRadioButton(mode_frame, text="CBC", variable=self.aes_mode_var, value="CBC", fg_color=BROWN_COLOR, command=self.on_aes_mode_change).pack(side="left", padx=5)
+        ctk.CTkRadioButton(mode_frame, text="CFB", variable=self.aes_mode_var, value="CFB", fg_color=BROWN_COLOR, command=self.on_aes_mode_change).pack(side="left", padx=5)
+        ctk.CTkRadioButton(mode_frame, text="OFB", variable=self.aes_mode_var, value="OFB", fg_color=BROWN_COLOR, command=self.on_aes_mode_change).pack(side="left", padx=5)
+        ctk.CTkRadioButton(mode_frame, text="CTR", variable=self.aes_mode_var, value="CTR", fg_color=BROWN_COLOR, command=self.on_aes_mode_change).pack(side="left", padx=5)
         
         # Action
         ctk.CTkLabel(controls_frame, text="Action:", anchor="w").grid(row=1, column=0, sticky="w", pady=5)
@@ -463,30 +472,38 @@ class CryptoApp(ctk.CTk):
         ctk.CTkRadioButton(action_frame, text="Encrypt", variable=self.aes_action_var, value="encrypt", fg_color=BROWN_COLOR).pack(side="left", padx=5)
         ctk.CTkRadioButton(action_frame, text="Decrypt", variable=self.aes_action_var, value="decrypt", fg_color=BROWN_COLOR).pack(side="left", padx=5)
         
+        # Key size
+        ctk.CTkLabel(controls_frame, text="Key size:", anchor="w").grid(row=2, column=0, sticky="w", pady=5)
+        key_size_frame = ctk.CTkFrame(controls_frame, fg_color="transparent")
+        key_size_frame.grid(row=2, column=1, sticky="ew", pady=5)
+        self.aes_key_size_var = ctk.StringVar(value="128")
+        for bits in ("128", "192", "256"):
+            ctk.CTkRadioButton(key_size_frame, text=f"{bits}-bit", variable=self.aes_key_size_var, value=bits, fg_color=BROWN_COLOR).pack(side="left", padx=5)
+        
         # Key
-        ctk.CTkLabel(controls_frame, text="Key (Hex):", anchor="w").grid(row=2, column=0, sticky="w", pady=5)
+        ctk.CTkLabel(controls_frame, text="Key (Hex):", anchor="w").grid(row=3, column=0, sticky="w", pady=5)
         self.aes_key_entry = ctk.CTkEntry(controls_frame)
-        self.aes_key_entry.grid(row=2, column=1, sticky="ew", pady=5)
-        ctk.CTkButton(controls_frame, text="Gen", width=40, fg_color=BROWN_COLOR, hover_color=BROWN_HOVER, command=self.generate_aes_key).grid(row=2, column=2, padx=5)
+        self.aes_key_entry.grid(row=3, column=1, sticky="ew", pady=5)
+        ctk.CTkButton(controls_frame, text="Gen", width=40, fg_color=BROWN_COLOR, hover_color=BROWN_HOVER, command=self.generate_aes_key).grid(row=3, column=2, padx=5)
         
         # IV
-        ctk.CTkLabel(controls_frame, text="IV (Hex):", anchor="w").grid(row=3, column=0, sticky="w", pady=5)
+        ctk.CTkLabel(controls_frame, text="IV (Hex):", anchor="w").grid(row=4, column=0, sticky="w", pady=5)
         self.aes_iv_entry = ctk.CTkEntry(controls_frame)
-        self.aes_iv_entry.grid(row=3, column=1, sticky="ew", pady=5)
+        self.aes_iv_entry.grid(row=4, column=1, sticky="ew", pady=5)
         self.aes_iv_btn = ctk.CTkButton(controls_frame, text="Gen", width=40, fg_color=BROWN_COLOR, hover_color=BROWN_HOVER, command=self.generate_aes_iv, state="disabled")
-        self.aes_iv_btn.grid(row=3, column=2, padx=5)
+        self.aes_iv_btn.grid(row=4, column=2, padx=5)
         
         # Input File
-        ctk.CTkLabel(controls_frame, text="Input:", anchor="w").grid(row=4, column=0, sticky="w", pady=5)
+        ctk.CTkLabel(controls_frame, text="Input:", anchor="w").grid(row=5, column=0, sticky="w", pady=5)
         self.aes_input_entry = ctk.CTkEntry(controls_frame)
-        self.aes_input_entry.grid(row=4, column=1, sticky="ew", pady=5)
-        ctk.CTkButton(controls_frame, text="...", width=40, fg_color=BROWN_COLOR, hover_color=BROWN_HOVER, command=lambda: self.browse_file(self.aes_input_entry)).grid(row=4, column=2, padx=5)
+        self.aes_input_entry.grid(row=5, column=1, sticky="ew", pady=5)
+        ctk.CTkButton(controls_frame, text="...", width=40, fg_color=BROWN_COLOR, hover_color=BROWN_HOVER, command=lambda: self.browse_file(self.aes_input_entry)).grid(row=5, column=2, padx=5)
         
         # Output File
-        ctk.CTkLabel(controls_frame, text="Output:", anchor="w").grid(row=5, column=0, sticky="w", pady=5)
+        ctk.CTkLabel(controls_frame, text="Output:", anchor="w").grid(row=6, column=0, sticky="w", pady=5)
         self.aes_output_entry = ctk.CTkEntry(controls_frame)
-        self.aes_output_entry.grid(row=5, column=1, sticky="ew", pady=5)
-        ctk.CTkButton(controls_frame, text="...", width=40, fg_color=BROWN_COLOR, hover_color=BROWN_HOVER, command=lambda: self.save_file(self.aes_output_entry)).grid(row=5, column=2, padx=5)
+        self.aes_output_entry.grid(row=6, column=1, sticky="ew", pady=5)
+        ctk.CTkButton(controls_frame, text="...", width=40, fg_color=BROWN_COLOR, hover_color=BROWN_HOVER, command=lambda: self.save_file(self.aes_output_entry)).grid(row=6, column=2, padx=5)
         
         # Buttons (Stacked)
         btn_frame = ctk.CTkFrame(left_frame, fg_color="transparent")
@@ -512,7 +529,7 @@ class CryptoApp(ctk.CTk):
 
     def on_des_mode_change(self):
         mode = self.des_mode_var.get()
-        if mode == "CBC":
+        if mode != "ECB":
             self.des_iv_entry.configure(state="normal")
             self.des_iv_btn.configure(state="normal")
         else:
@@ -558,9 +575,9 @@ class CryptoApp(ctk.CTk):
             return
             
         iv = None
-        if mode == 'CBC':
+        if mode != 'ECB':
             if not iv_hex and action == 'encrypt':
-                messagebox.showerror("Error", "IV is required for CBC encryption!")
+                messagebox.showerror("Error", f"IV is required for {mode} encryption!")
                 return
             if iv_hex:
                 try:
@@ -589,31 +606,26 @@ class CryptoApp(ctk.CTk):
         thread.start()
     
     def des_encrypt_file(self, input_file, output_file, key, mode, iv):
-        plaintext = read_text_file(input_file).encode('utf-8')
-        ciphertext, iv_used = self.des.encrypt(plaintext, key, mode=mode, iv=iv)
-        ciphertext_hex = bytes_to_hex(ciphertext)
-        iv_hex = bytes_to_hex(iv_used) if iv_used else None
-        save_encrypted_output(output_file, ciphertext_hex, iv_hex, mode)
+        # mmapped plaintext -> binary container (raw ciphertext, no hex)
+        # Blocks are read through memoryview slices; only the last block is padded
+        enc = self.des.encryptor(key, mode, iv)
+        with mapped_input(input_file) as view, \
+                EncryptedFileWriter(output_file, 'DES', mode, enc.iv) as writer:
+            stream_buffer(enc, view, writer)
+        iv_hex = bytes_to_hex(enc.iv) if enc.iv else None
         
         result = f"✓ Encryption Successful!\nMode: {mode}\nKey: {bytes_to_hex(key).upper()}\n"
         if iv_hex: result += f"IV: {iv_hex.upper()}\n"
-        result += f"\nCiphertext preview:\n{ciphertext_hex.upper()[:200]}..."
+        result += f"\nCiphertext preview:\n{self.preview_ciphertext(output_file)}..."
         
         self.after(0, lambda: self.des_result_text.delete("1.0", "end"))
         self.after(0, lambda: self.des_result_text.insert("1.0", result))
         self.after(0, lambda: messagebox.showinfo("Success", "File encrypted successfully!"))
 
     def des_decrypt_file(self, input_file, output_file, key, mode, iv):
-        data = parse_encrypted_input(input_file)
-        ciphertext = hex_to_bytes(data['ciphertext'])
-        if mode == 'CBC' and iv is None:
-            if data['iv']: iv = hex_to_bytes(data['iv'])
-            else: raise ValueError("IV not found/provided!")
-            
-        plaintext = self.des.decrypt(ciphertext, key, mode=mode, iv=iv)
-        write_text_file(output_file, plaintext.decode('utf-8'))
+        mode = self.decrypt_to_file(self.des, 'DES', input_file, output_file, key, mode, iv)
         
-        result = f"✓ Decryption Successful!\nMode: {mode}\n\nPlaintext preview:\n{plaintext.decode('utf-8')[:999]}..."
+        result = f"✓ Decryption Successful!\nMode: {mode}\n\nPlaintext preview:\n{self.preview_plaintext(output_file)}..."
         
         self.after(0, lambda: self.des_result_text.delete("1.0", "end"))
         self.after(0, lambda: self.des_result_text.insert("1.0", result))
@@ -622,7 +634,7 @@ class CryptoApp(ctk.CTk):
     # ==================== AES FUNCTIONS ====================
     def on_aes_mode_change(self):
         mode = self.aes_mode_var.get()
-        if mode == "CBC":
+        if mode != "ECB":
             self.aes_iv_entry.configure(state="normal")
             self.aes_iv_btn.configure(state="normal")
         else:
@@ -631,7 +643,8 @@ class CryptoApp(ctk.CTk):
             
     def generate_aes_key(self):
         import secrets
-        key = secrets.token_hex(16).upper()
+        key_bytes = int(self.aes_key_size_var.get()) // 8
+        key = secrets.token_hex(key_bytes).upper()
         self.aes_key_entry.delete(0, "end")
         self.aes_key_entry.insert(0, key)
         messagebox.showinfo("Success", f"Generated Key:\n{key}")
@@ -658,17 +671,17 @@ class CryptoApp(ctk.CTk):
             messagebox.showerror("Error", "Please enter key!")
             return
             
+        key_size = int(self.aes_key_size_var.get())
         try:
-            key = hex_to_bytes(key_hex)
-            if len(key) != 16: raise ValueError("Key must be 16 bytes")
+            key = read_aes_key_from_hex(key_hex, key_size)
         except Exception as e:
             messagebox.showerror("Error", f"Invalid key: {str(e)}")
             return
             
         iv = None
-        if mode == 'CBC':
+        if mode != 'ECB':
             if not iv_hex and action == 'encrypt':
-                messagebox.showerror("Error", "IV required for CBC!")
+                messagebox.showerror("Error", f"IV required for {mode}!")
                 return
             if iv_hex:
                 try:
@@ -697,35 +710,70 @@ class CryptoApp(ctk.CTk):
         thread.start()
 
     def aes_encrypt_file(self, input_file, output_file, key, mode, iv):
-        plaintext = read_text_file(input_file).encode('utf-8')
-        ciphertext, iv_used = self.aes.encrypt(plaintext, key, mode=mode, iv=iv)
-        ciphertext_hex = bytes_to_hex(ciphertext)
-        iv_hex = bytes_to_hex(iv_used) if iv_used else None
-        save_encrypted_output(output_file, ciphertext_hex, iv_hex, mode)
+        # mmapped plaintext -> binary container (raw ciphertext, no hex)
+        # Blocks are read through memoryview slices; only the last block is padded
+        enc = self.aes.encryptor(key, mode, iv)
+        with mapped_input(input_file) as view, \
+                EncryptedFileWriter(output_file, 'AES', mode, enc.iv) as writer:
+            stream_buffer(enc, view, writer)
         
-        result = f"✓ Encryption Successful!\nMode: {mode}\nKey: {bytes_to_hex(key).upper()}\n"
-        result += f"\nCiphertext preview:\n{ciphertext_hex.upper()[:200]}..."
+        result = f"✓ Encryption Successful!\nAES-{len(key) * 8} | Mode: {mode}\nKey: {bytes_to_hex(key).upper()}\n"
+        result += f"\nCiphertext preview:\n{self.preview_ciphertext(output_file)}..."
         
         self.after(0, lambda: self.aes_result_text.delete("1.0", "end"))
         self.after(0, lambda: self.aes_result_text.insert("1.0", result))
         self.after(0, lambda: messagebox.showinfo("Success", "File encrypted successfully!"))
 
     def aes_decrypt_file(self, input_file, output_file, key, mode, iv):
-        data = parse_encrypted_input(input_file)
-        ciphertext = hex_to_bytes(data['ciphertext'])
-        if mode == 'CBC' and iv is None:
-            if data['iv']: iv = hex_to_bytes(data['iv'])
-            else: raise ValueError("IV missing!")
-        
-        plaintext = self.aes.decrypt(ciphertext, key, mode=mode, iv=iv)
-        write_text_file(output_file, plaintext.decode('utf-8'))
+        mode = self.decrypt_to_file(self.aes, 'AES', input_file, output_file, key, mode, iv)
         
-        result = f"Decryption Successful!\nMode: {mode}\n\nPlaintext preview:\n{plaintext.decode('utf-8')[:999]}..."
+        result = f"Decryption Successful!\nAES-{len(key) * 8} | Mode: {mode}\n\nPlaintext preview:\n{self.preview_plaintext(output_file)}..."
         
         self.after(0, lambda: self.aes_result_text.delete("1.0", "end"))
         self.after(0, lambda: self.aes_result_text.insert("1.0", result))
         self.after(0, lambda: messagebox.showinfo("Success", "File decrypted successfully!"))
 
+    # ==================== ENCRYPTED FILE HELPERS ====================
+
+    def decrypt_to_file(self, cipher, algorithm, input_file, output_file, key, mode, iv):
+        """
+        Giải mã file (tự nhận dạng container binary hoặc format hex cũ)
+        Container: mode/IV lấy từ header, giải mã streaming
+        Returns: mode đã dùng
+        """
+        if is_container_file(input_file):
+            with EncryptedFileReader(input_file) as reader:
+                if reader.algorithm != algorithm:
+                    raise ValueError(f"File was encrypted with {reader.algorithm}, not {algorithm}")
+                mode = reader.mode
+                if iv is None: iv = reader.iv
+                if mode != 'ECB' and iv is None:
+                    raise ValueError("IV missing!")
+                
+                dec = cipher.decryptor(key, mode, iv)
+                with open(output_file, 'wb') as fout:
+                    stream_copy(dec, reader, fout)
+            return mode
+        
+        # Legacy hex format
+        data = read_encrypted_file(input_file)
+        if mode != 'ECB' and iv is None:
+            if data['iv']: iv = data['iv']
+            else: raise ValueError("IV missing!")
+        
+        plaintext = cipher.decrypt(data['ciphertext'], key, mode=mode, iv=iv)
+        with open(output_file, 'wb') as fout:
+            fout.write(plaintext)
+        return mode
+
+    def preview_ciphertext(self, container_file, length=100):
+        with EncryptedFileReader(container_file) as reader:
+            return bytes_to_hex(reader.read(length)).upper()
+
+    def preview_plaintext(self, plaintext_file, length=999):
+        with open(plaintext_file, 'rb') as f:
+            return f.read(length).decode('utf-8', errors='replace')
+
     # ==================== CAESAR FUNCTIONS ====================
     
     def crack_caesar(self):
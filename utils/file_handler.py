@@ -4,6 +4,8 @@ Xử lý đọc/ghi file cho các thuật toán mã hóa
 """
 
 import base64
+import os
+import struct
 
 
 def read_text_file(filepath, encoding='utf-8'):
@@ -204,6 +206,268 @@ def parse_encrypted_input(filepath):
     return result
 
 
+
+# ==================== BINARY CONTAINER ====================
+# Layout (big-endian):
+#   magic(4) version(1) algorithm(1) mode(1) flags(1) iv_len(1) iv(iv_len)
+#   ciphertext_len(8) ciphertext(ciphertext_len)
+#   [tag: tag_len(1) + tag(tag_len)]                       nếu FLAG_TAG (mode GCM)
+#   [chunk index: count(4) + count * ciphertext offset(8)]  nếu FLAG_CHUNK_INDEX
+# Ciphertext lưu dạng raw bytes - nhỏ bằng nửa format hex cũ
+
+CONTAINER_MAGIC = b'EDCF'
+CONTAINER_VERSION = 1
+FLAG_CHUNK_INDEX = 0x01
+FLAG_TAG = 0x02
+
+CONTAINER_ALGORITHMS = {'DES': 1, 'AES': 2, '3DES': 3}
+CONTAINER_MODES = {'ECB': 1, 'CBC': 2, 'CTR': 3, 'CFB': 4, 'OFB': 5, 'GCM': 6}
+
+# Mode xác thực: tag lưu sau ciphertext, bắt buộc khi đọc
+TAG_MODES = ('GCM',)
+TAG_LENGTHS = (4, 8, 12, 13, 14, 15, 16)
+
+_HEADER = struct.Struct('>4sBBBBB')
+_LENGTH = struct.Struct('>Q')
+_COUNT = struct.Struct('>I')
+
+# Kích thước chunk mặc định khi đọc container
+CONTAINER_CHUNK_SIZE = 1 << 20
+
+
+def _code_to_name(table, code, what):
+    for name, value in table.items():
+        if value == code:
+            return name
+    raise ValueError(f"Unknown {what} code in container: {code}")
+
+
+class EncryptedFileWriter:
+    """
+    Ghi container binary theo kiểu streaming
+    with EncryptedFileWriter(path, 'AES', 'CBC', iv) as writer:
+        writer.write(chunk) ...
+    Độ dài ciphertext được ghi lại vào header khi close()
+    chunk_index=True: lưu offset của mỗi lần write() (đọc lại theo chunk)
+    Mode GCM: gán writer.tag (hoặc truyền tag=) trước close()
+    Nếu khối with gặp lỗi, file dở dang bị xóa (abort())
+    """
+
+    def __init__(self, filepath, algorithm, mode, iv=None, chunk_index=False, tag=None):
+        algorithm = algorithm.upper()
+        mode = mode.upper()
+        if algorithm not in CONTAINER_ALGORITHMS:
+            raise ValueError(f"Unsupported algorithm: {algorithm}")
+        if mode not in CONTAINER_MODES:
+            raise ValueError(f"Unsupported mode: {mode}")
+        if mode == 'GCM' and algorithm != 'AES':
+            raise ValueError(f"GCM mode requires AES, got {algorithm}")
+        if tag is not None and mode not in TAG_MODES:
+            raise ValueError(f"Mode {mode} has no authentication tag")
+
+        iv = bytes(iv) if iv else b''
+        flags = FLAG_CHUNK_INDEX if chunk_index else 0
+        if mode in TAG_MODES:
+            flags |= FLAG_TAG
+
+        self.filepath = filepath
+        self.mode = mode
+        self.tag = tag
+        self.length = 0
+        self._index = [] if chunk_index else None
+        self._file = open(filepath, 'wb')
+        try:
+            self._file.write(_HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION,
+                                          CONTAINER_ALGORITHMS[algorithm],
+                                          CONTAINER_MODES[mode], flags, len(iv)))
+            self._file.write(iv)
+            self._length_pos = self._file.tell()
+            self._file.write(_LENGTH.pack(0))
+        except Exception:
+            self._file.close()
+            raise
+
+    def write(self, data):
+        """Ghi thêm ciphertext (raw bytes)"""
+        if not data:
+            return
+        if self._index is not None:
+            self._index.append(self.length)
+        self._file.write(data)
+        self.length += len(data)
+
+    def close(self):
+        """Ghi tag, chunk index, cập nhật độ dài trong header và đóng file"""
+        if self._file.closed:
+            return
+        try:
+            if self.mode in TAG_MODES:
+                tag = bytes(self.tag) if self.tag is not None else b''
+                if len(tag) not in TAG_LENGTHS:
+                    raise ValueError(f"{self.mode} container needs its authentication tag "
+                                     f"({', '.join(map(str, TAG_LENGTHS))} bytes), got {len(tag)}")
+                self._file.write(bytes([len(tag)]) + tag)
+            if self._index is not None:
+                self._file.write(_COUNT.pack(len(self._index)))
+                self._file.write(b''.join(_LENGTH.pack(offset) for offset in self._index))
+            self._file.seek(self._length_pos)
+            self._file.write(_LENGTH.pack(self.length))
+        finally:
+            self._file.close()
+
+    def abort(self):
+        """Đóng file mà không ghi độ dài/tag/index và xóa container dở dang"""
+        if self._file.closed:
+            return
+        self._file.close()
+        try:
+            os.remove(self.filepath)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Lỗi trong khối with: không hoàn tất header trên dữ liệu dở dang
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+class EncryptedFileReader:
+    """
+    Đọc container binary theo kiểu streaming
+    Thuộc tính: algorithm, mode, iv (bytes hoặc None), length, index (list hoặc None),
+                tag (bytes, chỉ với mode GCM; None với các mode khác)
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._file = open(filepath, 'rb')
+        try:
+            self._read_header()
+        except Exception:
+            self._file.close()
+            raise
+
+    def _read_header(self):
+        header = self._file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("Truncated container header")
+
+        magic, version, algorithm, mode, flags, iv_len = _HEADER.unpack(header)
+        if magic != CONTAINER_MAGIC:
+            raise ValueError("Not an encrypted container file")
+        if version != CONTAINER_VERSION:
+            raise ValueError(f"Unsupported container version: {version}")
+
+        self.version = version
+        self.algorithm = _code_to_name(CONTAINER_ALGORITHMS, algorithm, 'algorithm')
+        self.mode = _code_to_name(CONTAINER_MODES, mode, 'mode')
+        self.iv = self._file.read(iv_len) or None
+        if self.iv is not None and len(self.iv) != iv_len:
+            raise ValueError("Truncated container header")
+
+        length = self._file.read(_LENGTH.size)
+        if len(length) < _LENGTH.size:
+            raise ValueError("Truncated container header")
+        self.length = _LENGTH.unpack(length)[0]
+        self._data_start = self._file.tell()
+        self._remaining = self.length
+        if os.fstat(self._file.fileno()).st_size < self._data_start + self.length:
+            raise ValueError("Truncated container body")
+
+        if bool(flags & FLAG_TAG) != (self.mode in TAG_MODES):
+            raise ValueError(f"Container tag flag does not match mode {self.mode}")
+
+        self._file.seek(self._data_start + self.length)
+        self.tag = None
+        if flags & FLAG_TAG:
+            tag_len = self._file.read(1)
+            self.tag = self._file.read(tag_len[0]) if tag_len else b''
+            if not tag_len or tag_len[0] not in TAG_LENGTHS or len(self.tag) != tag_len[0]:
+                raise ValueError("Missing or truncated authentication tag")
+
+        self.index = None
+        if flags & FLAG_CHUNK_INDEX:
+            count = self._file.read(_COUNT.size)
+            if len(count) < _COUNT.size:
+                raise ValueError("Truncated chunk index")
+            count = _COUNT.unpack(count)[0]
+            raw = self._file.read(count * _LENGTH.size)
+            if len(raw) < count * _LENGTH.size:
+                raise ValueError("Truncated chunk index")
+            self.index = [offset for (offset,) in _LENGTH.iter_unpack(raw)]
+        self._file.seek(self._data_start)
+
+    def read(self, size=-1):
+        """Đọc tối đa size bytes ciphertext (-1 = phần còn lại)"""
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def iter_chunks(self, chunk_size=CONTAINER_CHUNK_SIZE):
+        """Duyệt ciphertext theo từng chunk (bộ nhớ giới hạn bởi chunk_size)"""
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def is_container_file(filepath):
+    """Kiểm tra file có phải container binary không (dựa vào magic)"""
+    with open(filepath, 'rb') as f:
+        return f.read(len(CONTAINER_MAGIC)) == CONTAINER_MAGIC
+
+
+def save_encrypted_container(filepath, ciphertext, algorithm, mode='ECB', iv=None, tag=None):
+    """Lưu ciphertext (bytes) vào container binary (tag: bắt buộc với mode GCM)"""
+    with EncryptedFileWriter(filepath, algorithm, mode, iv, tag=tag) as writer:
+        writer.write(ciphertext)
+
+
+def read_encrypted_file(filepath):
+    """
+    Đọc file mã hóa, tự nhận dạng container binary hoặc format hex cũ
+    Returns: dict with 'format' ('binary'/'hex'), 'algorithm' (None cho hex),
+             'mode', 'iv' (bytes hoặc None), 'tag' (bytes với GCM, còn lại None),
+             'ciphertext' (bytes)
+    """
+    if is_container_file(filepath):
+        with EncryptedFileReader(filepath) as reader:
+            return {
+                'format': 'binary',
+                'algorithm': reader.algorithm,
+                'mode': reader.mode,
+                'iv': reader.iv,
+                'tag': reader.tag,
+                'ciphertext': reader.read()
+            }
+
+    data = parse_encrypted_input(filepath)
+    return {
+        'format': 'hex',
+        'algorithm': None,
+        'mode': data['mode'],
+        'iv': hex_to_bytes(data['iv']) if data['iv'] else None,
+        'tag': None,
+        'ciphertext': hex_to_bytes(data['ciphertext'])
+    }
+
 if __name__ == "__main__":
     # Test
     print("Testing file_handler utilities...")
@@ -217,4 +481,14 @@ if __name__ == "__main__":
     print(f"Hex to bytes: {back_to_bytes}")
     
     assert test_bytes == back_to_bytes, "Conversion failed!"
-    print("✓ Hex conversion test passed!")
\ No newline at end of file
+    print("✓ Hex conversion test passed!")
+    
+    # Test container round trip
+    import os
+    import tempfile
+    path = os.path.join(tempfile.mkdtemp(), 'test.enc')
+    save_encrypted_container(path, b'\x00' * 32, 'AES', 'CBC', b'\x01' * 16)
+    data = read_encrypted_file(path)
+    assert data['format'] == 'binary' and data['mode'] == 'CBC'
+    assert data['iv'] == b'\x01' * 16 and data['ciphertext'] == b'\x00' * 32
+    print("✓ Container test passed!")
\ No newline at end of file